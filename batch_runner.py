@@ -0,0 +1,259 @@
+"""
+Module: batch_runner
+Description: Runs many independent headless self-play matches in parallel, for balance and soak tests.
+Each match is a seeded Simulation played by a simple scripted player for a fixed amount of game time.
+Matches run in a pool of worker processes, one per core by default, and their scores, enemies destroyed,
+structures built and tick times are aggregated into one report.
+
+Usage:
+    python batch_runner.py --matches 64 --duration 300 --enemies 500 --event-cooldown 10 --output report.json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+os.environ.setdefault("ARCADE_HEADLESS", "1")  # Matches never open a window, in the workers either
+
+import numpy as np
+from events import EVENT_COOLDOWN
+from game_constants import GRID_WIDTH
+from game_log import configure_logging
+from resources import ResourceType
+from simulation import Simulation, ENEMY_COUNT, RESOURCE_COUNT, PLAYER_HEALTH
+from timestep import TICK_DURATION
+
+# Constants
+DEFAULT_MATCHES = 16
+DEFAULT_DURATION = 120  # Seconds of game time per match
+BOT_DECISION_INTERVAL = 0.25  # Seconds of game time between two decisions of the scripted player
+BOT_BANANA_RANGE = 3  # The scripted player throws bananas at enemies this many tiles away or closer
+
+# Per-match results that are summed up across matches, and those whose spread is reported
+MATCH_TOTALS = ("ticks", "score", "enemies_destroyed", "structures_built", "enemy_structures_built")
+MATCH_STATS = ("score", "enemies_destroyed", "structures_built", "enemy_structures_built", "ai_players",
+               "enemies", "survival_time", "mean_tick_ms", "p99_tick_ms", "max_tick_ms")
+
+
+class SelfPlayBot:
+    """
+    A scripted player: fights enemies that come close, spends score on AI players, builds towers
+    whenever the inventory allows and otherwise heads for the nearest resource. It only uses the
+    Simulation's player commands, and its own random stream, so a match is reproducible from its seed.
+    """
+    def __init__(self, sim, seed, interval=BOT_DECISION_INTERVAL):
+        """
+        Initialize the bot.
+
+        Args:
+            sim (Simulation): The simulation to play.
+            seed (int): Seed of the bot's random stream.
+            interval (float): Seconds of game time between two decisions.
+        """
+        self.sim = sim
+        self.rng = random.Random(seed)
+        self.interval = interval
+        self.timer = 0.0
+
+    def update(self, delta_time):
+        """
+        Advance the bot's timer and act when a decision is due.
+
+        Args:
+            delta_time (float): Time elapsed since the last update, in seconds.
+        """
+        self.timer += delta_time
+        if self.timer >= self.interval:
+            self.timer -= self.interval
+            self.act()
+
+    def act(self):
+        """Take one decision."""
+        sim = self.sim
+        player = sim.player
+
+        # Face the closest enemy in range and throw a banana at it
+        radius = BOT_BANANA_RANGE
+        slots = sim.enemy_store.slots_in_rect(player.row - radius, player.row + radius,
+                                              player.col - radius, player.col + radius)
+        if slots.size:
+            store = sim.enemy_store
+            distances = np.maximum(np.abs(store.row[slots] - player.row), np.abs(store.col[slots] - player.col))
+            slot = slots[np.argmin(distances)]
+            sim.move_player(int(np.sign(store.col[slot] - player.col)), int(np.sign(store.row[slot] - player.row)))
+            sim.throw_banana()
+            return
+
+        if sim.score >= sim.ai_player_cost:
+            sim.create_ai_player()
+        if sim.inventory["WOOD"] >= 5 and sim.inventory["STONE"] >= 5:
+            sim.build_structure("Tower")
+
+        # Gather, picking up food only when hurt
+        resource_types = [ResourceType.WOOD, ResourceType.STONE]
+        if sim.player_health < PLAYER_HEALTH:
+            resource_types.append(ResourceType.FOOD)
+        resource = sim.resource_manager.nearest_resource(player.row, player.col, resource_types)
+        if resource is None:
+            sim.move_player(self.rng.choice([-1, 0, 1]), self.rng.choice([-1, 0, 1]))
+        else:
+            sim.move_player((resource.col > player.col) - (resource.col < player.col),
+                            (resource.row > player.row) - (resource.row < player.row))
+
+
+def run_match(config):
+    """
+    Play one headless match.
+
+    Args:
+        config (dict): Match settings: seed, duration, enemies, resources, map_size and event_cooldown.
+    Returns:
+        dict: The match's settings and results, with tick-time statistics and "tick_ms", the duration
+            of every tick in milliseconds.
+    """
+    sim = Simulation(config["enemies"], seed=config["seed"], resource_count=config["resources"],
+                     width=config["map_size"], height=config["map_size"])
+    sim.events.cooldown = config["event_cooldown"]
+    bot = SelfPlayBot(sim, config["seed"])
+
+    ticks = int(round(config["duration"] / TICK_DURATION))
+    tick_ms = np.empty(ticks, dtype=np.float32)
+    start = time.perf_counter()
+    tick = 0
+    while tick < ticks and not sim.game_over:
+        tick_start = time.perf_counter()
+        bot.update(TICK_DURATION)
+        sim.step(TICK_DURATION)
+        tick_ms[tick] = (time.perf_counter() - tick_start) * 1000
+        tick += 1
+    wall_time = time.perf_counter() - start
+    tick_ms = tick_ms[:tick]
+
+    return {
+        **config,
+        "ticks": tick,
+        "survival_time": tick * TICK_DURATION,
+        "survived": not sim.game_over,
+        "score": sim.score,
+        "enemies_destroyed": sim.enemies_destroyed,
+        "structures_built": sim.structure_manager.built["player"],
+        "enemy_structures_built": sim.structure_manager.built["enemy"],
+        "ai_players": len(sim.ai_players),
+        "enemies": len(sim.enemy_store),
+        "wall_time": wall_time,
+        "mean_tick_ms": float(tick_ms.mean()) if tick else 0.0,
+        "p99_tick_ms": float(np.percentile(tick_ms, 99)) if tick else 0.0,
+        "max_tick_ms": float(tick_ms.max()) if tick else 0.0,
+        "tick_ms": tick_ms,
+    }
+
+
+def aggregate(results):
+    """
+    Combine the results of many matches.
+
+    Args:
+        results (list): Results returned by run_match().
+    Returns:
+        dict: Totals, survival rate, mean/stdev/min/max of each match statistic, and percentiles of the
+            tick times of all matches together.
+    """
+    report = {
+        "matches": len(results),
+        "survival_rate": sum(result["survived"] for result in results) / len(results),
+        "totals": {name: sum(result[name] for result in results) for name in MATCH_TOTALS},
+        "stats": {},
+    }
+    for name in MATCH_STATS:
+        values = [result[name] for result in results]
+        report["stats"][name] = {
+            "mean": statistics.fmean(values),
+            "stdev": statistics.stdev(values) if len(values) > 1 else 0.0,
+            "min": min(values),
+            "max": max(values),
+        }
+    tick_ms = np.concatenate([result["tick_ms"] for result in results])
+    if tick_ms.size:
+        report["tick_ms"] = {
+            "mean": float(tick_ms.mean()),
+            **{f"p{q}": float(np.percentile(tick_ms, q)) for q in (50, 90, 99)},
+            "max": float(tick_ms.max()),
+        }
+    return report
+
+
+def _init_worker(log_level):
+    """Configure the game log of a worker process."""
+    configure_logging(log_level)
+
+
+def main():
+    """Run a batch of matches from the command line and report the aggregated results."""
+    parser = argparse.ArgumentParser(description="Run headless Monkey Tribe Wars self-play matches in parallel.")
+    parser.add_argument("--matches", type=int, default=DEFAULT_MATCHES, help="Number of matches")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help="Seconds of game time per match (a match also ends when the player dies)")
+    parser.add_argument("--enemies", type=int, default=ENEMY_COUNT, help="Enemies at the start of each match")
+    parser.add_argument("--resources", type=int, default=RESOURCE_COUNT, help="Resources at the start of each match")
+    parser.add_argument("--map-size", type=int, default=GRID_WIDTH, help="Width and height of the map in tiles")
+    parser.add_argument("--event-cooldown", type=float, default=EVENT_COOLDOWN,
+                        help="Seconds between random events ('inf' for none)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first match; match i uses seed + i")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (default: one per core)")
+    parser.add_argument("--log-level", default="WARNING", help="Game log level in the workers")
+    parser.add_argument("--output", help="Write the report, with every match's results, to this JSON file")
+    args = parser.parse_args()
+
+    configs = [{
+        "seed": args.seed + i,
+        "duration": args.duration,
+        "enemies": args.enemies,
+        "resources": args.resources,
+        "map_size": args.map_size,
+        "event_cooldown": args.event_cooldown,
+    } for i in range(args.matches)]
+
+    print(f"Running {args.matches} matches of {args.duration:g}s on {args.workers} workers")
+    print(f"{'seed':>8} {'score':>7} {'killed':>7} {'built':>6} {'survived':>9} {'p99 ms':>8} {'wall s':>7}")
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(args.log_level,)) as executor:
+        futures = [executor.submit(run_match, config) for config in configs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"{result['seed']:>8} {result['score']:>7} {result['enemies_destroyed']:>7} "
+                  f"{result['structures_built']:>6} {'yes' if result['survived'] else 'no':>9} "
+                  f"{result['p99_tick_ms']:>8.2f} {result['wall_time']:>7.1f}")
+    wall_time = time.perf_counter() - start
+    results.sort(key=lambda result: result["seed"])
+
+    report = aggregate(results)
+    report["wall_time"] = wall_time
+    stats = report["stats"]
+    print(f"\n{report['matches']} matches in {wall_time:.1f}s, survival rate {report['survival_rate']:.0%}")
+    for name in MATCH_STATS:
+        stat = stats[name]
+        print(f"  {name:<24} mean {stat['mean']:>10.2f}  stdev {stat['stdev']:>9.2f}  "
+              f"min {stat['min']:>9.2f}  max {stat['max']:>9.2f}")
+    if "tick_ms" in report:
+        tick_ms = report["tick_ms"]
+        print(f"  tick ms (all matches)    mean {tick_ms['mean']:.3f}  p50 {tick_ms['p50']:.3f}  "
+              f"p90 {tick_ms['p90']:.3f}  p99 {tick_ms['p99']:.3f}  max {tick_ms['max']:.3f}")
+
+    if args.output:
+        report["settings"] = {key: value for key, value in configs[0].items() if key != "seed"}
+        report["results"] = [{key: value for key, value in result.items() if key != "tick_ms"}
+                             for result in results]
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""
+Package: benchmarks
+Description: Benchmark suite for the game tick and draw paths. Each scenario builds a seeded Simulation
+with a given number of enemies, resources, towers and an optional active event, runs it headlessly in
+fixed ticks and reports ticks per second, p50/p99 tick latency and memory allocations. Results are
+written as JSON and compared against the previous run so regressions between commits are visible.
+
+Usage (from the repository root):
+    python -m benchmarks                      # all tick scenarios
+    python -m benchmarks --draw               # also the draw scenarios (headless OpenGL context)
+    python -m benchmarks -s baseline -s towers_200 --ticks 1200
+    python -m benchmarks --compare benchmarks/results/<previous>.json
+"""
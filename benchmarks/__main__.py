@@ -0,0 +1,143 @@
+"""
+Module: benchmarks.__main__
+Description: Command line entry point of the benchmark suite. Runs the selected scenarios, prints a
+table, writes the results to benchmarks/results/ as JSON and compares them with the previous results.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+os.environ.setdefault("ARCADE_HEADLESS", "1")  # Benchmarks never open a visible window
+
+from benchmarks.scenarios import SCENARIOS, get_scenario
+from benchmarks.runner import run_scenario
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+REGRESSION_THRESHOLD = 0.10  # Relative slowdown flagged as a regression
+
+
+def git_revision():
+    """
+    Get the current git commit.
+
+    Returns:
+        str: Short commit hash, with "-dirty" if the tree has changes, or None outside a git checkout.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                               text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if dirty else commit
+
+
+def latest_results(exclude=None):
+    """
+    Find the most recent results file.
+
+    Args:
+        exclude (str): Path to ignore, e.g. the file about to be written.
+    Returns:
+        str: Path of the newest JSON file in the results directory, or None.
+    """
+    if not os.path.isdir(RESULTS_DIR):
+        return None
+    paths = [os.path.join(RESULTS_DIR, name) for name in os.listdir(RESULTS_DIR) if name.endswith(".json")]
+    paths = [path for path in paths if exclude is None or os.path.abspath(path) != os.path.abspath(exclude)]
+    return max(paths, key=os.path.getmtime, default=None)
+
+
+def compare(results, previous):
+    """
+    Print the change of every scenario relative to previous results.
+
+    Args:
+        results (dict): Scenario name to result of this run.
+        previous (dict): Scenario name to result of the earlier run.
+    Returns:
+        list: Names of the scenarios that regressed by more than REGRESSION_THRESHOLD.
+    """
+    regressions = []
+    for name, result in results.items():
+        old = previous.get(name)
+        if old is None or old["params"] != result["params"]:
+            continue
+        throughput = result["ticks_per_sec"] / old["ticks_per_sec"] - 1
+        p99 = result["p99_ms"] / old["p99_ms"] - 1 if old["p99_ms"] else 0.0
+        regressed = throughput < -REGRESSION_THRESHOLD or p99 > REGRESSION_THRESHOLD
+        if regressed:
+            regressions.append(name)
+        print(f"  {name:<24} ticks/s {throughput:+7.1%}   p99 {p99:+7.1%}{'   REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main():
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Monkey Tribe Wars benchmark suite.")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable); default: all tick scenarios, plus draw ones with --draw")
+    parser.add_argument("--ticks", type=int, default=600, help="Timed ticks per scenario")
+    parser.add_argument("--warmup", type=int, default=60, help="Untimed ticks before timing")
+    parser.add_argument("--alloc-ticks", type=int, default=120, help="Ticks traced for allocations (0 to skip)")
+    parser.add_argument("--draw", action="store_true", help="Also run the draw scenarios")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<timestamp>-<commit>.json)")
+    parser.add_argument("--compare", help="Results file to compare with (default: the latest in benchmarks/results)")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Exit with status 1 if a scenario regressed by more than 10%%")
+    args = parser.parse_args()
+
+    names = args.scenario or [name for name in SCENARIOS
+                              if args.draw or get_scenario(name)["kind"] != "draw"]
+    window = None
+    if any(get_scenario(name)["kind"] == "draw" for name in names):
+        import arcade
+        from game_constants import SCREEN_WIDTH, SCREEN_HEIGHT
+        window = arcade.Window(SCREEN_WIDTH, SCREEN_HEIGHT, "Benchmarks", visible=False)
+
+    revision = git_revision()
+    timestamp = datetime.datetime.now(datetime.timezone.utc)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{timestamp:%Y%m%d-%H%M%S}-{revision or 'nogit'}.json")
+
+    results = {}
+    print(f"{'scenario':<24} {'ticks/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'alloc KiB':>10}")
+    for name in names:
+        result = run_scenario(get_scenario(name), args.ticks, args.warmup, args.alloc_ticks, window)
+        results[name] = result
+        alloc = result.get("alloc_peak_kib")
+        print(f"{name:<24} {result['ticks_per_sec']:>10.1f} {result['p50_ms']:>8.3f} {result['p99_ms']:>8.3f} "
+              f"{result['max_ms']:>8.3f} {'' if alloc is None else f'{alloc:.1f}':>10}")
+
+    previous_path = args.compare or latest_results(exclude=output)
+    regressions = []
+    if previous_path:
+        with open(previous_path, encoding="utf-8") as file:
+            previous = json.load(file)
+        print(f"\nCompared with {previous_path} ({previous.get('revision')}):")
+        regressions = compare(results, previous["results"])
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump({
+            "revision": revision,
+            "timestamp": timestamp.isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "ticks": args.ticks,
+            "warmup": args.warmup,
+            "results": results,
+        }, file, indent=2)
+    print(f"\nResults written to {output}")
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
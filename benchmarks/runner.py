@@ -0,0 +1,229 @@
+"""
+Module: benchmarks.runner
+Description: Builds benchmark scenarios and measures them. Timing and allocation tracking run in
+separate passes over identically seeded simulations, so tracemalloc overhead never skews latencies.
+"""
+
+import time
+import tracemalloc
+import numpy as np
+from buildings import Tower
+from game_utils import pos_to_grid, create_grid_shape
+from game_constants import TILE_SIZE
+from music import MusicManager
+from simulation import Simulation
+from timestep import TICK_DURATION
+
+BENCHMARK_SEED = 12345
+BENCHMARK_PLAYER_HEALTH = 10 ** 9  # Keeps the player alive, since a dead player stops the simulation
+TOWER_COST = {"WOOD": 5, "STONE": 5}
+
+
+class SilentMusicManager(MusicManager):
+    """A MusicManager that never loads or plays audio, for benchmarking views without a sound device."""
+    def load_background_music(self, file_path):
+        """Ignore the music track."""
+
+    def play_background_music(self, loop=True):
+        """Play nothing."""
+
+
+def build_simulation(params, seed=BENCHMARK_SEED):
+    """
+    Create the simulation of a scenario.
+
+    Args:
+        params (dict): Scenario parameters (see benchmarks.scenarios).
+        seed (int): Seed of the simulation.
+    Returns:
+        Simulation: The prepared simulation.
+    """
+    sim = Simulation(params["enemies"], seed=seed, resource_count=params["resources"], width=params["size"],
+                     height=params["size"])
+    sim.player_health = BENCHMARK_PLAYER_HEALTH
+    sim.events.cooldown = float("inf")  # Only the scenario's own event runs
+
+    for _ in range(params["towers"]):
+        row = sim.rng.randrange(sim.resource_manager.height)
+        col = sim.rng.randrange(sim.resource_manager.width)
+        x, y = pos_to_grid(row, col, TILE_SIZE)
+        sim.structure_manager.place_structure(Tower, x, y, dict(TOWER_COST), team="player")
+
+    if params["event"]:
+        sim.start_event(params["event"])
+    return sim
+
+
+def keep_event_active(sim, event):
+    """Restart the scenario's event once it has run its course."""
+    if event and sim.active_event is None:
+        sim.start_event(event)
+
+
+def make_tick(sim, params):
+    """
+    Get the function timed by a scenario.
+
+    Args:
+        sim (Simulation): The scenario's simulation.
+        params (dict): Scenario parameters.
+    Returns:
+        callable: Runs one tick of the scenario.
+    """
+    if params["kind"] == "structures":
+        manager = sim.structure_manager
+
+        def tick():
+            manager.update_structures(TICK_DURATION, sim.player_sprite_list, sim.ai_players,
+                                      sim.enemy_sprite_list, sim.enemy_store, sim.ai_index)
+        return tick
+
+    def tick():
+        sim.step(TICK_DURATION)
+    return tick
+
+
+def time_ticks(params, ticks, warmup):
+    """
+    Time the ticks of a headless scenario.
+
+    Args:
+        params (dict): Scenario parameters.
+        ticks (int): Number of timed ticks.
+        warmup (int): Number of untimed ticks run first.
+    Returns:
+        numpy.ndarray: Duration of each timed tick, in seconds.
+    """
+    sim = build_simulation(params)
+    tick = make_tick(sim, params)
+    event = params["event"]
+    for _ in range(warmup):
+        keep_event_active(sim, event)
+        tick()
+
+    durations = np.empty(ticks)
+    for i in range(ticks):
+        keep_event_active(sim, event)
+        start = time.perf_counter()
+        tick()
+        durations[i] = time.perf_counter() - start
+    return durations
+
+
+def measure_allocations(params, ticks, warmup):
+    """
+    Measure the memory allocated while running the ticks of a headless scenario.
+
+    Args:
+        params (dict): Scenario parameters.
+        ticks (int): Number of traced ticks.
+        warmup (int): Number of untraced ticks run first.
+    Returns:
+        dict: Peak traced memory above the starting point, and the memory and number of blocks
+            still allocated at the end, per tick.
+    """
+    sim = build_simulation(params)
+    tick = make_tick(sim, params)
+    event = params["event"]
+    for _ in range(warmup):
+        keep_event_active(sim, event)
+        tick()
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        start_size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(ticks):
+            keep_event_active(sim, event)
+            tick()
+        _, peak_size = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    diff = after.compare_to(before, "filename")
+    return {
+        "alloc_peak_kib": (peak_size - start_size) / 1024,
+        "retained_kib_per_tick": sum(stat.size_diff for stat in diff) / 1024 / ticks,
+        "retained_blocks_per_tick": sum(stat.count_diff for stat in diff) / ticks,
+    }
+
+
+def time_frames(params, frames, warmup, window):
+    """
+    Time rendered GridGame frames: a fixed-step update followed by on_draw.
+
+    Args:
+        params (dict): Scenario parameters.
+        frames (int): Number of timed frames.
+        warmup (int): Number of untimed frames run first.
+        window (arcade.Window): Window providing the OpenGL context.
+    Returns:
+        numpy.ndarray: Duration of each timed frame, in seconds.
+    """
+    from main_game import GridGame
+
+    game = GridGame(SilentMusicManager(), seed=BENCHMARK_SEED)
+    game.sim = build_simulation(params)
+    game.grid_shape = create_grid_shape(game.sim.width, game.sim.height)
+    game.scroll_to_player()
+    window.show_view(game)
+    event = params["event"]
+
+    def frame():
+        keep_event_active(game.sim, event)
+        game.on_update(TICK_DURATION)
+        game.on_draw()
+        window.ctx.finish()  # Include the GPU work queued by this frame
+
+    for _ in range(warmup):
+        frame()
+    durations = np.empty(frames)
+    for i in range(frames):
+        start = time.perf_counter()
+        frame()
+        durations[i] = time.perf_counter() - start
+    return durations
+
+
+def summarize(durations):
+    """
+    Summarize tick durations.
+
+    Args:
+        durations (numpy.ndarray): Duration of each tick, in seconds.
+    Returns:
+        dict: Ticks per second and mean, p50, p99 and max latency in milliseconds.
+    """
+    total = float(durations.sum())
+    return {
+        "ticks": int(durations.size),
+        "ticks_per_sec": durations.size / total if total else float("inf"),
+        "mean_ms": float(durations.mean()) * 1000,
+        "p50_ms": float(np.percentile(durations, 50)) * 1000,
+        "p99_ms": float(np.percentile(durations, 99)) * 1000,
+        "max_ms": float(durations.max()) * 1000,
+    }
+
+
+def run_scenario(params, ticks, warmup, alloc_ticks=0, window=None):
+    """
+    Run one scenario.
+
+    Args:
+        params (dict): Scenario parameters.
+        ticks (int): Number of timed ticks or frames.
+        warmup (int): Number of untimed ticks or frames run first.
+        alloc_ticks (int): Number of ticks traced for allocations; 0 skips allocation tracking.
+        window (arcade.Window): Window for draw scenarios.
+    Returns:
+        dict: The scenario parameters and its measurements.
+    """
+    if params["kind"] == "draw":
+        result = summarize(time_frames(params, ticks, warmup, window))
+    else:
+        result = summarize(time_ticks(params, ticks, warmup))
+        if alloc_ticks:
+            result.update(measure_allocations(params, alloc_ticks, warmup))
+    return {"params": params, **result}
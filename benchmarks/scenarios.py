@@ -0,0 +1,56 @@
+"""
+Module: benchmarks.scenarios
+Description: Benchmark scenario definitions. A scenario is a dictionary of parameters merged over
+DEFAULTS:
+    kind (str): "tick" times Simulation.step, "structures" times BuildingManager.update_structures
+        alone, and "draw" times a GridGame frame (fixed-step update plus on_draw) in an OpenGL context.
+    enemies (int): Enemies at the start.
+    resources (int): Resources at the start (plus a third as many diamonds).
+    towers (int): Player towers placed on random tiles.
+    event (str): Random event kept active for the whole run, or None.
+    size (int): Width and height of the map in tiles.
+"""
+
+DEFAULTS = {
+    "kind": "tick",
+    "enemies": 10,
+    "resources": 100,
+    "towers": 0,
+    "event": None,
+    "size": 50,
+}
+
+SCENARIOS = {
+    # Full game ticks
+    "baseline": {},
+    "enemies_1k": {"enemies": 1000},
+    "enemies_10k": {"enemies": 10000},
+    "resources_2k": {"resources": 2000},
+    "monkey_raid": {"enemies": 100, "event": "Monkey Raid"},
+    "diamond_rain": {"enemies": 100, "event": "Diamond Rain"},
+    "meteor_shower": {"enemies": 100, "towers": 50, "event": "Meteor Shower"},
+    "towers_200": {"enemies": 500, "towers": 200},
+    "map_1000": {"size": 1000, "enemies": 10000, "resources": 2000},
+    "map_1000_enemies_100k": {"size": 1000, "enemies": 100000, "resources": 2000},
+
+    # BuildingManager.update_structures on its own
+    "structures_100_towers": {"kind": "structures", "enemies": 500, "towers": 100},
+    "structures_500_towers": {"kind": "structures", "enemies": 1000, "towers": 500},
+
+    # Rendered frames; only run with --draw
+    "draw_baseline": {"kind": "draw"},
+    "draw_enemies_10k": {"kind": "draw", "enemies": 10000},
+    "draw_map_1000": {"kind": "draw", "size": 1000, "enemies": 10000, "resources": 2000},
+}
+
+
+def get_scenario(name):
+    """
+    Get the full parameters of a scenario.
+
+    Args:
+        name (str): Name of the scenario.
+    Returns:
+        dict: The scenario parameters merged over DEFAULTS.
+    """
+    return {**DEFAULTS, **SCENARIOS[name]}
@@ -7,6 +7,13 @@ for managing construction, resource costs, and interactions like spawning entiti
 import arcade
 from enemies import Enemy
 from game_constants import TILE_SIZE
+from game_utils import GridSprite, pos_to_grid, pos_to_grid_index
+from spatial_hash import SpatialHash
+from textures import texture_registry, CHARACTER_IMAGE
+from game_log import get_logger
+from upgrades import UpgradedStat
+
+log = get_logger("buildings")
 
 # Constants
 BUILDING_ATTACK_DAMAGE = 20  # Damage dealt by buildings
@@ -25,7 +32,12 @@ class Structure(arcade.Sprite):
         team (str): The team the structure belongs to ('player' or 'enemy').
         spawn_timer (float): Timer to track entity spawning.
         attack_timer (float): Timer to track attack intervals.
+        row (int): Row of the tile the structure stands on.
+        col (int): Column of the tile the structure stands on.
+        upgrades (UpgradeManager): The upgrade manager whose modifiers apply to the health, if any.
     """
+    health = UpgradedStat()
+
     def __init__(self, image_path, start_x, start_y, cost, health, scale, team):
         """
         Initialize a generic structure.
@@ -38,12 +50,15 @@ class Structure(arcade.Sprite):
             scale (float): Scaling factor for the sprite.
             team (str): The team the structure belongs to ('player' or 'enemy').
         """
-        # Initialize the parent class with the sprite's image and position
-        super().__init__(image_path, center_x=start_x, center_y=start_y, scale=scale)
+        # Initialize the parent class with the shared texture for this structure class and its position
+        texture = texture_registry.get(type(self), image_path)
+        super().__init__(texture, center_x=start_x, center_y=start_y, scale=scale)
+        self.upgrades = None
+        self.upgrade_kind = "structure"
         self.cost = cost  # Cost to build the structure
         self.health = health  # Health of the structure
-        self.texture = arcade.load_texture(image_path)  # Load the texture for the structure
-        self.sprite = arcade.Sprite(self.texture)  # Create the sprite with the texture
+        self.row, self.col = pos_to_grid_index(start_x, start_y, TILE_SIZE)
+        self.spatial_hash = None
         self.spawn_timer = 0
         self.attack_timer = 0
         self.team = team # Either player or enemy
@@ -58,40 +73,52 @@ class Structure(arcade.Sprite):
         self.health -= amount
         if self.health <= 0:
             self.remove_from_sprite_lists()
-            print(f"{self.__class__.__name__} destroyed!")
+            log.debug("%s destroyed!", self.__class__.__name__)
+
+    def remove_from_sprite_lists(self):
+        """
+        Remove the structure from all sprite lists and from its spatial hash.
+        """
+        super().remove_from_sprite_lists()
+        if self.spatial_hash is not None:
+            self.spatial_hash.remove(self)
 
-    def spawn_entity(self, entity_list, tile_size):
+    def spawn_entity(self, entity_list, tile_size, spatial_hash=None):
         """
         Spawn an entity (AI player or enemy) at the structure's location.
 
         Args:
             entity_list (arcade.SpriteList): List to which the spawned entity will be added.
             tile_size (int): The size of a grid tile in pixels.
+            spatial_hash (SpatialHash): Optional index that the spawned entity is added to.
         """
         if self.team == "player" and self.spawn_timer >= PLAYER_SPAWN_COOLDOWN:
             # Spawn a player-aligned AI at the building's location
-            new_ai = arcade.Sprite(
-                "assets/images/characters/monkey.png",
-                scale=0.15,
-            )
+            new_ai = GridSprite(CHARACTER_IMAGE, scaling=0.15)
             new_ai.center_x = self.center_x
             new_ai.center_y = self.center_y
             new_ai.row, new_ai.col = int(self.center_y // tile_size), int(self.center_x // tile_size)
+            if self.upgrades is not None:
+                self.upgrades.attach(new_ai, "ai")
             entity_list.append(new_ai)
+            if spatial_hash is not None:
+                spatial_hash.add(new_ai)
             self.spawn_timer = 0
-            print(f"AI Player spawned at ({self.center_x}, {self.center_y}) by {self.__class__.__name__}")
+            log.debug("AI Player spawned at (%s, %s) by %s", self.center_x, self.center_y, self.__class__.__name__)
         elif self.team == "enemy" and self.spawn_timer >= ENEMY_SPAWN_COOLDOWN:
             # Spawn an enemy at the building's location
-            new_enemy = Enemy("assets/images/characters/monkey.png", scaling=0.5)
+            new_enemy = Enemy(CHARACTER_IMAGE, scaling=0.5)
             new_enemy.color = arcade.color.RED
             new_enemy.center_x = self.center_x
             new_enemy.center_y = self.center_y
             new_enemy.row, new_enemy.col = int(self.center_y // tile_size), int(self.center_x // tile_size)
             entity_list.append(new_enemy)
+            if spatial_hash is not None:
+                spatial_hash.add(new_enemy)
             self.spawn_timer = 0
-            print(f"Enemy spawned at ({self.center_x}, {self.center_y}) by {self.__class__.__name__}")
+            log.debug("Enemy spawned at (%s, %s) by %s", self.center_x, self.center_y, self.__class__.__name__)
 
-    def attack_nearby_entities(self, target_list, range_tiles, damage):
+    def attack_nearby_entities(self, target_list, range_tiles, damage, target_index=None):
         """
         Attack all entities within a specified range.
 
@@ -99,18 +126,32 @@ class Structure(arcade.Sprite):
             target_list (arcade.SpriteList): List of targets to attack.
             range_tiles (int): Range of the attack in grid tiles.
             damage (int): Amount of damage dealt to each target.
+            target_index (SpatialHash | EnemyStore): Optional tile index holding the targets. Only the
+                indexed targets on tiles around the structure are tested, instead of the whole list.
         """
-        for target in target_list:
-            distance = ((self.center_x - target.center_x) ** 2 + (self.center_y - target.center_y) ** 2) ** 0.5
-            if distance <= range_tiles * TILE_SIZE:
+        if target_index is not None:
+            # One extra ring of tiles covers structures that were placed off a tile center
+            nearby = target_index.near(self.row, self.col, int(range_tiles) + 1)
+            candidates = [target for target in nearby if target in target_list]
+        else:
+            candidates = list(target_list)
+
+        reach = range_tiles * TILE_SIZE
+        reach_squared = reach * reach
+        for target in candidates:
+            # Grid entities sit on tile centers; use row/col since enemy sprites are only synced for drawing
+            target_x, target_y = pos_to_grid(target.row, target.col, TILE_SIZE)
+            dx = self.center_x - target_x
+            dy = self.center_y - target_y
+            if dx * dx + dy * dy <= reach_squared:
                 if hasattr(target, 'health'): # Check if target has health attribute
                     target.health -= damage
-                    print(
-                        f"{self.__class__.__name__} attacked {target.__class__.__name__} at ({target.row}, {target.col})!")
+                    log.debug("%s attacked %s at (%d, %d)!",
+                              self.__class__.__name__, target.__class__.__name__, target.row, target.col)
                     if target.health <= 0:
                         target.alive = False
                         target.remove_from_sprite_lists()
-                        print(f"{target.__class__.__name__} was destroyed!")
+                        log.debug("%s was destroyed!", target.__class__.__name__)
 
 
 class Hut(Structure):
@@ -151,16 +192,34 @@ class Tower(Structure):
         super().__init__('assets/images/resources/tower.png', start_x, start_y, cost={"WOOD": 5, "STONE": 5}, health=200, scale=0.15, team=team)
         self.team = team
 
+
+texture_registry.register(Hut, 'assets/images/resources/hut.png')
+texture_registry.register(Tower, 'assets/images/resources/tower.png')
+
+# Structure classes by name, e.g. for commands read from a recording
+STRUCTURE_TYPES = {structure_type.__name__: structure_type for structure_type in (Hut, Tower)}
+
+
 class BuildingManager:
     """
     A class to manage and track all structures in the game.
     """
-    def __init__(self):
+    def __init__(self, world=None):
         """
         Manage and track all structures in the game.
+        Args:
+            world (ChunkedWorld): Optional chunked map; structures are also added to its per-chunk
+                "structures" sprite lists, used for drawing.
         """
         # List to hold all structure sprites
         self.structures = arcade.SpriteList()
+        self.world = world
+        # Tile index of the structures
+        self.index = SpatialHash()
+        # Upgrade manager for the player's structures, set by the UpgradeManager
+        self.upgrades = None
+        # Number of structures each team has built
+        self.built = {"player": 0, "enemy": 0}
 
     def place_structure(self, structure_type, x, y, resources, team):
         """
@@ -190,8 +249,8 @@ class BuildingManager:
 
         # If a resource is insufficient, log an error message and exit
         if insufficient:
-            print(f"Insufficient resources for {structure_type.__name__}. "
-                  f"Available: {', '.join(available_str)}. Needed: {', '.join(required_str)}")
+            log.info("Insufficient resources for %s. Available: %s. Needed: %s",
+                     structure_type.__name__, ", ".join(available_str), ", ".join(required_str))
             return False
 
         # Deduct the required resources from the player's inventory
@@ -199,17 +258,31 @@ class BuildingManager:
             resources[res] -= amt
 
         # Add the structure to the list and log success
-        self.structures.append(structure)
-        print(f"{structure_type.__name__} successfully placed.")
+        self.add_structure(structure)
+        self.built[team] += 1
+        log.debug("%s successfully placed.", structure_type.__name__)
         return True
 
+    def add_structure(self, structure):
+        """
+        Start tracking a structure, letting the player's upgrades apply to the player's structures.
+        Args:
+            structure (Structure): The structure to add.
+        """
+        if structure.team == "player" and self.upgrades is not None:
+            self.upgrades.attach(structure, "structure")
+        self.structures.append(structure)
+        self.index.add(structure)
+        if self.world is not None:
+            self.world.add("structures", structure)
+
     def draw_structures(self):
         """
         Draw all structures on the screen.
         """
         self.structures.draw()  # Use the sprite list's draw method to render structures
 
-    def update_structures(self, delta_time, player_list, ai_list, enemy_list):
+    def update_structures(self, delta_time, player_list, ai_list, enemy_list, enemy_index=None, ai_index=None):
         """
         Update all structures for spawning and attacking.
 
@@ -218,6 +291,9 @@ class BuildingManager:
             player_list (arcade.SpriteList): List of player-controlled sprites.
             ai_list (arcade.SpriteList): List of AI-controlled sprites.
             enemy_list (arcade.SpriteList): List of enemy sprites.
+            enemy_index (EnemyStore): Optional tile index of the enemies. Spawned enemies are added to it
+                and towers and huts find their targets through it.
+            ai_index (SpatialHash): Optional tile index of the AI players, used the same way.
         """
         for structure in self.structures:
             structure.spawn_timer += delta_time
@@ -225,12 +301,13 @@ class BuildingManager:
 
             # Spawn entities based on team
             if structure.team == "player":
-                structure.spawn_entity(ai_list, TILE_SIZE)
+                structure.spawn_entity(ai_list, TILE_SIZE, ai_index)
                 if structure.attack_timer >= 1:
-                    structure.attack_nearby_entities(enemy_list, BUILDING_ATTACK_RANGE, BUILDING_ATTACK_DAMAGE)
+                    structure.attack_nearby_entities(enemy_list, BUILDING_ATTACK_RANGE, BUILDING_ATTACK_DAMAGE,
+                                                     enemy_index)
             elif structure.team == "enemy":
-                structure.spawn_entity(enemy_list, TILE_SIZE)
+                structure.spawn_entity(enemy_list, TILE_SIZE, enemy_index)
                 if structure.attack_timer >= 1:
                     structure.attack_nearby_entities(player_list, BUILDING_ATTACK_RANGE, BUILDING_ATTACK_DAMAGE)
-                    structure.attack_nearby_entities(ai_list, BUILDING_ATTACK_RANGE, BUILDING_ATTACK_DAMAGE)
+                    structure.attack_nearby_entities(ai_list, BUILDING_ATTACK_RANGE, BUILDING_ATTACK_DAMAGE, ai_index)
                 structure.attack_timer = 0
@@ -0,0 +1,305 @@
+"""
+Module: chunks
+Description: A chunked world model for large maps. The grid is divided into square chunks of tiles that
+are only created once something is placed in them, so memory follows the populated part of the map rather
+than its size. Each chunk keeps its own tile layers (e.g. the resource on each tile) and its own sprite
+lists, so drawing and lookups only touch the chunks in question. The world also sets the level of detail of
+agent updates: agents in chunks near the player are simulated on every move, those in distant chunks in
+coarse batches of several moves at a time.
+"""
+
+import arcade
+import numpy as np
+from game_constants import GRID_WIDTH, GRID_HEIGHT, CHUNK_SIZE
+
+# Agent scheduling
+NEAR_CHUNK_RADIUS = 1  # Chunks within this many chunks of the player's chunk are simulated on every move
+DISTANT_CHUNK_INTERVAL = 4  # Distant chunks are simulated this many moves at once, on one move in this many
+
+
+class Chunk:
+    """
+    A square block of tiles with its own tile layers and sprite lists.
+
+    Attributes:
+        chunk_row (int): Row of the chunk in the grid of chunks.
+        chunk_col (int): Column of the chunk in the grid of chunks.
+        row (int): Row of the chunk's first tile.
+        col (int): Column of the chunk's first tile.
+        size (int): Width and height of the chunk in tiles.
+        layers (dict): Layer name to a (size, size) object array with the value on each tile, or None.
+        sprite_lists (dict): Kind of entity (e.g. "resources") to the sprite list of those in the chunk.
+    """
+    def __init__(self, chunk_row, chunk_col, size=CHUNK_SIZE):
+        """
+        Initialize an empty chunk.
+
+        Args:
+            chunk_row (int): Row of the chunk in the grid of chunks.
+            chunk_col (int): Column of the chunk in the grid of chunks.
+            size (int): Width and height of the chunk in tiles.
+        """
+        self.chunk_row = chunk_row
+        self.chunk_col = chunk_col
+        self.size = size
+        self.row = chunk_row * size
+        self.col = chunk_col * size
+        self.layers = {}
+        self.sprite_lists = {}
+
+    def layer(self, name):
+        """
+        Get a tile layer of the chunk, creating it on first use.
+
+        Args:
+            name (str): Name of the layer.
+        Returns:
+            numpy.ndarray: (size, size) object array, indexed by tile row and column within the chunk.
+        """
+        layer = self.layers.get(name)
+        if layer is None:
+            layer = self.layers[name] = np.full((self.size, self.size), None, dtype=object)
+        return layer
+
+    def sprite_list(self, kind):
+        """
+        Get the sprite list of one kind of entity in the chunk, creating it on first use.
+
+        Args:
+            kind (str): Kind of entity, e.g. "resources".
+        Returns:
+            arcade.SpriteList: The sprites of that kind in the chunk.
+        """
+        sprite_list = self.sprite_lists.get(kind)
+        if sprite_list is None:
+            sprite_list = self.sprite_lists[kind] = arcade.SpriteList()
+        return sprite_list
+
+
+class ChunkedWorld:
+    """
+    The map as a grid of lazily created chunks.
+
+    Attributes:
+        width (int): Width of the map in tiles.
+        height (int): Height of the map in tiles.
+        chunk_size (int): Width and height of a chunk in tiles.
+        chunk_rows (int): Number of rows of chunks covering the map.
+        chunk_cols (int): Number of columns of chunks covering the map.
+        chunks (dict): (chunk_row, chunk_col) to the chunks created so far.
+        near_radius (int): Chunks within this many chunks of the center are simulated on every move.
+        distant_interval (int): Distant chunks are simulated this many moves at once, on one move in this many.
+    """
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, chunk_size=CHUNK_SIZE,
+                 near_radius=NEAR_CHUNK_RADIUS, distant_interval=DISTANT_CHUNK_INTERVAL):
+        """
+        Initialize a world without chunks.
+
+        Args:
+            width (int): Width of the map in tiles.
+            height (int): Height of the map in tiles.
+            chunk_size (int): Width and height of a chunk in tiles.
+            near_radius (int): Chunks within this many chunks of the center are simulated on every move.
+            distant_interval (int): Distant chunks are simulated this many moves at once, on one move in
+                this many.
+        """
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.chunk_rows = -(-height // chunk_size)
+        self.chunk_cols = -(-width // chunk_size)
+        self.chunks = {}
+        self.near_radius = near_radius
+        self.distant_interval = distant_interval
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def chunk_at(self, row, col, create=False):
+        """
+        Get the chunk that holds a tile.
+
+        Args:
+            row (int): Row of the tile.
+            col (int): Column of the tile.
+            create (bool): Create the chunk if it does not exist yet.
+        Returns:
+            Chunk: The chunk, or None if it does not exist and create is False.
+        """
+        key = (row // self.chunk_size, col // self.chunk_size)
+        chunk = self.chunks.get(key)
+        if chunk is None and create:
+            chunk = self.chunks[key] = Chunk(key[0], key[1], self.chunk_size)
+        return chunk
+
+    def get_tile(self, layer, row, col):
+        """
+        Get the value of a tile in a layer.
+
+        Args:
+            layer (str): Name of the layer.
+            row (int): Row of the tile.
+            col (int): Column of the tile.
+        Returns:
+            The value on the tile, or None if nothing was set there.
+        """
+        chunk = self.chunks.get((row // self.chunk_size, col // self.chunk_size))
+        if chunk is None:
+            return None
+        values = chunk.layers.get(layer)
+        if values is None:
+            return None
+        return values[row - chunk.row, col - chunk.col]
+
+    def set_tile(self, layer, row, col, value):
+        """
+        Set the value of a tile in a layer, creating its chunk if needed.
+
+        Args:
+            layer (str): Name of the layer.
+            row (int): Row of the tile.
+            col (int): Column of the tile.
+            value: The new value, None to clear the tile.
+        Returns:
+            Chunk: The chunk that holds the tile.
+        """
+        chunk = self.chunk_at(row, col, create=True)
+        chunk.layer(layer)[row - chunk.row, col - chunk.col] = value
+        return chunk
+
+    def add(self, kind, sprite):
+        """
+        Add a sprite to the sprite list of its kind in the chunk of its tile. The sprite leaves the list
+        when it is removed from its sprite lists.
+
+        Args:
+            kind (str): Kind of entity, e.g. "resources".
+            sprite (arcade.Sprite): Sprite with `row` and `col` attributes.
+        """
+        self.chunk_at(sprite.row, sprite.col, create=True).sprite_list(kind).append(sprite)
+
+    def clear(self, kind, layer=None):
+        """
+        Empty the sprite lists of one kind of entity in every chunk, and optionally a tile layer.
+
+        Args:
+            kind (str): Kind of entity.
+            layer (str): Name of a tile layer to clear as well.
+        """
+        for chunk in self.chunks.values():
+            sprite_list = chunk.sprite_lists.get(kind)
+            if sprite_list is not None:
+                sprite_list.clear()
+            values = chunk.layers.get(layer)
+            if values is not None:
+                values[:] = None
+
+    def chunks_in_rect(self, row_min, row_max, col_min, col_max):
+        """
+        Get the existing chunks that overlap a rectangle of tiles.
+
+        Args:
+            row_min (int): First row, inclusive.
+            row_max (int): Last row, inclusive.
+            col_min (int): First column, inclusive.
+            col_max (int): Last column, inclusive.
+        Returns:
+            list: The chunks.
+        """
+        size = self.chunk_size
+        chunks = self.chunks
+        found = []
+        for chunk_row in range(max(row_min, 0) // size, min(row_max, self.height - 1) // size + 1):
+            for chunk_col in range(max(col_min, 0) // size, min(col_max, self.width - 1) // size + 1):
+                chunk = chunks.get((chunk_row, chunk_col))
+                if chunk is not None:
+                    found.append(chunk)
+        return found
+
+    def sprite_lists_in_rect(self, kind, row_min, row_max, col_min, col_max):
+        """
+        Get the sprite lists of one kind of entity in the chunks that overlap a rectangle of tiles.
+
+        Args:
+            kind (str): Kind of entity.
+            row_min (int): First row, inclusive.
+            row_max (int): Last row, inclusive.
+            col_min (int): First column, inclusive.
+            col_max (int): Last column, inclusive.
+        Returns:
+            list: The non-empty sprite lists.
+        """
+        return [chunk.sprite_lists[kind] for chunk in self.chunks_in_rect(row_min, row_max, col_min, col_max)
+                if chunk.sprite_lists.get(kind)]
+
+    def near(self, rows, cols, center_rows, center_cols, radius=1):
+        """
+        Find the tiles in chunks within a number of chunks of the chunk of any center tile.
+
+        Args:
+            rows (numpy.ndarray): Row of each tile.
+            cols (numpy.ndarray): Column of each tile, matching rows.
+            center_rows (numpy.ndarray): Row of each center tile.
+            center_cols (numpy.ndarray): Column of each center tile, matching center_rows.
+            radius (int): Number of chunks on each side of a center's chunk.
+        Returns:
+            numpy.ndarray: Bool array, True for the tiles near a center.
+        """
+        size = self.chunk_size
+        marked = np.zeros((self.chunk_rows + 2 * radius, self.chunk_cols + 2 * radius), dtype=bool)
+        marked[center_rows // size + radius, center_cols // size + radius] = True
+        # Spread the marks to the neighboring chunks, one chunk per pass on each axis
+        for _ in range(radius):
+            marked[1:] |= marked[:-1].copy()
+            marked[:-1] |= marked[1:].copy()
+            marked[:, 1:] |= marked[:, :-1].copy()
+            marked[:, :-1] |= marked[:, 1:].copy()
+        return marked[rows // size + radius, cols // size + radius]
+
+    def moves_due(self, rows, cols, center_row, center_col, move):
+        """
+        Find how many moves to simulate for each agent on a move. Agents in chunks near the center are
+        simulated in full detail, one move per move. Agents in distant chunks are simulated at a coarse
+        level of detail, distant_interval moves at once on one move in distant_interval. Distant chunks
+        take turns, so the work is spread evenly over the moves. An agent is back to full detail as
+        soon as it enters a chunk near the center.
+
+        Args:
+            rows (numpy.ndarray): Row of each agent.
+            cols (numpy.ndarray): Column of each agent, matching rows.
+            center_row (int): Row of the center tile, e.g. the player's.
+            center_col (int): Column of the center tile.
+            move (int): Number of the move.
+        Returns:
+            numpy.ndarray: Moves to simulate for each agent: 1, distant_interval or 0.
+        """
+        chunk_rows = rows // self.chunk_size
+        chunk_cols = cols // self.chunk_size
+        near = ((np.abs(chunk_rows - center_row // self.chunk_size) <= self.near_radius)
+                & (np.abs(chunk_cols - center_col // self.chunk_size) <= self.near_radius))
+        if near.all():
+            return near.astype(np.int64)
+        turn = (chunk_rows * self.chunk_cols + chunk_cols + move) % self.distant_interval == 0
+        return np.where(near, 1, np.where(turn, self.distant_interval, 0))
+
+    def moves_due_at(self, row, col, center_row, center_col, move):
+        """
+        Find how many moves to simulate for a single agent on a move (see moves_due()).
+
+        Args:
+            row (int): Row of the agent.
+            col (int): Column of the agent.
+            center_row (int): Row of the center tile.
+            center_col (int): Column of the center tile.
+            move (int): Number of the move.
+        Returns:
+            int: Moves to simulate: 1, distant_interval or 0.
+        """
+        chunk_row = row // self.chunk_size
+        chunk_col = col // self.chunk_size
+        if (abs(chunk_row - center_row // self.chunk_size) <= self.near_radius
+                and abs(chunk_col - center_col // self.chunk_size) <= self.near_radius):
+            return 1
+        if (chunk_row * self.chunk_cols + chunk_col + move) % self.distant_interval == 0:
+            return self.distant_interval
+        return 0
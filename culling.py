@@ -0,0 +1,66 @@
+"""
+Module: culling
+Description: View-frustum culling for drawing. Only sprites on tiles inside the camera rectangle are
+kept in the sprite lists that get submitted to the GPU, so draw cost follows what is on screen rather
+than the size of the map or the number of entities.
+"""
+
+import math
+import arcade
+from game_constants import TILE_SIZE
+
+
+def visible_tile_rect(camera_position, view_width, view_height, tile_size=TILE_SIZE, margin=1):
+    """
+    Get the tiles covered by a camera view.
+
+    Args:
+        camera_position (tuple): (x, y) world position of the camera center, in pixels.
+        view_width (float): Width of the view in pixels.
+        view_height (float): Height of the view in pixels.
+        tile_size (int): Size of each tile in pixels (default is TILE_SIZE).
+        margin (int): Extra tiles to include on each side, for sprites that overhang their tile.
+
+    Returns:
+        tuple: (row_min, row_max, col_min, col_max), inclusive and not clamped to the grid.
+    """
+    camera_x, camera_y = camera_position
+    col_min = math.floor((camera_x - view_width / 2) / tile_size) - margin
+    col_max = math.floor((camera_x + view_width / 2) / tile_size) + margin
+    row_min = math.floor((camera_y - view_height / 2) / tile_size) - margin
+    row_max = math.floor((camera_y + view_height / 2) / tile_size) + margin
+    return row_min, row_max, col_min, col_max
+
+
+class CulledSpriteList:
+    """
+    A persistent sprite list that holds only the currently visible subset of a larger set of sprites.
+
+    Each frame, update() is given the sprites found on visible tiles and only adds or removes the
+    difference, so the GPU buffers of the list are not rebuilt every frame.
+    """
+    def __init__(self):
+        """Initialize an empty culled list."""
+        self.sprite_list = arcade.SpriteList()
+
+    def __len__(self):
+        return len(self.sprite_list)
+
+    def update(self, visible_sprites):
+        """
+        Make the list hold exactly the given sprites.
+
+        Args:
+            visible_sprites (iterable): The sprites that are currently visible.
+        """
+        visible = set(visible_sprites)
+        sprite_list = self.sprite_list
+        for sprite in [sprite for sprite in sprite_list if sprite not in visible]:
+            sprite_list.remove(sprite)
+        for sprite in visible:
+            if sprite not in sprite_list:
+                sprite_list.append(sprite)
+
+    def draw(self):
+        """Draw the visible sprites."""
+        self.sprite_list.draw()
@@ -1,22 +1,105 @@
 """
 Module: enemies
 Description: Defines enemy behaviors, attributes, and interactions with other game entities.
-Provides classes for managing enemy-specific logic such as resource collection and inventory management.
+Provides classes for managing enemy-specific logic such as resource collection and inventory management,
+and an array-backed store that moves the whole enemy swarm with vectorized NumPy operations.
 """
 
+import arcade
+import numpy as np
+from game_utils import GridSprite, pos_to_grid
+from game_constants import TILE_SIZE, GRID_WIDTH, GRID_HEIGHT
+
+
+def _stored(field):
+    """
+    Create a property for an enemy attribute that lives in the enemy's EnemyStore.
+
+    Args:
+        field (str): Name of the store array backing the attribute.
+    Returns:
+        property: Reads and writes the store while the enemy is in one, or a local value otherwise.
+    """
+    def fget(self):
+        if self._store is None:
+            return self._detached[field]
+        return getattr(self._store, field)[self._slot].item()
+
+    def fset(self, value):
+        if self._store is None:
+            self._detached[field] = value
+        else:
+            self._store.set_value(self._slot, field, value)
+
+    return property(fget, fset)
+
+
+class EnemyInventory:
+    """
+    Dict-like view of an enemy's WOOD and STONE counts stored in an EnemyStore.
+    """
+    KEYS = {"WOOD": "wood", "STONE": "stone"}
+
+    def __init__(self, store, slot):
+        """
+        Args:
+            store (EnemyStore): The store holding the counts.
+            slot (int): The enemy's slot in the store.
+        """
+        self.store = store
+        self.slot = slot
+
+    def __getitem__(self, key):
+        return getattr(self.store, self.KEYS[key])[self.slot].item()
+
+    def __setitem__(self, key, value):
+        getattr(self.store, self.KEYS[key])[self.slot] = value
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def get(self, key, default=None):
+        return self[key] if key in self.KEYS else default
+
+    def items(self):
+        return [(key, self[key]) for key in self.KEYS]
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class _DetachedInventory(EnemyInventory):
+    """Inventory view over the local state of an enemy that is not in a store."""
+    def __init__(self, detached):
+        self.detached = detached
+
+    def __getitem__(self, key):
+        return self.detached[self.KEYS[key]]
+
+    def __setitem__(self, key, value):
+        self.detached[self.KEYS[key]] = value
 
-from game_utils import GridSprite
 
 class Enemy(GridSprite):
     """
     Custom Enemy class inheriting from GridSprite to include attributes for resource collection
     and building behavior.
 
+    While an enemy is in an EnemyStore its state lives in the store's arrays and the sprite's
+    pixel position is only synced from them for drawing.
+
     Attributes:
         alive (bool): Indicates whether the enemy is alive.
         inventory (dict): Tracks the resources the enemy has collected (e.g., "WOOD", "STONE").
         attack_power (int): The attack power of the enemy for damaging structures or players.
     """
+    row = _stored("row")
+    col = _stored("col")
+    health = _stored("health")
+    speed = _stored("speed")
+    attack_power = _stored("attack_power")
+    alive = _stored("alive")
+
     def __init__(self, image, scaling, health=100):
         """
         Initializes an Enemy object with default attributes.
@@ -26,8 +109,441 @@ class Enemy(GridSprite):
             scaling (float): The scaling factor for the enemy's sprite.
             health (int): Initial health of the enemy.
         """
+        # Local state used until the enemy is added to a store
+        self._store = None
+        self._slot = -1
+        self._detached = {"wood": 0, "stone": 0, "modifiers": 0}
         super().__init__(image, scaling)
         self.alive = True
-        self.inventory = {"WOOD": 0, "STONE": 0}  # Enemy inventory for building resources
         self.attack_power = 5  # Default attack power
         self.health = health
+
+    def reset(self, row, col, health=100):
+        """
+        Reinitialize a detached enemy at a new tile, e.g. when it is reused from a pool.
+
+        Args:
+            row (int): Row index in the grid.
+            col (int): Column index in the grid.
+            health (int): Initial health of the enemy.
+        """
+        self._detached = {
+            "row": row,
+            "col": col,
+            "health": health,
+            "speed": 1.0,
+            "attack_power": 5,
+            "wood": 0,
+            "stone": 0,
+            "alive": True,
+            "modifiers": 0,
+        }
+        self.resource_gathering_speed = 1.0
+        self.position = pos_to_grid(row, col)
+
+    @property
+    def inventory(self):
+        """dict: The enemy's building resources, keyed by "WOOD" and "STONE"."""
+        if self._store is None:
+            return _DetachedInventory(self._detached)
+        return EnemyInventory(self._store, self._slot)
+
+
+class EnemyStore:
+    """
+    Struct-of-arrays storage for the enemy swarm.
+
+    Each enemy occupies a slot across parallel NumPy arrays (position, health, speed, attack power,
+    inventory and alive flag), so the swarm can be moved, clamped and converted to pixel coordinates
+    in a few vectorized operations. The store also answers tile queries with the same interface as
+    SpatialHash, which lets it stand in as the enemy index.
+
+    Attributes:
+        sprites (list): Enemy sprite in each slot, or None for free slots.
+        size (int): Number of slots in use or previously used.
+        moved (numpy.ndarray): Slots whose pixel position changed since the last sprite sync.
+        rng (numpy.random.Generator): Random generator used for the random walk.
+        active_modifiers (dict): Flag to stat changes of the modifiers in effect; enemies added while
+            a modifier is in effect receive it too.
+    """
+    FIELDS = {
+        "row": np.int32,
+        "col": np.int32,
+        "health": np.int32,
+        "speed": np.float64,
+        "attack_power": np.int32,
+        "wood": np.int32,
+        "stone": np.int32,
+        "alive": np.bool_,
+        "modifiers": np.int32,  # Bit flags of the event modifiers applied to the enemy
+    }
+
+    def __init__(self, capacity=64, width=GRID_WIDTH, height=GRID_HEIGHT, tile_size=TILE_SIZE, rng=None):
+        """
+        Initialize an empty store.
+
+        Args:
+            capacity (int): Initial number of slots; the store grows as needed.
+            width (int): Width of the grid in tiles.
+            height (int): Height of the grid in tiles.
+            tile_size (int): Size of a tile in pixels.
+            rng (numpy.random.Generator): Random generator for the random walk (default: a fresh one).
+        """
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.capacity = capacity
+        for field, dtype in self.FIELDS.items():
+            setattr(self, field, np.zeros(capacity, dtype=dtype))
+        self.center_x = np.zeros(capacity)
+        self.center_y = np.zeros(capacity)
+        self.moved = np.zeros(capacity, dtype=bool)
+        self.sprites = [None] * capacity
+        self.size = 0
+        self.count = 0
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.active_modifiers = {}
+        self._free_slots = []
+        self._index_dirty = True
+        self._sorted_slots = np.zeros(0, dtype=np.intp)
+        self._sorted_keys = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        sprites = self.sprites
+        return iter([sprites[slot] for slot in self.active_slots()])
+
+    def __contains__(self, enemy):
+        return getattr(enemy, "_store", None) is self
+
+    def add(self, enemy):
+        """
+        Move an enemy's state into the store.
+
+        Args:
+            enemy (Enemy): A detached enemy.
+        """
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self.size == self.capacity:
+                self._grow()
+            slot = self.size
+            self.size += 1
+
+        for field in self.FIELDS:
+            getattr(self, field)[slot] = enemy._detached[field]
+        for flag, changes in self.active_modifiers.items():
+            if not self.modifiers[slot] & flag:
+                for field, amount in changes.items():
+                    getattr(self, field)[slot] += amount
+                self.modifiers[slot] |= flag
+        enemy._store = self
+        enemy._slot = slot
+        enemy.spatial_hash = self
+        self.sprites[slot] = enemy
+        self.count += 1
+        self._update_pixels(slot)
+        self._index_dirty = True
+
+    def remove(self, enemy):
+        """
+        Release an enemy's slot, copying its state back onto the sprite. Enemies from other stores are ignored.
+
+        Args:
+            enemy (Enemy): The enemy to remove.
+        """
+        if enemy._store is not self:
+            return
+        slot = enemy._slot
+        enemy._detached = {field: getattr(self, field)[slot].item() for field in self.FIELDS}
+        enemy._store = None
+        enemy._slot = -1
+        enemy.spatial_hash = None
+        self.alive[slot] = False
+        self.moved[slot] = False
+        self.sprites[slot] = None
+        self._free_slots.append(slot)
+        self.count -= 1
+        self._index_dirty = True
+
+    def remove_all(self, enemies):
+        """
+        Remove several enemies, e.g. before clearing the sprite list that holds them.
+
+        Args:
+            enemies (iterable): The enemies to remove.
+        """
+        for enemy in enemies:
+            self.remove(enemy)
+
+    def pack(self):
+        """
+        Get the store's state as arrays, e.g. for a snapshot.
+
+        Returns:
+            dict: The field arrays of all used slots (free slots included, marked not alive) and
+                "free_slots", the free slots in the order they will be reused.
+        """
+        arrays = {field: getattr(self, field)[:self.size] for field in self.FIELDS}
+        arrays["free_slots"] = np.array(self._free_slots, dtype=np.int32)
+        return arrays
+
+    def unpack(self, arrays, sprites):
+        """
+        Fill an empty store from packed arrays, attaching a detached sprite to every living slot.
+
+        Args:
+            arrays (dict): Arrays as returned by pack().
+            sprites (dict): Maps each living slot to the detached Enemy that takes it.
+        """
+        size = arrays["alive"].size
+        while self.capacity < size:
+            self._grow()
+        for field in self.FIELDS:
+            getattr(self, field)[:size] = arrays[field]
+            getattr(self, field)[size:] = 0
+        self.size = size
+        self.sprites = [None] * self.capacity
+        for slot, enemy in sprites.items():
+            enemy._store = self
+            enemy._slot = slot
+            enemy.spatial_hash = self
+            self.sprites[slot] = enemy
+        self.count = len(sprites)
+        self._free_slots = arrays["free_slots"].tolist()
+        self._update_pixels(self.active_slots())
+        self._index_dirty = True
+
+    def apply_modifier(self, flag, changes):
+        """
+        Add stat changes to every living enemy, and to enemies added later until the changes are reverted.
+        The enemies are marked with a flag, so the changes are reverted exactly once and only on them.
+
+        Args:
+            flag (int): Bit marking the enemies that carry the changes.
+            changes (dict): Field name (e.g. "speed") to the amount added.
+        """
+        slots = self.active_slots()
+        for field, amount in changes.items():
+            getattr(self, field)[slots] += amount
+        self.modifiers[slots] |= flag
+        self.active_modifiers[flag] = changes
+
+    def revert_modifier(self, flag, changes):
+        """
+        Take stat changes back from the living enemies marked with a flag and clear the flag.
+
+        Args:
+            flag (int): Bit marking the enemies that carry the changes.
+            changes (dict): Field name to the amount that was added.
+        """
+        self.active_modifiers.pop(flag, None)
+        slots = self.active_slots()
+        slots = slots[(self.modifiers[slots] & flag) != 0]
+        for field, amount in changes.items():
+            getattr(self, field)[slots] -= amount
+        self.modifiers[slots] &= ~flag
+
+    def move(self, enemy):
+        """
+        Kept for SpatialHash compatibility; position writes already update the store.
+        """
+
+    def set_value(self, slot, field, value):
+        """
+        Write one field of one slot, keeping pixel positions and the tile index current.
+
+        Args:
+            slot (int): The slot to write.
+            field (str): Name of the field.
+            value: The new value.
+        """
+        getattr(self, field)[slot] = value
+        if field in ("row", "col"):
+            self._update_pixels(slot)
+            self._index_dirty = True
+        elif field == "alive":
+            self._index_dirty = True
+
+    def active_slots(self):
+        """
+        Returns:
+            numpy.ndarray: Slots of all living enemies.
+        """
+        return np.flatnonzero(self.alive[:self.size])
+
+    def random_walk(self, slots=None, field=None, moves=1):
+        """
+        Move enemies one random step (including diagonals or staying put), clamped to the grid.
+
+        Args:
+            slots (numpy.ndarray): Slots to move; all living enemies if not given.
+            field (FlowField): Optional flow field; enemies within its reach step towards its goals instead.
+            moves (int): Number of random steps to take at once, e.g. for enemies simulated at a coarse
+                level of detail. Their sum is applied as a single move.
+        Returns:
+            numpy.ndarray: The slots that were processed.
+        """
+        if slots is None:
+            slots = self.active_slots()
+        if moves == 1:
+            steps = self.rng.integers(-1, 2, size=(2, slots.size), dtype=np.int32)
+        else:
+            steps = self.rng.integers(-1, 2, size=(moves, 2, slots.size), dtype=np.int32).sum(axis=0)
+        old_rows = self.row[slots]
+        old_cols = self.col[slots]
+        if field is not None:
+            row_steps, col_steps, reached = field.steps(old_rows, old_cols)
+            steps[0] = np.where(reached, col_steps, steps[0])
+            steps[1] = np.where(reached, row_steps, steps[1])
+        new_rows = np.clip(old_rows + steps[1], 0, self.height - 1)
+        new_cols = np.clip(old_cols + steps[0], 0, self.width - 1)
+        self.row[slots] = new_rows
+        self.col[slots] = new_cols
+        self._update_pixels(slots[(new_rows != old_rows) | (new_cols != old_cols)])
+        self._index_dirty = True
+        return slots
+
+    def sync_sprites(self):
+        """
+        Copy pixel positions from the arrays onto the sprites that moved. Call before drawing.
+        """
+        for slot in np.flatnonzero(self.moved[:self.size]):
+            self.sprites[slot].position = (self.center_x[slot].item(), self.center_y[slot].item())
+        self.moved[:self.size] = False
+
+    def sync_slots(self, slots):
+        """
+        Copy pixel positions from the arrays onto the given sprites if they moved, e.g. only the visible ones.
+
+        Args:
+            slots (numpy.ndarray): Slots to sync.
+        """
+        moved = self.moved
+        for slot in slots[moved[slots]]:
+            self.sprites[slot].position = (self.center_x[slot].item(), self.center_y[slot].item())
+        moved[slots] = False
+
+    def slots_in_rect(self, row_min, row_max, col_min, col_max):
+        """
+        Find living enemies inside a rectangle of tiles.
+
+        Args:
+            row_min (int): First row, inclusive.
+            row_max (int): Last row, inclusive.
+            col_min (int): First column, inclusive.
+            col_max (int): Last column, inclusive.
+        Returns:
+            numpy.ndarray: Slots of the enemies in the rectangle.
+        """
+        starts, ends = self._index_ranges(row_min, row_max, col_min, col_max)
+        pieces = [self._sorted_slots[start:end] for start, end in zip(starts, ends) if end > start]
+        if not pieces:
+            return np.zeros(0, dtype=np.intp)
+        return np.concatenate(pieces)
+
+    def count_in_rect(self, row_min, row_max, col_min, col_max):
+        """
+        Count living enemies inside a rectangle of tiles, without looking at the enemies themselves.
+
+        Args:
+            row_min (int): First row, inclusive.
+            row_max (int): Last row, inclusive.
+            col_min (int): First column, inclusive.
+            col_max (int): Last column, inclusive.
+        Returns:
+            int: Number of enemies in the rectangle.
+        """
+        starts, ends = self._index_ranges(row_min, row_max, col_min, col_max)
+        return int((ends - starts).sum())
+
+    def at(self, row, col):
+        """
+        Get the enemies on a single tile.
+
+        Args:
+            row (int): Row index in the grid.
+            col (int): Column index in the grid.
+        Returns:
+            list: Enemy sprites on the tile.
+        """
+        return self.near(row, col, 0)
+
+    def near(self, row, col, radius=1):
+        """
+        Get the enemies within a square of tiles around a tile.
+
+        Args:
+            row (int): Row index of the center tile.
+            col (int): Column index of the center tile.
+            radius (int): Number of tiles to include on each side of the center tile.
+        Returns:
+            list: Enemy sprites in the square.
+        """
+        sprites = self.sprites
+        slots = self.slots_in_rect(row - radius, row + radius, col - radius, col + radius)
+        return [sprites[slot] for slot in slots]
+
+    def collisions(self, sprite, row, col, radius=1):
+        """
+        Find enemies that collide with a sprite, testing only nearby tiles.
+
+        Candidate sprites are synced from the arrays first so the pixel test uses current positions.
+
+        Args:
+            sprite (arcade.Sprite): The sprite to test.
+            row (int): Row index of the tile the sprite is on.
+            col (int): Column index of the tile the sprite is on.
+            radius (int): Number of neighboring tiles to search on each side.
+        Returns:
+            list: Colliding enemy sprites.
+        """
+        hits = []
+        for slot in self.slots_in_rect(row - radius, row + radius, col - radius, col + radius):
+            enemy = self.sprites[slot]
+            if self.moved[slot]:
+                enemy.position = (self.center_x[slot].item(), self.center_y[slot].item())
+                self.moved[slot] = False
+            if enemy is not sprite and arcade.check_for_collision(sprite, enemy):
+                hits.append(enemy)
+        return hits
+
+    def _index_ranges(self, row_min, row_max, col_min, col_max):
+        """Find the runs of the sorted tile index that cover each row of a rectangle of tiles."""
+        row_min, row_max = max(row_min, 0), min(row_max, self.height - 1)
+        col_min, col_max = max(col_min, 0), min(col_max, self.width - 1)
+        if row_min > row_max or col_min > col_max:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        if self._index_dirty:
+            self._rebuild_tile_index()
+
+        row_keys = np.arange(row_min, row_max + 1, dtype=np.int64) * self.width
+        starts = np.searchsorted(self._sorted_keys, row_keys + col_min, side="left")
+        ends = np.searchsorted(self._sorted_keys, row_keys + col_max, side="right")
+        return starts, ends
+
+    def _update_pixels(self, slots):
+        self.center_x[slots] = self.col[slots] * self.tile_size + self.tile_size / 2
+        self.center_y[slots] = self.row[slots] * self.tile_size + self.tile_size / 2
+        self.moved[slots] = True
+
+    def _rebuild_tile_index(self):
+        slots = self.active_slots()
+        keys = self.row[slots].astype(np.int64) * self.width + self.col[slots]
+        order = np.argsort(keys, kind="stable")
+        self._sorted_slots = slots[order]
+        self._sorted_keys = keys[order]
+        self._index_dirty = False
+
+    def _grow(self):
+        new_capacity = self.capacity * 2
+        for field in list(self.FIELDS) + ["center_x", "center_y", "moved"]:
+            old = getattr(self, field)
+            grown = np.zeros(new_capacity, dtype=old.dtype)
+            grown[:self.capacity] = old
+            setattr(self, field, grown)
+        self.sprites.extend([None] * (new_capacity - self.capacity))
+        self.capacity = new_capacity
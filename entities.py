@@ -0,0 +1,129 @@
+"""
+Module: entities
+Description: Persistent views over groups of sprite lists. A view iterates, counts and collision-tests
+across several sprite lists in place, so callers never merge lists into a temporary arcade.SpriteList
+(which would copy every sprite and allocate new GPU buffers).
+"""
+
+import arcade
+
+# arcade's CPU collision method; the GPU method needs a window and is slower for small lists
+CPU_COLLISION_METHOD = 3
+
+
+class MultiListView:
+    """
+    A read-only view over several sprite lists that behaves like one list.
+
+    The view keeps references to the lists, not copies of them, so it always reflects their
+    current contents and can be created once and reused every tick.
+
+    Attributes:
+        lists (tuple): The sprite lists the view spans.
+        index: Tile index of the group's sprites (an EnemyStore or SpatialHash), or None.
+    """
+    def __init__(self, *sprite_lists, index=None):
+        """
+        Initialize a view over sprite lists.
+
+        Args:
+            *sprite_lists (arcade.SpriteList): The lists to span, in iteration order.
+            index: Tile index holding exactly the sprites of the lists, used for collision tests.
+        """
+        self.lists = sprite_lists
+        self.index = index
+
+    def __len__(self):
+        return sum(len(sprite_list) for sprite_list in self.lists)
+
+    def __iter__(self):
+        for sprite_list in self.lists:
+            yield from sprite_list
+
+    def __contains__(self, sprite):
+        return any(sprite in sprite_list for sprite_list in self.lists)
+
+    def __bool__(self):
+        return any(self.lists)
+
+    def collisions(self, sprite, row=None, col=None):
+        """
+        Find the sprites in any of the lists that collide with a sprite.
+
+        With a tile index, only sprites on the tiles around the tested sprite are tested, and the index
+        brings their pixel positions up to date first (an EnemyStore only syncs them for drawing).
+
+        Args:
+            sprite (arcade.Sprite): The sprite to test.
+            row (int): Row index of the tile the sprite is on; defaults to the sprite's `row`.
+            col (int): Column index of the tile the sprite is on; defaults to the sprite's `col`.
+        Returns:
+            list: Colliding sprites.
+        """
+        if self.index is not None:
+            return self.index.collisions(sprite, sprite.row if row is None else row,
+                                         sprite.col if col is None else col)
+        return arcade.check_for_collision_with_lists(sprite, self.lists, method=CPU_COLLISION_METHOD)
+
+    def within(self, row, col, radius=1):
+        """
+        Find grid sprites within a square of tiles around a tile.
+
+        With a tile index only the tiles in the square are looked up; otherwise every sprite is checked.
+
+        Args:
+            row (int): Row index of the center tile.
+            col (int): Column index of the center tile.
+            radius (int): Number of tiles to include on each side of the center tile.
+        Returns:
+            list: Sprites whose `row` and `col` lie in the square.
+        """
+        if self.index is not None:
+            return self.index.near(row, col, radius)
+        return [
+            sprite for sprite in self
+            if abs(sprite.row - row) <= radius and abs(sprite.col - col) <= radius
+        ]
+
+
+class EntityRegistry:
+    """
+    Named, persistent views over the game's sprite lists.
+
+    Groups such as "enemies" (regular and raid enemies) or "diamonds" (regular and Diamond Rain
+    diamonds) are registered once; lookups return the same MultiListView every time.
+    """
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._views = {}
+
+    def __contains__(self, name):
+        return name in self._views
+
+    def __getitem__(self, name):
+        return self._views[name]
+
+    def register(self, name, *sprite_lists, index=None):
+        """
+        Register a named group of sprite lists.
+
+        Args:
+            name (str): Name of the group, e.g. "enemies".
+            *sprite_lists (arcade.SpriteList): The lists that make up the group.
+            index: Tile index holding exactly the group's sprites, used for collision tests. Groups
+                backed by an EnemyStore need it, since their sprites' pixel positions may be stale.
+        Returns:
+            MultiListView: The view over the group.
+        """
+        view = MultiListView(*sprite_lists, index=index)
+        self._views[name] = view
+        return view
+
+    def counts(self):
+        """
+        Count the entities in every group.
+
+        Returns:
+            dict: Group name to number of sprites.
+        """
+        return {name: len(view) for name, view in self._views.items()}
@@ -0,0 +1,189 @@
+"""
+Module: events
+Description: Random events such as Monkey Raid and Diamond Rain. Each event is described by data: how long
+it lasts, what it spawns and how fast (per second, up to a cap on the number of spawned entities alive),
+stat modifiers applied once when it starts and reverted once when it ends, and periodic effects. The
+EventScheduler runs events on its own fixed interval, independent of the frame or tick rate, and calls
+named hooks on the game that owns it.
+"""
+
+from game_log import get_logger
+
+log = get_logger("events")
+
+# Constants
+EVENT_COOLDOWN = 30  # Seconds between the starts of two random events
+EVENT_UPDATE_INTERVAL = 0.25  # Seconds between event updates
+
+# Event definitions. Hook names refer to methods of the scheduler's target:
+#   on_start / on_end: hook() called once when the event starts / ends.
+#   spawn: hook(count, cap) called with the number of entities due at `rate` per second.
+#   modifiers: enemy stat changes, applied through apply_modifiers(flag, changes) when the event starts
+#       (to the enemies on the map and those added while it runs) and reverted through
+#       revert_modifiers(flag, changes) when it ends. After a restore, resume_modifiers(flag, changes)
+#       puts them back in effect for enemies added later.
+#   pulse: hook(**params) called every `interval` seconds, with the remaining entries as parameters.
+EVENTS = {
+    "Monkey Raid": {
+        "duration": 10,
+        "spawn": {"hook": "spawn_raid_enemies", "rate": 3, "cap": 30},
+        "modifiers": {"speed": 1, "attack_power": 5},
+        "on_end": "clear_raid_enemies",
+    },
+    "Resource Shortage": {
+        "duration": 15,
+        "on_start": "clear_resources",
+        "on_end": "restore_resources",
+    },
+    "Meteor Shower": {
+        "duration": 5,
+        "pulse": {"hook": "meteor_strike", "interval": 0.5, "structure_damage": 20, "hit_chance": 0.05,
+                  "hit_damage": 10},
+    },
+    "Diamond Rain": {
+        "duration": 10,
+        "spawn": {"hook": "spawn_rain_diamonds", "rate": 5, "cap": 50},
+        "on_end": "clear_rain_diamonds",
+    },
+}
+
+
+class EventScheduler:
+    """
+    Starts random events after a cooldown and runs the active one.
+
+    Attributes:
+        target (object): The game whose hooks the events call, e.g. the Simulation.
+        events (dict): Event name to definition (see EVENTS).
+        cooldown (float): Seconds between the starts of two random events.
+        interval (float): Seconds between event updates.
+        active (str): Name of the running event, or None.
+        elapsed (float): Seconds the running event has been going.
+        since_last_event (float): Seconds since the last event started.
+    """
+    def __init__(self, target, rng, events=EVENTS, cooldown=EVENT_COOLDOWN, interval=EVENT_UPDATE_INTERVAL):
+        """
+        Initialize a scheduler with no running event.
+
+        Args:
+            target (object): The game whose hooks the events call.
+            rng (random.Random): Random stream used to pick events.
+            events (dict): Event name to definition.
+            cooldown (float): Seconds between the starts of two random events.
+            interval (float): Seconds between event updates.
+        """
+        self.target = target
+        self.rng = rng
+        self.events = events
+        self.cooldown = cooldown
+        self.interval = interval
+        self.active = None
+        self.elapsed = 0.0
+        self.since_last_event = 0.0
+        self.spawn_credit = 0.0  # Entities due but not spawned yet, as a fraction carried between updates
+        self.pulse_timer = 0.0
+        self.accumulator = 0.0  # Time not yet consumed by event updates
+
+    def update(self, delta_time):
+        """
+        Advance the scheduler, running as many fixed-interval event updates as are due.
+
+        Args:
+            delta_time (float): Time elapsed since the last call, in seconds.
+        """
+        self.accumulator += delta_time
+        while self.accumulator >= self.interval:
+            self.accumulator -= self.interval
+            self._tick(self.interval)
+
+    def start(self, name):
+        """
+        Start an event now, ending the running one first.
+
+        Args:
+            name (str): Name of the event.
+        """
+        if self.active is not None:
+            self.end()
+        event = self.events[name]
+        self.active = name
+        self.elapsed = 0.0
+        self.since_last_event = 0.0
+        self.spawn_credit = 0.0
+        self.pulse_timer = 0.0
+        if "modifiers" in event:
+            self.target.apply_modifiers(self._flag(name), event["modifiers"])
+        if "on_start" in event:
+            getattr(self.target, event["on_start"])()
+        log.info("Event started: %s", name)
+
+    def end(self):
+        """End the running event, reverting its modifiers. Does nothing if no event is running."""
+        if self.active is None:
+            return
+        name = self.active
+        event = self.events[name]
+        self.active = None
+        if "modifiers" in event:
+            self.target.revert_modifiers(self._flag(name), event["modifiers"])
+        if "on_end" in event:
+            getattr(self.target, event["on_end"])()
+        log.info("%s ended!", name)
+
+    def state(self):
+        """
+        Get the scheduler's timers, e.g. for a snapshot.
+
+        Returns:
+            dict: The values restore() takes.
+        """
+        return {name: getattr(self, name) for name in
+                ("active", "elapsed", "since_last_event", "spawn_credit", "pulse_timer", "accumulator", "cooldown")}
+
+    def restore(self, state):
+        """
+        Set the scheduler's timers without running the start or end hooks; the game state already reflects
+        them. The running event's modifiers are put back in effect for enemies added from now on.
+
+        Args:
+            state (dict): Values returned by state().
+        """
+        for name, value in state.items():
+            setattr(self, name, value)
+        if self.active is not None and "modifiers" in self.events[self.active]:
+            self.target.resume_modifiers(self._flag(self.active), self.events[self.active]["modifiers"])
+
+    def _flag(self, name):
+        """Get the bit that marks the entities modified by an event."""
+        return 1 << list(self.events).index(name)
+
+    def _tick(self, dt):
+        self.since_last_event += dt
+        if self.active is None:
+            if self.since_last_event >= self.cooldown:
+                name = self.rng.choice(list(self.events))
+                log.info("Random event triggered: %s", name)
+                self.start(name)
+            return
+
+        event = self.events[self.active]
+        self.elapsed += dt
+        if self.elapsed >= event["duration"]:
+            self.end()
+            return
+
+        spawn = event.get("spawn")
+        if spawn is not None:
+            self.spawn_credit += spawn["rate"] * dt
+            count = int(self.spawn_credit)
+            if count:
+                self.spawn_credit -= count
+                getattr(self.target, spawn["hook"])(count, spawn["cap"])
+
+        pulse = event.get("pulse")
+        if pulse is not None:
+            self.pulse_timer += dt
+            if self.pulse_timer >= pulse["interval"]:
+                self.pulse_timer -= pulse["interval"]
+                params = {key: value for key, value in pulse.items() if key not in ("hook", "interval")}
+                getattr(self.target, pulse["hook"])(**params)
@@ -0,0 +1,151 @@
+"""
+Module: flow_field
+Description: Shared flow fields for goal-seeking movement on the tile grid. A flow field stores the
+step distance from every tile to the nearest tile of a goal set, computed with one breadth-first search
+from all goals at once. Any number of agents can then follow the field towards the goals with a constant
+time lookup per step, instead of each agent searching for its own path.
+"""
+
+import numpy as np
+from game_constants import GRID_WIDTH, GRID_HEIGHT
+
+UNREACHED = np.iinfo(np.int32).max  # Distance of tiles the search did not reach
+
+# Row and column offsets of the eight neighboring tiles; agents move diagonally as well
+NEIGHBOR_ROWS = np.array([-1, -1, -1, 0, 0, 1, 1, 1], dtype=np.int32)
+NEIGHBOR_COLS = np.array([-1, 0, 1, -1, 1, -1, 0, 1], dtype=np.int32)
+
+
+class FlowField:
+    """
+    Distances to the nearest goal tile over the grid, with the step that leads towards it.
+
+    The search only runs when a query needs the distances and the goals or obstacles changed since
+    the last search, so setting the same goals every update costs a comparison. Distances are kept in
+    a grid padded with a blocked border, so neighbor lookups never need bounds checks.
+
+    Attributes:
+        width (int): Width of the grid in tiles.
+        height (int): Height of the grid in tiles.
+        max_distance (int): Steps the search expands from the goals, or None for the whole grid.
+            Tiles farther away are unreached and agents on them get no step.
+        searches (int): Number of searches run so far.
+    """
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, max_distance=None):
+        """
+        Initialize a flow field without goals.
+
+        Args:
+            width (int): Width of the grid in tiles.
+            height (int): Height of the grid in tiles.
+            max_distance (int): Steps the search expands from the goals, or None for the whole grid.
+        """
+        self.width = width
+        self.height = height
+        self.max_distance = max_distance
+        self._stride = width + 2  # Row length of the padded grid
+        self._offsets = NEIGHBOR_ROWS * self._stride + NEIGHBOR_COLS
+        self._passable = np.zeros((height + 2) * self._stride, dtype=bool)
+        self._passable.reshape(height + 2, self._stride)[1:-1, 1:-1] = True
+        self._goals = np.zeros(0, dtype=np.intp)
+        self._distances = np.full(self._passable.size, UNREACHED, dtype=np.int32)
+        self._dirty = False
+        self.searches = 0
+
+    def set_goals(self, rows, cols):
+        """
+        Set the goal tiles. The field is only searched again if the set of tiles changed.
+
+        Args:
+            rows (array-like): Row index of each goal tile.
+            cols (array-like): Column index of each goal tile, matching rows.
+        """
+        goals = np.unique(self._padded_index(np.asarray(rows), np.asarray(cols)))
+        if not np.array_equal(goals, self._goals):
+            self._goals = goals
+            self._dirty = True
+
+    def set_obstacles(self, blocked):
+        """
+        Set the tiles agents cannot enter. The field is only searched again if they changed.
+
+        Args:
+            blocked (numpy.ndarray): (height, width) bool array, True where a tile is blocked.
+        """
+        passable = self._passable.reshape(self.height + 2, self._stride)[1:-1, 1:-1]
+        if not np.array_equal(passable, ~blocked):
+            passable[...] = ~blocked
+            self._dirty = True
+
+    def distance(self, row, col):
+        """
+        Get the number of steps from a tile to the nearest goal.
+
+        Args:
+            row (int): Row index of the tile.
+            col (int): Column index of the tile.
+        Returns:
+            int: Steps to the nearest goal, or None if the tile is unreached.
+        """
+        distance = self._current_distances()[(row + 1) * self._stride + col + 1].item()
+        return None if distance == UNREACHED else distance
+
+    def step(self, row, col):
+        """
+        Get the step from one tile towards the nearest goal.
+
+        Args:
+            row (int): Row index of the tile.
+            col (int): Column index of the tile.
+        Returns:
+            tuple: (row, col) offset of the step, (0, 0) on a goal, or None on an unreached tile.
+        """
+        rows, cols, reached = self.steps(np.array([row]), np.array([col]))
+        if not reached[0]:
+            return None
+        return rows[0].item(), cols[0].item()
+
+    def steps(self, rows, cols):
+        """
+        Get the steps from many tiles towards their nearest goals at once.
+
+        Args:
+            rows (numpy.ndarray): Row index of each tile.
+            cols (numpy.ndarray): Column index of each tile, matching rows.
+        Returns:
+            tuple: (row_steps, col_steps, reached) arrays. reached is True where the search reached the
+                tile; the steps are 0 on goals and unreached tiles.
+        """
+        distances = self._current_distances()
+        cells = self._padded_index(rows, cols)
+        own = distances[cells]
+        neighbors = distances[cells[:, None] + self._offsets]
+        best = np.argmin(neighbors, axis=1)
+        reached = own != UNREACHED
+        closer = reached & (neighbors[np.arange(cells.size), best] < own)
+        return np.where(closer, NEIGHBOR_ROWS[best], 0), np.where(closer, NEIGHBOR_COLS[best], 0), reached
+
+    def _padded_index(self, rows, cols):
+        return (rows.astype(np.intp) + 1) * self._stride + cols + 1
+
+    def _current_distances(self):
+        if self._dirty:
+            self._search()
+        return self._distances
+
+    def _search(self):
+        """Breadth-first search from all goal tiles at once, one whole frontier per iteration."""
+        distances = self._distances
+        distances.fill(UNREACHED)
+        passable = self._passable
+        frontier = self._goals[passable[self._goals]]
+        distances[frontier] = 0
+        steps = 0
+        while frontier.size and (self.max_distance is None or steps < self.max_distance):
+            steps += 1
+            neighbors = (frontier[:, None] + self._offsets).ravel()
+            neighbors = np.unique(neighbors[passable[neighbors] & (distances[neighbors] == UNREACHED)])
+            distances[neighbors] = steps
+            frontier = neighbors
+        self._dirty = False
+        self.searches += 1
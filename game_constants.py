@@ -16,3 +16,6 @@ GRID_HEIGHT = 50
 # Screen dimensions
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
+
+# Width and height of a world chunk (number of tiles)
+CHUNK_SIZE = 32
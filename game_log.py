@@ -0,0 +1,165 @@
+"""
+Module: game_log
+Description: Event log for "Monkey Tribe Wars" built on the standard logging module. Every subsystem
+logs through its own child of the "monkey_tribe_wars" logger, repeated messages are rate limited, and
+the log can be written to a file from a background thread so the game loop never blocks on I/O.
+Gameplay chatter is logged at DEBUG with lazy %-style arguments, so when its level is disabled a call
+costs a cached level check and nothing is formatted.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import time
+
+ROOT_LOGGER_NAME = "monkey_tribe_wars"
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+DEFAULT_LEVEL = "INFO"
+OFF = logging.CRITICAL + 1  # Above every level, so nothing is logged
+
+# Environment variables read by configure_from_env()
+LEVEL_ENV_VAR = "MTW_LOG_LEVEL"
+FILE_ENV_VAR = "MTW_LOG_FILE"
+
+# Library convention: stay silent until the application configures logging
+logging.getLogger(ROOT_LOGGER_NAME).addHandler(logging.NullHandler())
+
+
+def get_logger(subsystem):
+    """
+    Get the logger of a game subsystem.
+
+    Args:
+        subsystem (str): Subsystem name, e.g. "simulation" or "buildings".
+    Returns:
+        logging.Logger: The "monkey_tribe_wars.<subsystem>" logger.
+    """
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{subsystem}")
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drops messages that repeat too often.
+
+    Messages are grouped by logger, level and unformatted message, so "Enemy collected %s." counts
+    as one message whatever the resource. Each group may log `burst` records per `interval` seconds;
+    the first record let through after a quiet period reports how many were dropped.
+    """
+    def __init__(self, interval=1.0, burst=5):
+        """
+        Initialize the filter.
+
+        Args:
+            interval (float): Length of a rate-limiting window, in seconds.
+            burst (int): Records allowed per message group and window.
+        """
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self._windows = {}  # Message group to [window start, records let through, records dropped]
+
+    def filter(self, record):
+        """
+        Decide whether a record is logged.
+
+        Args:
+            record (logging.LogRecord): The record to check.
+        Returns:
+            bool: True if the record should be logged.
+        """
+        decision = getattr(record, "rate_limit_passed", None)
+        if decision is not None:  # Already checked by another handler sharing this filter
+            return decision
+        decision = self._check(record)
+        record.rate_limit_passed = decision
+        return decision
+
+    def _check(self, record):
+        key = (record.name, record.levelno, record.msg)
+        now = time.monotonic()
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self.interval:
+            dropped = window[2] if window is not None else 0
+            self._windows[key] = [now, 1, 0]
+            if dropped and isinstance(record.args, tuple):
+                record.msg = f"{record.msg} (%d similar messages suppressed)"
+                record.args = record.args + (dropped,)
+            return True
+        if window[1] < self.burst:
+            window[1] += 1
+            return True
+        window[2] += 1
+        return False
+
+
+def configure_logging(level=DEFAULT_LEVEL, log_file=None, console=True, rate_interval=1.0, rate_burst=5):
+    """
+    Configure the game log. Replaces handlers from a previous call.
+
+    Args:
+        level (str | int): Minimum level to log, e.g. "DEBUG" or logging.INFO; "OFF" disables the log.
+        log_file (str): Optional path of a file to append the log to. Records are handed to a queue
+            and written by a background thread.
+        console (bool): Whether to also log to stderr.
+        rate_interval (float): Rate-limiting window, in seconds.
+        rate_burst (int): Repeats of a message allowed per window.
+    Returns:
+        logging.handlers.QueueListener: The listener writing the log file, or None without a file.
+    """
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    _remove_handlers(root)
+    if isinstance(level, str):
+        level = OFF if level.upper() == "OFF" else logging.getLevelName(level.upper())
+    root.setLevel(level)
+    root.propagate = False
+    if level >= OFF:
+        root.addHandler(logging.NullHandler())
+        return None
+
+    rate_limit = RateLimitFilter(rate_interval, rate_burst)
+    formatter = logging.Formatter(LOG_FORMAT)
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        console_handler.addFilter(rate_limit)
+        root.addHandler(console_handler)
+
+    listener = None
+    if log_file:
+        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        file_handler.setFormatter(formatter)
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(rate_limit)  # Dropped records never reach the queue
+        root.addHandler(queue_handler)
+        listener = logging.handlers.QueueListener(log_queue, file_handler)
+        listener.start()
+        root.queue_listener = listener
+        atexit.register(listener.stop)
+    return listener
+
+
+def configure_from_env():
+    """
+    Configure the game log from the MTW_LOG_LEVEL and MTW_LOG_FILE environment variables.
+
+    Returns:
+        logging.handlers.QueueListener: The listener writing the log file, or None without a file.
+    """
+    return configure_logging(os.environ.get(LEVEL_ENV_VAR, DEFAULT_LEVEL), os.environ.get(FILE_ENV_VAR))
+
+
+def _remove_handlers(root):
+    """Detach and close the handlers installed on the game's root logger."""
+    listener = getattr(root, "queue_listener", None)
+    if listener is not None:
+        listener.stop()
+        atexit.unregister(listener.stop)
+        for handler in listener.handlers:
+            handler.close()
+        root.queue_listener = None
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
@@ -4,7 +4,10 @@ Description: Utility functions and classes for grid-based operations in the game
 """
 
 import arcade
+from arcade.shape_list import ShapeElementList, create_lines
 from game_constants import TILE_SIZE
+from textures import texture_registry
+from upgrades import UpgradedStat
 
 def pos_to_grid(row, col, tile_size=TILE_SIZE):
     """
@@ -38,6 +41,31 @@ def pos_to_grid_index(center_x, center_y, tile_size):
     col = int(center_x // tile_size)
     return row, col
 
+def create_grid_shape(grid_width, grid_height, tile_size=TILE_SIZE, color=arcade.color.LIGHT_GRAY):
+    """
+    Build the grid lines once as a single batched shape that can be drawn with one call.
+
+    Args:
+        grid_width (int): Width of the grid in tiles.
+        grid_height (int): Height of the grid in tiles.
+        tile_size (int): Size of each tile in pixels (default is TILE_SIZE).
+        color (tuple): Color of the grid lines.
+
+    Returns:
+        ShapeElementList: The grid lines, uploaded to the GPU on first draw.
+    """
+    pixel_width = grid_width * tile_size
+    pixel_height = grid_height * tile_size
+    points = []
+    for row in range(grid_height + 1):
+        points.extend(((0, row * tile_size), (pixel_width, row * tile_size)))
+    for col in range(grid_width + 1):
+        points.extend(((col * tile_size, 0), (col * tile_size, pixel_height)))
+
+    grid_shape = ShapeElementList()
+    grid_shape.append(create_lines(points, color))
+    return grid_shape
+
 
 class GridSprite(arcade.Sprite):
     """
@@ -48,7 +76,16 @@ class GridSprite(arcade.Sprite):
         col (int): The column index in the grid where the sprite is located.
         speed (float): The speed of the sprite for movement calculations.
         resource_gathering_speed (float): The speed of resource collection for the sprite.
+        attack_strength (float): The attack strength of the sprite.
+        upgrades (UpgradeManager): The upgrade manager whose modifiers apply to the stats above, if any.
+        upgrade_kind (str): The kind of entity the upgrades treat the sprite as (e.g. "player" or "ai").
+        spatial_hash (SpatialHash): The spatial hash the sprite is indexed in, if any.
+        pool (ObjectPool): The pool the sprite is returned to when removed, if any.
     """
+    speed = UpgradedStat()
+    resource_gathering_speed = UpgradedStat()
+    attack_strength = UpgradedStat()
+
     def __init__(self, image, scaling):
         """
         Initialize a GridSprite object.
@@ -57,9 +94,25 @@ class GridSprite(arcade.Sprite):
             image (str): Path to the sprite's image file.
             scaling (float): Scaling factor for the sprite.
         """
-        super().__init__(image, scaling)
+        super().__init__(texture_registry.get(image), scaling)
+        self.upgrades = None
+        self.upgrade_kind = None
         self.row = 0
         self.col = 0
         self.speed = 1.0
         self.resource_gathering_speed = 1.0
+        self.attack_strength = 1.0
+        self.spatial_hash = None
+        self.pool = None
+        self.pooled = False
+
+    def remove_from_sprite_lists(self):
+        """
+        Remove the sprite from all sprite lists and from its spatial hash, and return it to its pool.
+        """
+        super().remove_from_sprite_lists()
+        if self.spatial_hash is not None:
+            self.spatial_hash.remove(self)
+        if self.pool is not None:
+            self.pool.release(self)
 
@@ -1,43 +1,78 @@
 """
 Module: main_game
 Description: The primary game module for "Monkey Tribe Wars," an arcade-style strategy game.
-This module handles the initialization of the game window, player and AI setup, resource management,
-building placement, enemy interactions, and random game events.
+This module handles the game window, camera, rendering and keyboard/mouse input, and drives the
+headless Simulation that implements player and AI behavior, resources, buildings, enemies and events.
 """
 
+import os
+import time
 import arcade
-import random
-from resources import ResourceType, ResourceManager, Resource
-from game_utils import GridSprite, pos_to_grid
-from game_constants import SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, GRID_WIDTH, GRID_HEIGHT
-from buildings import BuildingManager, Hut, Tower
+from game_constants import SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, GRID_WIDTH
+from game_utils import create_grid_shape
+from culling import CulledSpriteList, visible_tile_rect
 from title_screen import TitleScreen
 from settings import SettingsMenu
-from upgrades import UpgradeManager
-from enemies import Enemy
 from music import MusicManager
 from defeat_screen import DefeatScreen
+from simulation import Simulation
+from game_log import get_logger, configure_from_env
+from replay import InputRecorder
+from timestep import FixedTimestep, interpolated_positions
+from perf_overlay import PerfOverlay
+from profiler import SamplingProfiler
+import snapshot
+
+log = get_logger("game")
+
 # Constants
 SCREEN_TITLE = "Monkey Tribe Wars"
-RESOURCE_COUNT = 100
-SPRITE_SCALING = 0.5
-PLAYER_HEALTH = 100
-PLAYER_INV = 1  # Duration player is invincible for after taking damage
-ENEMY_DAMAGE = 10
-ENEMY_MOVE_DELAY = 0.5  # Delay in seconds between enemy moves
-BANANA_SPEED = 5
-BANANA_LIFE = 1
-FLASH_DURATION = 0.25
+STRUCTURE_CULL_MARGIN = 3  # Structure sprites are several tiles wide, so keep them a few tiles past the edge
+
+# Environment variables that make a session reproducible
+SEED_ENV_VAR = "MTW_SEED"  # Seed of the game's random streams
+RECORD_ENV_VAR = "MTW_RECORD_FILE"  # Where to save the input recording of each game
+MAP_SIZE_ENV_VAR = "MTW_MAP_SIZE"  # Width and height of the map in tiles
+
+# Performance overlay
+PERF_OVERLAY_KEY = arcade.key.F3  # Show/hide the overlay
+PERF_EXPORT_KEY = arcade.key.F4  # Export the overlay's rolling history
+PERF_CSV_PATH = "perf_overlay.csv"
+
+# Sampling profiler: collapsed stacks are written to this file at exit; F5 pauses/resumes capture
+PROFILE_ENV_VAR = "MTW_PROFILE_FILE"
+
+# Saved games: quick save/load keys and periodic autosaves, all to one snapshot file
+SAVE_ENV_VAR = "MTW_SAVE_FILE"
+SAVE_PATH = "savegame.mtws"
+QUICK_SAVE_KEY = arcade.key.F6
+QUICK_LOAD_KEY = arcade.key.F9
+AUTOSAVE_INTERVAL = 60  # Seconds of game time between autosaves
+
+# Upgrade hotkeys mapped to (upgrade name, display name)
+UPGRADE_KEYS = {
+    arcade.key.U: ("player_speed", "Player speed"),
+    arcade.key.I: ("ai_combat_strength", "AI combat strength"),
+    arcade.key.O: ("structure_health", "Structure health"),
+    arcade.key.P: ("resource_efficiency", "Resource efficiency"),
+}
 
 
 class GridGame(arcade.View):
     """
-        Main class for the "Monkey Tribe Wars" game.
-        Handles player and AI behaviors, resource collection, building placement, enemy interactions,
-        and game events.
+        Main view for the "Monkey Tribe Wars" game.
+        Renders the Simulation and translates keyboard and mouse input into game actions;
+        all game rules live in simulation.Simulation.
+        """
+    def __init__(self, music_manager, seed=None, record_path=None):
+        """
+        Initialize the game view, its cameras and UI, and start a new simulation.
+
+        Args:
+            music_manager (MusicManager): Plays the background music.
+            seed (int): Seed of the simulation; read from MTW_SEED, or random, if not given.
+            record_path (str): File to save the input recording to; read from MTW_RECORD_FILE if not given.
         """
-    def __init__(self, music_manager):
-        """Initialize the game window and set up game variables and systems."""
         super().__init__()
 
         # Initialize music manager
@@ -49,32 +84,15 @@ class GridGame(arcade.View):
         self.camera = arcade.Camera2D()
         self.ui_camera = arcade.Camera2D()
 
-        # Sprite lists
-        self.player_sprite_list = arcade.SpriteList()
-        self.enemy_sprite_list = arcade.SpriteList()
-        self.mraid_sprite_list = arcade.SpriteList()
-        self.diamond_sprite_list = arcade.SpriteList()
-        self.drain_sprite_list = arcade.SpriteList()
-        self.banana_sprite_list = arcade.SpriteList()
         self.ui_sprite_list = arcade.SpriteList()
 
-        # AI players
-        self.ai_players = arcade.SpriteList()
-
-        # Player setup
-        self.player = GridSprite(
-            "assets/images/characters/monkey.png",  # https://opengameart.org/content/cartoon-animals
-            SPRITE_SCALING / 3,
-        )
-        self.player.row = GRID_HEIGHT // 2
-        self.player.col = GRID_WIDTH // 2
-        self.player.center_x, self.player.center_y = pos_to_grid(self.player.row, self.player.col, TILE_SIZE)
-        self.player_sprite_list.append(self.player)
-        self.player.direction = (1, 0)
-        self.player.itime = 0
-        self.player.hit = False
-        self.flash_duration = 0
-        self.flash_color = (255, 0, 0, 32)
+        # Map entities inside the camera view; only these are submitted for drawing
+        self.visible_diamonds = CulledSpriteList()
+        self.visible_enemies = CulledSpriteList()
+        self.visible_ai_players = CulledSpriteList()
+        # Resources and structures are drawn from the sprite lists of the visible map chunks
+        self.visible_resources = []
+        self.visible_structures = []
 
         # UI elements
         settings_button = arcade.Sprite(":resources:onscreen_controls/shaded_light/gear.png",
@@ -85,92 +103,61 @@ class GridGame(arcade.View):
                                       anchor_x="center", anchor_y="center", font_size=26,
                                       color=arcade.color.RED_ORANGE)
 
-        # Resource manager
-        self.resource_manager = ResourceManager()
-        self.structure_manager = BuildingManager()
-        # Initialize inventory for resources
-        self.inventory = {"WOOD": 0, "STONE": 0, "FOOD": 0}
-        # self.structure_manager.place_structure(Hut, 200, 200, self.inventory, team="player")
-        self.upgrade_manager = UpgradeManager(self.player, self.ai_players, self.structure_manager)
-
-        # Initialize resources and enemies
-        self.spawn_resources(RESOURCE_COUNT)
-        self.spawn_enemies(10)
-
-        # Game variables
-        self.player_health = PLAYER_HEALTH
-        self.score = 0
-        self.enemies_destroyed = 0
-        self.enemy_move_timer = 0
-        self.ai_players = arcade.SpriteList()  # List to hold AI-controlled players
-        self.ai_player_cost = 20  # Cost to create an AI player
-        self.ai_move_timer = 0
-
-        # For random events
-        self.active_event = None # Current active event
-        self.event_timer = 0 # Duration of event
-        self.event_cooldown = 30 # Cooldown time between events in secs
-        self.time_since_last_event = 0 # Track time since last event
+        # Performance overlay, below the score and inventory lines
+        self.perf_overlay = PerfOverlay(10, SCREEN_HEIGHT - 60)
 
-        self.scroll_to_player()
+        # Game state
+        if seed is None and os.environ.get(SEED_ENV_VAR):
+            seed = int(os.environ[SEED_ENV_VAR])
+        map_size = int(os.environ.get(MAP_SIZE_ENV_VAR, GRID_WIDTH))
+        self.sim = Simulation(seed=seed, width=map_size, height=map_size)
+        self.timestep = FixedTimestep()
 
-    def spawn_resources(self, count):
-        """Spawn resources randomly on the grid."""
-        for _ in range(count):
-            rand_type = random.choice(
-                [ResourceType.WOOD, ResourceType.STONE, ResourceType.FOOD]
-            )
-            resource = Resource(type=rand_type)
-            self.resource_manager.resource_sprite_list.append(resource)
-
-        # Spawn diamonds (currency resources)
-        for _ in range(count // 3):  # Fewer diamonds compared to other resources
-            diamond = Resource(type=ResourceType.DIAMOND)
-            self.diamond_sprite_list.append(diamond)
-
-    def spawn_enemies(self, count, s_list=None):
-        """Spawn enemies randomly on the grid."""
-        if s_list is None:
-            s_list = self.enemy_sprite_list
-
-        for _ in range(count):
-            row = random.randint(0, GRID_HEIGHT - 1)
-            col = random.randint(0, GRID_WIDTH - 1)
-            enemy = Enemy("assets/images/characters/monkey.png", SPRITE_SCALING / 3)
-            enemy.color = arcade.color.RED
-            enemy.row = row
-            enemy.col = col
-            enemy.center_x, enemy.center_y = pos_to_grid(row, col, TILE_SIZE)
-            s_list.append(enemy)
+        # Grid lines never change during a game, so they are built once and drawn as a single batch
+        self.grid_shape = create_grid_shape(self.sim.width, self.sim.height, TILE_SIZE)
+
+        # Input recording, replayable headlessly with replay.py
+        self.record_path = record_path or os.environ.get(RECORD_ENV_VAR)
+        self.recorder = (InputRecorder(self.sim.seed, width=self.sim.width, height=self.sim.height)
+                         if self.record_path else None)
+
+        # Saved game
+        self.save_path = os.environ.get(SAVE_ENV_VAR, SAVE_PATH)
+        self.autosave_timer = 0
+
+        self.scroll_to_player()
 
     def on_draw(self):
         """Render the screen."""
+        sim = self.sim
+        overlay_enabled = self.perf_overlay.enabled
+        if overlay_enabled:
+            draw_start = time.perf_counter()
         self.clear()
         self.camera.use()
 
         # Draw grid
-        for row in range(GRID_HEIGHT + 1):
-            arcade.draw_line(0, row * TILE_SIZE, GRID_WIDTH * TILE_SIZE, row * TILE_SIZE, arcade.color.LIGHT_GRAY)
-        for col in range(GRID_WIDTH + 1):
-            arcade.draw_line(col * TILE_SIZE, 0, col * TILE_SIZE, GRID_HEIGHT * TILE_SIZE, arcade.color.LIGHT_GRAY)
+        self.grid_shape.draw()
 
         # Draw sprites
-        self.diamond_sprite_list.draw()
-        self.drain_sprite_list.draw()
-        self.player_sprite_list.draw()
-        self.enemy_sprite_list.draw()
-        self.mraid_sprite_list.draw()
-        self.banana_sprite_list.draw()
-        self.ai_players.draw()
-        self.resource_manager.resource_sprite_list.draw()
-        self.structure_manager.draw_structures()
+        self.update_visible_sprites()
+        self.visible_diamonds.draw()
+        sim.player_sprite_list.draw()
+        self.visible_enemies.draw()
+        with interpolated_positions(sim.banana_sprite_list, self.timestep.alpha):
+            sim.banana_sprite_list.draw()
+        self.visible_ai_players.draw()
+        for sprite_list in self.visible_resources:
+            sprite_list.draw()
+        for sprite_list in self.visible_structures:
+            sprite_list.draw()
 
         # Draw UI
         self.ui_camera.use()
-        arcade.draw_text(f"Score: {self.score}  Health: {self.player_health}, Enemies Destroyed: {self.enemies_destroyed}",
+        arcade.draw_text(f"Score: {sim.score}  Health: {sim.player_health}, Enemies Destroyed: {sim.enemies_destroyed}",
                         10, SCREEN_HEIGHT - 30, arcade.color.WHITE, 16)
         arcade.draw_text(
-            f"WOOD: {self.inventory['WOOD']}  STONE: {self.inventory['STONE']}  FOOD: {self.inventory['FOOD']}",
+            f"WOOD: {sim.inventory['WOOD']}  STONE: {sim.inventory['STONE']}  FOOD: {sim.inventory['FOOD']}",
             10,
             SCREEN_HEIGHT - 50,
             arcade.color.WHITE,
@@ -179,29 +166,42 @@ class GridGame(arcade.View):
 
         self.ui_sprite_list.draw()
 
-        if self.active_event:
-            self.event_text.text = f"{self.active_event} IN PROGRESS!"
+        if sim.active_event:
+            self.event_text.text = f"{sim.active_event} IN PROGRESS!"
             self.event_text.draw()
 
-        if self.flash_duration > 0:
-            arcade.draw_lbwh_rectangle_filled(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, self.flash_color)
+        if sim.flash_duration > 0:
+            arcade.draw_lbwh_rectangle_filled(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, sim.flash_color)
+
+        if overlay_enabled:
+            self.perf_overlay.record_draw(time.perf_counter() - draw_start, sim.entities.counts())
+            self.perf_overlay.draw()
+
+    def update_visible_sprites(self):
+        """Fill the culled sprite lists with the entities on tiles inside the camera view."""
+        sim = self.sim
+        row_min, row_max, col_min, col_max = visible_tile_rect(self.camera.position,
+                                                               self.window.width, self.window.height)
 
-    @staticmethod
-    def move_sprite(sprite, dx, dy):
-        """Move a sprite by a grid offset."""
-        sprite.row += dy
-        sprite.col += dx
-        sprite.row = max(0, min(GRID_HEIGHT - 1, sprite.row))
-        sprite.col = max(0, min(GRID_WIDTH - 1, sprite.col))
-        sprite.center_x, sprite.center_y = pos_to_grid(sprite.row, sprite.col, TILE_SIZE)
+        enemy_slots = sim.enemy_store.slots_in_rect(row_min, row_max, col_min, col_max)
+        sim.enemy_store.sync_slots(enemy_slots)  # Enemy sprites are only synced when visible
+        self.visible_enemies.update(sim.enemy_store.sprites[slot] for slot in enemy_slots)
+
+        self.visible_diamonds.update(sim.diamond_index.query_rect(row_min, row_max, col_min, col_max))
+        self.visible_ai_players.update(sim.ai_index.query_rect(row_min, row_max, col_min, col_max))
+        self.visible_resources = sim.world.sprite_lists_in_rect("resources", row_min, row_max, col_min, col_max)
+
+        margin = STRUCTURE_CULL_MARGIN
+        self.visible_structures = sim.world.sprite_lists_in_rect(
+            "structures", row_min - margin, row_max + margin, col_min - margin, col_max + margin)
 
     def scroll_to_player(self):
         """Center the camera on the player and prevent it from going outside the grid."""
         visible_width = TILE_SIZE * 10
         visible_height = TILE_SIZE * 10
 
-        grid_pixel_width = GRID_WIDTH * TILE_SIZE
-        grid_pixel_height = GRID_HEIGHT * TILE_SIZE
+        grid_pixel_width = self.sim.width * TILE_SIZE
+        grid_pixel_height = self.sim.height * TILE_SIZE
 
         half_viewport_width = visible_width / 2
         half_viewport_height = visible_height / 2
@@ -212,250 +212,136 @@ class GridGame(arcade.View):
         min_y = half_viewport_height - margin
         max_y = grid_pixel_height - half_viewport_height + margin
 
-        camera_x = max(min(self.player.center_x, max_x), min_x)
-        camera_y = max(min(self.player.center_y, max_y), min_y)
+        camera_x = max(min(self.sim.player.center_x, max_x), min_x)
+        camera_y = max(min(self.sim.player.center_y, max_y), min_y)
 
         self.camera.position = (camera_x, camera_y)
 
     def on_update(self, delta_time):
-        """Update game logic."""
-        if self.player_health <= 0:
-            print("Game Over!")
+        """Advance the simulation in fixed ticks and switch to the defeat screen when the player dies."""
+        if self.sim.game_over:
+            log.info("Game Over!")
+            self.save_recording()
             defeat_view = DefeatScreen()
             self.window.show_view(defeat_view)  # Shows defeat screen
             return
-        
-        if self.flash_duration > 0:
-            self.flash_duration -= delta_time
-
-        # Apply active upgrades
-        self.upgrade_manager.apply_upgrades()
-
-        enemy_sprites = arcade.SpriteList()
-        enemy_sprites.extend(self.enemy_sprite_list)
-        enemy_sprites.extend(self.mraid_sprite_list)
-
-        # Update banana projectiles
-        self.banana_sprite_list.update()
-        for banana in self.banana_sprite_list:
-            banana.angle += 10
-            banana.life += delta_time
-            enemies_hit = arcade.check_for_collision_with_list(banana, enemy_sprites)
-            for enemy in enemies_hit:
-                enemy.remove_from_sprite_lists()
-                banana.remove_from_sprite_lists()
-                self.score += 5  # Award points for defeating an enemy
-                self.enemies_destroyed += 1
-                print(f"Enemy defeated! Score: {self.score}")
-                # Respawn enemies
-                self.spawn_enemies(1)
-
-            if banana.life > BANANA_LIFE:
-                banana.remove_from_sprite_lists()
-
-        # Update enemy movement timer
-        self.enemy_move_timer += delta_time
-        if self.enemy_move_timer >= ENEMY_MOVE_DELAY:
-            self.enemy_move_timer = 0
-            for enemy in enemy_sprites:
-                if enemy.alive:
-                    dx = random.choice([-1, 0, 1])
-                    dy = random.choice([-1, 0, 1])
-                    self.move_sprite(enemy, dx, dy)
-
-                    # Enemy collects resources (but not FOOD or DIAMOND)
-                    resources_collected = arcade.check_for_collision_with_list(
-                        enemy, self.resource_manager.resource_sprite_list
-                    )
-
-                    for resource in resources_collected:
-                        collected_type = resource.collected().name
-                        self.resource_manager.spawn_resource()
-                        if collected_type in ["WOOD", "STONE"]:
-                            enemy.inventory[collected_type] += 1
-                            print(f"Enemy collected {collected_type}.")
-
-                    # Enemy builds structures if enough resources are available
-                    if enemy.inventory["WOOD"] >= 10:  # Example: Build Hut if enough wood
-                        x, y = pos_to_grid(enemy.row, enemy.col)
-                        if self.structure_manager.place_structure(Hut, x, y, enemy.inventory, team="enemy"):
-                            print(f"Enemy built a Hut at ({enemy.row}, {enemy.col}).")
-
-        if self.player.itime > PLAYER_INV:
-            self.player.hit = False
-            self.player.itime = 0
-
-        if not self.player.hit:
-            for enemy in enemy_sprites:
-                if arcade.check_for_collision(enemy, self.player):
-                    self.player_take_damage(ENEMY_DAMAGE)
-        else:
-            self.player.itime += delta_time
-
-        # Player collects diamonds
-        diamond_list = arcade.SpriteList()
-        diamond_list.extend(self.diamond_sprite_list)
-        diamond_list.extend(self.drain_sprite_list)
-        diamonds_collected = arcade.check_for_collision_with_list(self.player,
-                                                                  diamond_list)
-        if diamonds_collected:
-            for diamond in diamonds_collected:
-                diamond.remove_from_sprite_lists()
-                self.score += 1  # Increment the score for diamonds
-
-        # Player collects resources
-        collected_resources = self.resource_manager.check_resource_collection(self.player)
-        for collected_type in collected_resources:
-            if collected_type == ResourceType.FOOD:
-                if self.player_health < PLAYER_HEALTH:
-                    self.player_heal(10)  # Heal player
-                    self.inventory["FOOD"] += 1  # Update FOOD inventory
-                else:
-                    print("Health is full! Food not collected.")
-            elif collected_type == ResourceType.WOOD:
-                self.inventory["WOOD"] += 1
-            elif collected_type == ResourceType.STONE:
-                self.inventory["STONE"] += 1
-            self.resource_manager.spawn_resource()
-
-        # AI Player Movement and Actions
-        self.ai_move_timer += delta_time
-        if self.ai_move_timer >= ENEMY_MOVE_DELAY:
-            self.ai_move_timer = 0
-            for ai in self.ai_players:
-                # Random movement in the grid
-                dx = random.choice([-1, 0, 1])
-                dy = random.choice([-1, 0, 1])
-                self.move_sprite(ai, dx, dy)
-
-                # AI attacks nearby enemies
-                for enemy in enemy_sprites:
-                    if abs(ai.row - enemy.row) <= 1 and abs(ai.col - enemy.col) <= 1:
-                        enemy.remove_from_sprite_lists()
-                        print(f"AI player at ({ai.row}, {ai.col}) attacked and defeated an enemy.")
-                        break
-
-                # AI collects resources
-                resources_collected = arcade.check_for_collision_with_list(ai,
-                                                                           self.resource_manager.resource_sprite_list)
-                for resource in resources_collected:
-                    if isinstance(resource, Resource):
-                        collected_type = resource.collected()
-                        if collected_type in {"WOOD", "STONE"}:  # AI collects only wood and stone
-                            self.inventory[collected_type] += 1
-                            print(f"AI player collected {collected_type}. Inventory: {self.inventory}")
-                        elif collected_type == "DIAMOND":
-                            print("AI ignored DIAMOND.")
-                        elif collected_type == "FOOD":
-                            print("AI collected FOOD but cannot use it.")
-                        # Spawn a new resource after collection
-                        self.resource_manager.spawn_resource()
-
-                # AI building logic
-                if self.inventory["WOOD"] >= 10:  # Example threshold for a Hut
-                    grid_x, grid_y = ai.row, ai.col
-                    pixel_x, pixel_y = pos_to_grid(grid_x, grid_y, TILE_SIZE)
-                    if self.structure_manager.place_structure(Hut, pixel_x, pixel_y, self.inventory, team="player"):
-                        print(f"AI player built a Hut at ({grid_x}, {grid_y}).")
-
-        # Check if any enemies are no longer alive and respawn them
-        defeated_enemies = [enemy for enemy in self.enemy_sprite_list if not enemy.alive]
-        for enemy in defeated_enemies:
-            self.enemy_sprite_list.remove(enemy)
-            self.spawn_enemies(1)
-
-        # Update buildings
-        self.structure_manager.update_structures(delta_time, self.player_sprite_list, self.ai_players, self.enemy_sprite_list)
-
-        # Update random event timer
-        self.time_since_last_event += delta_time
-        if self.active_event:
-            self.event_timer += delta_time
-            if self.active_event == "Monkey Raid":
-                self.apply_monkey_raid_effects()
-            elif self.active_event == "Resource Shortage":
-                self.apply_resource_shortage_effects()
-            elif self.active_event == "Meteor Shower":
-                self.apply_meteor_shower_effects()
-            elif self.active_event == "Diamond Rain":
-                self.apply_diamond_rain_effects()
-        else:
-            self.trigger_random_event()  # Check if it's time to trigger a new event
+
+        overlay_enabled = self.perf_overlay.enabled
+        if overlay_enabled:
+            update_start = time.perf_counter()
+
+        tick_duration = self.timestep.tick_duration
+        ticks = self.timestep.advance(delta_time)
+        for _ in range(ticks):
+            if self.recorder is not None:
+                self.recorder.record_step(tick_duration)
+            self.sim.step(tick_duration)
+
+        self.autosave_timer += ticks * tick_duration
+        if self.autosave_timer >= AUTOSAVE_INTERVAL:
+            self.autosave_timer = 0
+            self.save_game()
+
+        if overlay_enabled:
+            self.perf_overlay.record_update(delta_time, time.perf_counter() - update_start, ticks)
+
+    def on_hide_view(self):
+        """Save the input recording when leaving the game, e.g. for the settings menu."""
+        self.save_recording()
+
+    def perform(self, command, *args):
+        """
+        Run a player command on the simulation, recording it if recording is enabled.
+
+        Args:
+            command (str): Name of the Simulation method, e.g. "move_player".
+            *args: Arguments of the method.
+        Returns:
+            The value returned by the method.
+        """
+        if self.recorder is not None:
+            self.recorder.record_command(command, *args)
+        return getattr(self.sim, command)(*args)
+
+    def save_recording(self):
+        """Write the input recording, if recording is enabled."""
+        if self.recorder is not None:
+            self.recorder.save(self.record_path, self.sim)
+            log.info("Input recording saved to %s", self.record_path)
+
+    def save_game(self):
+        """Write a snapshot of the game to the save file."""
+        snapshot.save(self.sim, self.save_path)
+
+    def load_game(self):
+        """Replace the game with the one in the save file, if there is one."""
+        if not os.path.exists(self.save_path):
+            log.info("No saved game at %s", self.save_path)
+            return
+        try:
+            sim = snapshot.load(self.save_path)
+        except ValueError as error:
+            log.warning("Could not load %s: %s", self.save_path, error)
+            return
+        if self.recorder is not None:
+            # Recordings replay from the seed, so a recording cannot continue from a loaded game
+            self.save_recording()
+            self.recorder = None
+            log.info("Input recording stopped by loading a saved game.")
+        sim.phase_timer = self.sim.phase_timer
+        if (sim.width, sim.height) != (self.sim.width, self.sim.height):
+            self.grid_shape = create_grid_shape(sim.width, sim.height, TILE_SIZE)
+        self.sim = sim
+        self.timestep = FixedTimestep()
+        self.autosave_timer = 0
+        self.scroll_to_player()
 
     def on_key_press(self, key, modifiers):
         """Handle key press for player movement."""
         if key == arcade.key.UP:
-            self.move_sprite(self.player, 0, 1)
-            self.player.direction = (0, 1)
+            self.perform("move_player", 0, 1)
         elif key == arcade.key.DOWN:
-            self.move_sprite(self.player, 0, -1)
-            self.player.direction = (0, -1)
+            self.perform("move_player", 0, -1)
         elif key == arcade.key.LEFT:
-            self.move_sprite(self.player, -1, 0)
-            self.player.direction = (-1, 0)
+            self.perform("move_player", -1, 0)
         elif key == arcade.key.RIGHT:
-            self.move_sprite(self.player, 1, 0)
-            self.player.direction = (1, 0)
+            self.perform("move_player", 1, 0)
         elif key == arcade.key.SPACE:
-            # self.attack_enemies()
-            self.throw_banana()
+            self.perform("throw_banana")
 
         self.scroll_to_player()  # Call scroll_to_player here to avoid jittery screen
 
         # Build structures
         if key == arcade.key.H:  # Press 'H' to build a hut
-            pos_x = self.player.center_x
-            pos_y = self.player.center_y
-            success = self.structure_manager.place_structure(Hut, pos_x, pos_y, self.inventory, team="player")
-            grid_x, grid_y = int(pos_x // TILE_SIZE), int(pos_y // TILE_SIZE)
-            if success:
-                print(f"Hut built at ({grid_x}, {grid_y}).")
+            self.perform("build_structure", "Hut")
 
         if key == arcade.key.T:  # Press 'T' to build a tower
-            pos_x = self.player.center_x
-            pos_y = self.player.center_y
-            success = self.structure_manager.place_structure(Tower, pos_x, pos_y, self.inventory, team="player")
-            grid_x, grid_y = int(pos_x // TILE_SIZE), int(pos_y // TILE_SIZE)
-            if success:
-                print(f"Tower built at ({grid_x}, {grid_y}).")
+            self.perform("build_structure", "Tower")
 
         if key == arcade.key.C:  # Press 'C' to create an AI player
-            self.create_ai_player()
+            self.perform("create_ai_player")
 
         # Upgrades
-        if key == arcade.key.U:  # Upgrade player speed
-            success, self.score = self.upgrade_manager.purchase_upgrade("player_speed", self.score)
-            if success:
-                print("Player speed upgraded!")
-            else:
-                print("Not enough diamonds for player speed upgrade.")
-
-        if key == arcade.key.I:  # Upgrade AI combat strength
-            success, self.score = self.upgrade_manager.purchase_upgrade("ai_combat_strength", self.score)
-            if success:
-                print("AI combat strength upgraded!")
+        if key in UPGRADE_KEYS:
+            upgrade_name, display_name = UPGRADE_KEYS[key]
+            if self.perform("purchase_upgrade", upgrade_name):
+                log.info("%s upgraded!", display_name)
             else:
-                print("Not enough diamonds for AI combat strength upgrade.")
+                log.info("Not enough diamonds for %s upgrade.", display_name.lower())
 
-        if key == arcade.key.O:  # Upgrade structure health
-            success, self.score = self.upgrade_manager.purchase_upgrade("structure_health", self.score)
-            if success:
-                print("Structure health upgraded!")
-            else:
-                print("Not enough diamonds for structure health upgrade.")
+        if key == PERF_OVERLAY_KEY:
+            # The simulation only times its phases while the overlay is shown
+            self.sim.phase_timer = self.perf_overlay if self.perf_overlay.toggle() else None
+        elif key == PERF_EXPORT_KEY:
+            self.perf_overlay.export_csv(PERF_CSV_PATH)
 
-        if key == arcade.key.P:  # Upgrade resource efficiency
-            success, self.score = self.upgrade_manager.purchase_upgrade("resource_efficiency", self.score)
-            if success:
-                print("Resource efficiency upgraded!")
-            else:
-                print("Not enough diamonds for resource efficiency upgrade.")
+        if key == QUICK_SAVE_KEY:
+            self.save_game()
+        elif key == QUICK_LOAD_KEY:
+            self.load_game()
 
         if key == arcade.key.Z:  # Manually start an event (for debugging)
-            self.time_since_last_event = 35
-            self.active_event = "Meteor Shower"
-            self.event_timer = 0  # Reset event timer
-            self.time_since_last_event = 0  # Reset cooldown
+            self.perform("start_event", "Meteor Shower")
 
     def on_mouse_press(self, x, y, button, modifiers):
         for ui in self.ui_sprite_list:
@@ -463,154 +349,23 @@ class GridGame(arcade.View):
                 settings_view = SettingsMenu(self, self.music_manager)  # Pass this view as the parent
                 self.window.show_view(settings_view)
 
-    def attack_enemies(self):
-        """Attack enemies adjacent to the player and destroy them."""
-        for enemy in self.enemy_sprite_list:
-            if abs(self.player.row - enemy.row) <= 1 and abs(self.player.col - enemy.col) <= 1:
-                enemy.remove_from_sprite_lists()
-                self.score += 5  # Award points for defeating an enemy
-                self.enemies_destroyed += 1
-                print(f"Enemy defeated! Score: {self.score}")
-                # Respawn enemies
-                self.spawn_enemies(1)
-    
-    def throw_banana(self):
-        """Throw a banana in front of the player."""
-        banana = arcade.Sprite()
-        banana.texture = arcade.load_texture("assets/images/projectiles/banana.png")
-        banana.center_x, banana.center_y = self.player.center_x, self.player.center_y
-        banana.direction = self.player.direction
-        banana.change_x, banana.change_y = banana.direction[0] * BANANA_SPEED, banana.direction[1] * BANANA_SPEED
-        banana.life = 0
-        self.banana_sprite_list.append(banana)
-
-    def player_take_damage(self, damage):
-        self.player_health -= damage
-        self.flash_duration = FLASH_DURATION
-        self.player.hit = True
-        self.flash_color = (255, 0, 0, 32)
-
-    def player_heal(self, health):
-        if self.player_health > PLAYER_HEALTH:
-            self.player_health = PLAYER_HEALTH
-        else:
-            self.player_health = self.player_health + health
-        self.flash_duration = FLASH_DURATION
-        self.flash_color = (0, 255, 0, 32)
-
-    def create_ai_player(self):
-        """Create a new AI player if the player has enough points."""
-        if self.score >= self.ai_player_cost:
-            self.score -= self.ai_player_cost  # Deduct points for the new AI player
-            new_ai = GridSprite(
-                "assets/images/characters/monkey.png",  # Replace with AI player sprite image path
-                scaling =0.15
-            )
-            # Assign AI-specific attributes, such as movement behavior
-            new_ai.row = int(new_ai.center_y // TILE_SIZE)
-            new_ai.col = int(new_ai.center_x // TILE_SIZE)
-            self.ai_players.append(new_ai)
-            print(f"AI player created! Remaining score: {self.score}")
-        else:
-            print(f"Not enough points to create AI player! Current score: {self.score}")
-
-    def apply_meteor_shower_effects(self):
-        """
-        Apply effects of the "Meteor Shower" event.
-        """
-        meteor_duration = 5  # Event lasts for 5 seconds
-        if self.event_timer >= meteor_duration:
-            print("Meteor Shower ended!")
-            self.active_event = None
-        else:
-            # Damage all structures and nearby entities
-            for structure in self.structure_manager.structures:
-                structure.health -= 20
-                if structure.health <= 0:
-                    self.structure_manager.structures.remove(structure)
-                    print("A structure was destroyed by the meteor shower!")
-
-            # Damage players and enemies in random spots
-            for sprite_list in [self.player_sprite_list, self.enemy_sprite_list]:
-                for sprite in sprite_list:
-                    if random.random() < 0.01:  # 1% chance to be hit
-                        if type(sprite) is GridSprite:
-                            self.player_take_damage(10)
-                            print("Player was hit by a meteor!")
-                        else:
-                            sprite.health -= 10
-                            print(f"{sprite.__class__.__name__} was hit by a meteor!")
-                            if sprite.health <= 0:
-                                sprite.remove_from_sprite_lists()
-                                print(f"{sprite.__class__.__name__} was destroyed by a meteor!")
-
-    def apply_monkey_raid_effects(self):
-        """
-        Apply effects of the "Monkey Raid" event.
-        """
-        raid_duration = 10  # Event lasts for 10 seconds
-        if self.event_timer >= raid_duration:
-            # Reset effects after the raid ends
-            for enemy in self.enemy_sprite_list:
-                enemy.speed = max(enemy.speed - 1, 1)  # Ensure speed doesn't go below 1
-                enemy.attack_power = max(enemy.attack_power - 5, 1)
-            print("Monkey Raid ended!")
-            self.mraid_sprite_list.clear()
-            self.active_event = None
-        else:
-            # Increase enemy speed and attack power during the raid
-            self.spawn_enemies(1, self.mraid_sprite_list)
-            for enemy in self.enemy_sprite_list:
-                enemy.speed += 1
-                enemy.attack_power += 5
-            print("Monkey Raid in progress!")
-
-    def apply_resource_shortage_effects(self):
-        """
-        Apply effects of the "Resource Shortage" event.
-        """
-        shortage_duration = 15  # Event lasts for 15 seconds
-        if self.event_timer >= shortage_duration:
-            print("Resource shortage ended!")
-            self.active_event = None
-            self.spawn_resources(RESOURCE_COUNT)
-        else:
-            # Temporarily reduce resource availability
-            self.resource_manager.resource_sprite_list.clear()
-            self.diamond_sprite_list.clear()
-            print("Resource shortage in progress!")
-
-    def apply_diamond_rain_effects(self):
-        """
-        Apply effects of the "Diamond Rain" event.
-        """
-        rain_duration = 10  # Event lasts for 10 seconds
-        if self.event_timer >= rain_duration:
-            print("Diamond Rain ended!")
-            self.active_event = None
-            self.drain_sprite_list.clear()
-        else:
-            # Spawn extra diamonds randomly on the map
-            for _ in range(5):  # Spawn 5 diamonds per tick
-                diamond = Resource(ResourceType.DIAMOND)
-                self.drain_sprite_list.append(diamond)
-                print(f"Diamond spawned at ({diamond.row}, {diamond.col})")
-
-    def trigger_random_event(self):
-        """
-        Trigger a random event to add unpredictability to the game.
-        """
-        if self.active_event is None and self.time_since_last_event >= self.event_cooldown:
-            # Add new events to the list
-            events = ["Monkey Raid", "Resource Shortage", "Meteor Shower", "Diamond Rain"]
-            self.active_event = random.choice(events)
-            self.event_timer = 0  # Reset event timer
-            self.time_since_last_event = 0  # Reset cooldown
-            print(f"Random event triggered: {self.active_event}")
-
 
 if __name__ == "__main__":
+    configure_from_env()  # MTW_LOG_LEVEL / MTW_LOG_FILE
     window = arcade.Window(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE)
     title_screen = TitleScreen(MusicManager())
     window.show_view(title_screen)  # Start with the title screen
-    arcade.run()
+
+    profile_path = os.environ.get(PROFILE_ENV_VAR)
+    profiler = None
+    if profile_path:
+        profiler = SamplingProfiler()
+        window.push_handlers(on_key_press=profiler.on_key_press)
+        profiler.start()
+    try:
+        arcade.run()
+    finally:
+        if profiler is not None:
+            profiler.save(profile_path)
+    if isinstance(window.current_view, GridGame):
+        window.current_view.save_recording()  # The window was closed during a game
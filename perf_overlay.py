@@ -0,0 +1,180 @@
+"""
+Module: perf_overlay
+Description: In-game performance overlay. Shows FPS, update and draw time, the time spent in each
+phase of the simulation step and the entity counts of the game, and keeps a rolling window of
+per-frame samples that can be exported as CSV. While the overlay is hidden nothing is measured:
+the game only checks the `enabled` flag.
+"""
+
+import csv
+import time
+from collections import deque
+import arcade
+from game_log import get_logger
+
+log = get_logger("perf")
+
+# Constants
+HISTORY_FRAMES = 600  # Frames kept for averages and CSV export (10 seconds at 60 FPS)
+REFRESH_INTERVAL = 0.25  # Seconds between text refreshes, so the numbers stay readable
+FONT_SIZE = 12
+LINE_HEIGHT = 16
+PADDING = 8
+TEXT_COLOR = arcade.color.WHITE
+BACKGROUND_COLOR = (0, 0, 0, 180)
+
+
+class PerfOverlay:
+    """
+    Collects per-frame timings and draws them as a HUD on the UI camera.
+
+    Frames are recorded in two halves: record_update() after the fixed-step simulation ticks of a
+    frame and record_draw() after the frame is drawn. Phase times reported through add_phase() by
+    the Simulation's phase timer are summed over the ticks of the frame.
+
+    Attributes:
+        enabled (bool): Whether the overlay is shown and timings are collected.
+        history (collections.deque): Samples of the most recent frames, oldest first.
+    """
+    def __init__(self, left, top, history_frames=HISTORY_FRAMES):
+        """
+        Initialize a hidden overlay.
+
+        Args:
+            left (float): X-coordinate of the overlay's left edge, in screen pixels.
+            top (float): Y-coordinate of the overlay's top edge, in screen pixels.
+            history_frames (int): Number of frames kept for averages and CSV export.
+        """
+        self.left = left
+        self.top = top
+        self.enabled = False
+        self.history = deque(maxlen=history_frames)
+        self.phase_names = []
+        self._phases = {}  # Phase times of the frame being recorded
+        self._pending = None  # (frame_time, update_time, ticks) of the frame being recorded
+        self._lines = []
+        self._width = 0
+        self._last_refresh = 0.0
+
+    def toggle(self):
+        """
+        Show or hide the overlay.
+
+        Returns:
+            bool: True if the overlay is now shown.
+        """
+        self.enabled = not self.enabled
+        self.history.clear()
+        self._phases = {}
+        self._pending = None
+        return self.enabled
+
+    def add_phase(self, name, seconds):
+        """
+        Add time spent in a simulation phase to the current frame.
+
+        Args:
+            name (str): Name of the phase, e.g. "enemies".
+            seconds (float): Time spent, in seconds.
+        """
+        phases = self._phases
+        if name not in phases and name not in self.phase_names:
+            self.phase_names.append(name)
+        phases[name] = phases.get(name, 0.0) + seconds
+
+    def record_update(self, frame_time, update_time, ticks):
+        """
+        Record the update half of a frame.
+
+        Args:
+            frame_time (float): Time since the previous frame, in seconds.
+            update_time (float): Time spent running simulation ticks, in seconds.
+            ticks (int): Number of simulation ticks run.
+        """
+        self._pending = (frame_time, update_time, ticks)
+
+    def record_draw(self, draw_time, counts):
+        """
+        Record the draw half of a frame and complete its sample.
+
+        Args:
+            draw_time (float): Time spent drawing the frame, in seconds.
+            counts (dict): Entity group name to number of entities.
+        """
+        if self._pending is None:  # Drawn before the first update since the overlay was shown
+            return
+        frame_time, update_time, ticks = self._pending
+        self.history.append((frame_time, update_time, draw_time, ticks, self._phases, counts))
+        self._phases = {}
+        self._pending = None
+
+    def draw(self):
+        """
+        Draw the overlay. Call with the UI camera active.
+        """
+        now = time.perf_counter()
+        if now - self._last_refresh >= REFRESH_INTERVAL:
+            self._last_refresh = now
+            self._refresh_text()
+        if not self._lines:
+            return
+        height = len(self._lines) * LINE_HEIGHT + 2 * PADDING
+        arcade.draw_lrbt_rectangle_filled(self.left, self.left + self._width + 2 * PADDING,
+                                          self.top - height, self.top, BACKGROUND_COLOR)
+        for line in self._lines:
+            line.draw()
+
+    def export_csv(self, path):
+        """
+        Write the frames in the history to a CSV file, one row per frame.
+
+        Args:
+            path (str): Path of the file.
+        Returns:
+            int: Number of frames written.
+        """
+        count_names = sorted({name for sample in self.history for name in sample[5]})
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["frame", "frame_ms", "update_ms", "draw_ms", "ticks"]
+                            + [f"{name}_ms" for name in self.phase_names]
+                            + [f"{name}_count" for name in count_names])
+            for frame, (frame_time, update_time, draw_time, ticks, phases, counts) in enumerate(self.history):
+                writer.writerow([frame, f"{frame_time * 1000:.3f}", f"{update_time * 1000:.3f}",
+                                 f"{draw_time * 1000:.3f}", ticks]
+                                + [f"{phases.get(name, 0.0) * 1000:.3f}" for name in self.phase_names]
+                                + [counts.get(name, 0) for name in count_names])
+        log.info("Exported %d frames of performance data to %s", len(self.history), path)
+        return len(self.history)
+
+    def _refresh_text(self):
+        """Rebuild the overlay text from the averages over the history."""
+        history = self.history
+        if not history:
+            text = ["Collecting..."]
+        else:
+            frames = len(history)
+            frame_time = sum(sample[0] for sample in history) / frames
+            update_time = sum(sample[1] for sample in history) / frames
+            draw_time = sum(sample[2] for sample in history) / frames
+            ticks = sum(sample[3] for sample in history) / frames
+            text = [
+                f"FPS {1 / frame_time if frame_time else 0:6.1f}   frame {frame_time * 1000:6.2f} ms",
+                f"update {update_time * 1000:6.2f} ms   draw {draw_time * 1000:6.2f} ms   ticks/frame {ticks:.2f}",
+            ]
+            for name in self.phase_names:
+                phase_time = sum(sample[4].get(name, 0.0) for sample in history) / frames
+                text.append(f"  {name:<12}{phase_time * 1000:7.3f} ms")
+            counts = history[-1][5]
+            text.append("  ".join(f"{name} {count}" for name, count in counts.items()))
+
+        # arcade.Text objects are reused; only their strings change
+        while len(self._lines) < len(text):
+            self._lines.append(arcade.Text("", self.left + PADDING, 0, TEXT_COLOR, FONT_SIZE,
+                                           font_name=("Consolas", "DejaVu Sans Mono", "Courier New"),
+                                           anchor_y="top"))
+        del self._lines[len(text):]
+        for i, (line, string) in enumerate(zip(self._lines, text)):
+            line.text = string
+            line.y = self.top - PADDING - i * LINE_HEIGHT
+        self._width = max(line.content_width for line in self._lines)
@@ -0,0 +1,78 @@
+"""
+Module: pools
+Description: Object pools for sprites that are constantly spawned and removed (enemies, resources and
+bananas). Released sprites are kept and reinitialized through their reset() hook on the next spawn,
+so steady-state play does not allocate new sprites.
+"""
+
+
+class ObjectPool:
+    """
+    A free list of reusable objects.
+
+    Pooled objects must provide a `reset(*args, **kwargs)` method that reinitializes them, and carry
+    `pool` and `pooled` attributes. `pool` points back to this pool so the object can release itself
+    when it is removed from the game, and `pooled` guards against releasing it twice.
+
+    Attributes:
+        created (int): Number of objects the pool had to construct.
+    """
+    def __init__(self, factory, max_size=10000):
+        """
+        Initialize an empty pool.
+
+        Args:
+            factory (callable): Creates a new object when the pool is empty.
+            max_size (int): Maximum number of idle objects kept for reuse.
+        """
+        self.factory = factory
+        self.max_size = max_size
+        self.created = 0
+        self._free = []
+
+    def __len__(self):
+        """Number of idle objects waiting for reuse."""
+        return len(self._free)
+
+    def acquire(self, *args, **kwargs):
+        """
+        Take an object from the pool, creating one if the pool is empty, and reset it.
+
+        Args:
+            *args: Passed to the object's reset() hook.
+            **kwargs: Passed to the object's reset() hook.
+        Returns:
+            The reset object.
+        """
+        if self._free:
+            obj = self._free.pop()
+        else:
+            obj = self.factory()
+            obj.pool = self
+            self.created += 1
+        obj.pooled = False
+        obj.reset(*args, **kwargs)
+        return obj
+
+    def release(self, obj):
+        """
+        Return an object to the pool. Objects already in the pool are ignored.
+
+        Args:
+            obj: An object previously returned by acquire().
+        """
+        if obj.pooled:
+            return
+        obj.pooled = True
+        if len(self._free) < self.max_size:
+            self._free.append(obj)
+
+    def release_all(self, objs):
+        """
+        Return several objects to the pool, e.g. before clearing the sprite list that holds them.
+
+        Args:
+            objs (iterable): Objects previously returned by acquire().
+        """
+        for obj in objs:
+            self.release(obj)
@@ -0,0 +1,191 @@
+"""
+Module: profiler
+Description: Opt-in sampling profiler for game sessions. A background thread samples the main thread's
+call stack at a fixed interval while capture is on. Samples taken inside the view's on_update/on_draw
+are kept as collapsed stacks ("root;caller;callee count" lines, the input format of flamegraph.pl,
+speedscope and inferno), and per-function cumulative times are derived from them.
+Capture can be paused and resumed with a hotkey to profile a single event such as a Meteor Shower.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+import arcade
+from game_log import get_logger
+
+log = get_logger("profiler")
+
+# Constants
+SAMPLE_INTERVAL = 0.002  # Seconds between stack samples
+ROOT_FUNCTIONS = ("on_update", "on_draw")  # Stacks are cut to start at these functions
+TOGGLE_KEY = arcade.key.F5  # Pause/resume capture
+SUMMARY_FUNCTIONS = 40  # Functions listed in the cumulative time summary
+
+
+class SamplingProfiler:
+    """
+    Samples the call stack of one thread and aggregates the samples as collapsed stacks.
+
+    Attributes:
+        interval (float): Seconds between samples.
+        root_functions (tuple): Names of the functions stacks are rooted at; samples outside them
+            are counted as idle.
+        stacks (collections.Counter): Collapsed stack string to number of samples.
+        idle_samples (int): Samples taken outside the root functions.
+        capture_time (float): Total seconds spent capturing.
+    """
+    def __init__(self, interval=SAMPLE_INTERVAL, root_functions=ROOT_FUNCTIONS, thread_id=None):
+        """
+        Initialize a profiler that is not capturing yet.
+
+        Args:
+            interval (float): Seconds between samples.
+            root_functions (tuple): Names of the functions stacks are rooted at.
+            thread_id (int): Thread to sample (default: the calling thread).
+        """
+        self.interval = interval
+        self.root_functions = frozenset(root_functions)
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.stacks = Counter()
+        self.idle_samples = 0
+        self.capture_time = 0.0
+        self._labels = {}  # Code object to frame label
+        self._stop_event = None
+        self._thread = None
+        self._capture_start = 0.0
+        self._switch_interval = None
+
+    @property
+    def running(self):
+        """bool: True while capturing."""
+        return self._thread is not None
+
+    def start(self):
+        """Start capturing samples. Does nothing if already capturing."""
+        if self.running:
+            return
+        # The sampler needs the GIL to read the stack; a short switch interval lets it in while the
+        # game runs pure Python code instead of only when the game blocks on I/O or the GPU
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval / 4))
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._sample_loop, args=(self._stop_event,),
+                                        name="sampling-profiler", daemon=True)
+        self._capture_start = time.perf_counter()
+        self._thread.start()
+        log.info("Profiler capture started.")
+
+    def stop(self):
+        """Stop capturing samples. Does nothing if not capturing."""
+        if not self.running:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        sys.setswitchinterval(self._switch_interval)
+        self.capture_time += time.perf_counter() - self._capture_start
+        log.info("Profiler capture stopped (%d samples so far).", sum(self.stacks.values()))
+
+    def toggle(self):
+        """Stop capturing if capturing, otherwise start."""
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+
+    def on_key_press(self, key, modifiers):
+        """
+        Window key handler that toggles capture with TOGGLE_KEY, whatever view is shown.
+
+        Args:
+            key (int): The key pressed.
+            modifiers (int): Modifier keys held down.
+        """
+        if key == TOGGLE_KEY:
+            self.toggle()
+
+    def cumulative_times(self):
+        """
+        Compute the time spent in each function, including its callees.
+
+        Returns:
+            dict: Frame label to estimated seconds, for functions seen inside the root functions.
+        """
+        samples = Counter()
+        for stack, count in self.stacks.items():
+            for label in set(stack.split(";")):  # Recursive calls count once per sample
+                samples[label] += count
+        return {label: count * self.interval for label, count in samples.items()}
+
+    def write_collapsed(self, path):
+        """
+        Write the samples as collapsed stacks, one "frame;frame;frame count" line per stack.
+
+        Args:
+            path (str): Path of the file.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+    def write_summary(self, path, limit=SUMMARY_FUNCTIONS):
+        """
+        Write the functions with the highest cumulative time as a text table.
+
+        Args:
+            path (str): Path of the file.
+            limit (int): Number of functions listed.
+        """
+        total = sum(self.stacks.values())
+        times = sorted(self.cumulative_times().items(), key=lambda item: item[1], reverse=True)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(f"{total} samples in update/draw, {self.idle_samples} idle, "
+                       f"{self.capture_time:.1f}s captured at {self.interval * 1000:.1f} ms intervals\n\n")
+            file.write(f"{'cumulative s':>12} {'% samples':>9}  function\n")
+            for label, seconds in times[:limit]:
+                share = seconds / self.interval / total if total else 0
+                file.write(f"{seconds:>12.3f} {share:>9.1%}  {label}\n")
+
+    def save(self, path):
+        """
+        Stop capturing and write the collapsed stacks to a file and the summary next to it.
+
+        Args:
+            path (str): Path of the collapsed-stack file; the summary goes to "<path>.summary.txt".
+        """
+        self.stop()
+        self.write_collapsed(path)
+        self.write_summary(f"{path}.summary.txt")
+        log.info("Profile with %d samples written to %s", sum(self.stacks.values()), path)
+
+    def _sample_loop(self, stop_event):
+        """Take samples until the stop event is set."""
+        while not stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._record(frame)
+
+    def _record(self, frame):
+        """Add one sampled stack, cut to start at the outermost root function."""
+        codes = []
+        while frame is not None:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        codes.reverse()  # Outermost call first
+
+        root = next((i for i, code in enumerate(codes) if code.co_name in self.root_functions), None)
+        if root is None:
+            self.idle_samples += 1
+            return
+        self.stacks[";".join(self._label(code) for code in codes[root:])] += 1
+
+    def _label(self, code):
+        """Get the flamegraph label of a code object, e.g. "step (simulation.py:210)"."""
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            label = label.replace(";", ":")
+            self._labels[code] = label
+        return label
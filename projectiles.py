@@ -0,0 +1,50 @@
+"""
+Module: projectiles
+Description: Projectiles thrown by the player, such as bananas.
+"""
+
+import arcade
+from textures import texture_registry, BANANA_IMAGE
+
+
+class Banana(arcade.Sprite):
+    """
+    A banana thrown in a straight line by the player. Bananas are reused through an ObjectPool.
+
+    Attributes:
+        direction (tuple): (dx, dy) grid direction the banana travels in.
+        life (float): Time in seconds since the banana was thrown.
+    """
+    def __init__(self):
+        """
+        Initialize a banana with the shared banana texture. Call reset() before use.
+        """
+        super().__init__(texture_registry.get(BANANA_IMAGE))
+        self.direction = (1, 0)
+        self.life = 0
+        self.pool = None
+        self.pooled = False
+
+    def reset(self, center_x, center_y, direction, speed):
+        """
+        Prepare the banana for a new throw.
+
+        Args:
+            center_x (float): X-coordinate to throw from, in pixels.
+            center_y (float): Y-coordinate to throw from, in pixels.
+            direction (tuple): (dx, dy) grid direction to throw in.
+            speed (float): Distance travelled per update, in pixels.
+        """
+        self.position = (center_x, center_y)
+        self.direction = direction
+        self.change_x, self.change_y = direction[0] * speed, direction[1] * speed
+        self.angle = 0
+        self.life = 0
+
+    def remove_from_sprite_lists(self):
+        """
+        Remove the banana from all sprite lists and return it to its pool.
+        """
+        super().remove_from_sprite_lists()
+        if self.pool is not None:
+            self.pool.release(self)
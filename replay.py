@@ -0,0 +1,267 @@
+"""
+Module: replay
+Description: Input recording and headless replay. A recording holds the seed of a game, the player
+commands issued from the keyboard and the delta time of every simulation step, which is enough to
+re-run the session exactly. Replays run without a window as fast as the machine allows, so recorded
+sessions double as performance regression tests and reproduce the slow frames players report.
+
+Usage:
+    python replay.py session.json [--slowest 10]
+"""
+
+import argparse
+import json
+import os
+import time
+import zlib
+
+if __name__ == "__main__":
+    os.environ.setdefault("ARCADE_HEADLESS", "1")  # Replays never open a window
+
+from simulation import Simulation, ENEMY_COUNT
+from game_constants import GRID_WIDTH, GRID_HEIGHT
+
+RECORDING_VERSION = 1
+
+# Simulation methods a recording may call
+REPLAYABLE_COMMANDS = {
+    "move_player",
+    "throw_banana",
+    "build_structure",
+    "create_ai_player",
+    "purchase_upgrade",
+    "start_event",
+}
+
+
+class InputRecorder:
+    """
+    Records the inputs of a game session.
+
+    Commands are stored with the number of steps taken before they were issued, and step delta
+    times are run-length encoded, so a fixed-timestep session of any length stores a single entry.
+
+    Attributes:
+        seed (int): Seed of the recorded simulation.
+        enemy_count (int): Starting enemy count of the recorded simulation.
+        width (int): Map width of the recorded simulation, in tiles.
+        height (int): Map height of the recorded simulation, in tiles.
+        ticks (int): Number of steps recorded so far.
+        steps (list): [delta_time, count] runs of step delta times.
+        commands (list): [tick, command, args] entries in the order they were issued.
+        final_state (dict): State summary of the simulation when the recording was saved.
+    """
+    def __init__(self, seed, enemy_count=ENEMY_COUNT, width=GRID_WIDTH, height=GRID_HEIGHT):
+        """
+        Initialize an empty recording.
+
+        Args:
+            seed (int): Seed of the simulation being recorded.
+            enemy_count (int): Starting enemy count of the simulation being recorded.
+            width (int): Map width of the simulation being recorded, in tiles.
+            height (int): Map height of the simulation being recorded, in tiles.
+        """
+        self.seed = seed
+        self.enemy_count = enemy_count
+        self.width = width
+        self.height = height
+        self.ticks = 0
+        self.steps = []
+        self.commands = []
+        self.final_state = None
+
+    def record_command(self, command, *args):
+        """
+        Record a command issued before the next step.
+
+        Args:
+            command (str): Name of the Simulation method called, e.g. "move_player".
+            *args: JSON-serializable arguments of the call.
+        """
+        if command not in REPLAYABLE_COMMANDS:
+            raise ValueError(f"Command {command!r} cannot be replayed.")
+        self.commands.append([self.ticks, command, list(args)])
+
+    def record_step(self, delta_time):
+        """
+        Record one simulation step.
+
+        Args:
+            delta_time (float): Delta time passed to Simulation.step().
+        """
+        if self.steps and self.steps[-1][0] == delta_time:
+            self.steps[-1][1] += 1
+        else:
+            self.steps.append([delta_time, 1])
+        self.ticks += 1
+
+    def step_times(self):
+        """
+        Iterate over the recorded step delta times.
+
+        Yields:
+            float: Delta time of each step, in order.
+        """
+        for delta_time, count in self.steps:
+            for _ in range(count):
+                yield delta_time
+
+    def to_dict(self):
+        """
+        Convert the recording to a JSON-serializable dictionary.
+
+        Returns:
+            dict: The recording.
+        """
+        return {
+            "version": RECORDING_VERSION,
+            "seed": self.seed,
+            "enemy_count": self.enemy_count,
+            "width": self.width,
+            "height": self.height,
+            "ticks": self.ticks,
+            "steps": self.steps,
+            "commands": self.commands,
+            "final_state": self.final_state,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create a recording from a dictionary produced by to_dict().
+
+        Args:
+            data (dict): The recording.
+        Returns:
+            InputRecorder: The recording.
+        """
+        if data.get("version") != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version {data.get('version')!r}.")
+        # Recordings made before the map size was configurable are of the default map
+        recorder = cls(data["seed"], data["enemy_count"], data.get("width", GRID_WIDTH),
+                       data.get("height", GRID_HEIGHT))
+        recorder.ticks = data["ticks"]
+        recorder.steps = data["steps"]
+        recorder.commands = data["commands"]
+        recorder.final_state = data.get("final_state")
+        return recorder
+
+    def save(self, path, sim=None):
+        """
+        Write the recording to a JSON file.
+
+        Args:
+            path (str): Path of the file.
+            sim (Simulation): The recorded simulation; its state summary is stored so replays can
+                verify they reproduce the session.
+        """
+        if sim is not None:
+            self.final_state = state_summary(sim)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a recording from a JSON file.
+
+        Args:
+            path (str): Path of the file.
+        Returns:
+            InputRecorder: The recording.
+        """
+        with open(path, encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
+
+
+def state_summary(sim):
+    """
+    Summarize the state of a simulation for comparing two runs.
+
+    Args:
+        sim (Simulation): The simulation.
+    Returns:
+        dict: Scores, player state and checksums of enemy and resource positions.
+    """
+    store = sim.enemy_store
+    slots = store.active_slots()
+    occupancy = sim.resource_manager.occupancy()
+    return {
+        "score": sim.score,
+        "player_health": sim.player_health,
+        "enemies_destroyed": sim.enemies_destroyed,
+        "inventory": dict(sim.inventory),
+        "player_tile": [sim.player.row, sim.player.col],
+        "enemies": len(slots),
+        "enemy_checksum": zlib.crc32(store.row[slots].tobytes() + store.col[slots].tobytes()),
+        "resource_checksum": zlib.crc32(occupancy.tobytes()),
+    }
+
+
+def run_replay(recording):
+    """
+    Re-run a recorded session headlessly, as fast as possible.
+
+    Args:
+        recording (InputRecorder): The session to replay.
+    Returns:
+        tuple: (Simulation, list of per-step durations in seconds).
+    """
+    sim = Simulation(recording.enemy_count, seed=recording.seed, width=recording.width, height=recording.height)
+    commands = iter(recording.commands)
+    pending = next(commands, None)
+    step_durations = []
+    for tick, delta_time in enumerate(recording.step_times()):
+        while pending is not None and pending[0] <= tick:
+            _apply_command(sim, pending)
+            pending = next(commands, None)
+        start = time.perf_counter()
+        sim.step(delta_time)
+        step_durations.append(time.perf_counter() - start)
+
+    # Commands issued after the last step
+    while pending is not None:
+        _apply_command(sim, pending)
+        pending = next(commands, None)
+    return sim, step_durations
+
+
+def _apply_command(sim, entry):
+    """Call the Simulation method of a recorded [tick, command, args] entry."""
+    _, command, args = entry
+    if command not in REPLAYABLE_COMMANDS:
+        raise ValueError(f"Command {command!r} cannot be replayed.")
+    getattr(sim, command)(*args)
+
+
+def main():
+    """Replay a recording from the command line and report timings."""
+    parser = argparse.ArgumentParser(description="Replay a recorded Monkey Tribe Wars session headlessly.")
+    parser.add_argument("recording", help="Path of the recording (JSON)")
+    parser.add_argument("--slowest", type=int, default=5, help="Number of slowest steps to list")
+    args = parser.parse_args()
+
+    recording = InputRecorder.load(args.recording)
+    start = time.perf_counter()
+    sim, step_durations = run_replay(recording)
+    wall_time = time.perf_counter() - start
+    game_time = sum(recording.step_times())
+
+    print(f"Replayed {len(step_durations)} steps ({game_time:.1f}s of game time) in {wall_time:.2f}s, "
+          f"{game_time / wall_time if wall_time else float('inf'):.0f}x real time")
+    slowest = sorted(range(len(step_durations)), key=step_durations.__getitem__, reverse=True)[:args.slowest]
+    for tick in slowest:
+        print(f"  step {tick}: {step_durations[tick] * 1000:.2f} ms")
+
+    summary = state_summary(sim)
+    print(f"Final state: {summary}")
+    if recording.final_state is not None:
+        if summary == recording.final_state:
+            print("Final state matches the recording.")
+        else:
+            print(f"Final state differs from the recording: {recording.final_state}")
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
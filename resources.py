@@ -7,9 +7,17 @@ which are critical for gameplay mechanics such as building structures and mainta
 
 import arcade
 import random
+import numpy as np
 from enum import Enum
 from game_utils import pos_to_grid, GridSprite
-from game_constants import TILE_SIZE
+from game_constants import TILE_SIZE, GRID_WIDTH, GRID_HEIGHT
+from textures import texture_registry
+from pools import ObjectPool
+from chunks import ChunkedWorld
+from game_log import get_logger
+
+log = get_logger("resources")
+
 
 class ResourceType(Enum):
     """
@@ -36,14 +44,29 @@ class ResourceType(Enum):
             case "DIAMOND":
                 return "gemBlue"
             case _:
-                print("Unknown resource type %s.", self.name)
+                log.warning("Unknown resource type %s.", self.name)
                 return None
 
+    def texture_path(self):
+        """
+        Get the image path of the resource sprite.
+        Returns:
+            str: Path of the image, diamonds come from arcade's built-in resources.
+        """
+        if self is ResourceType.DIAMOND:
+            return f":resources:images/items/{self.to_sprite_str()}.png"
+        return f"assets/images/resources/{self.to_sprite_str()}.png"
+
+
+for _resource_type in ResourceType:
+    texture_registry.register(_resource_type, _resource_type.texture_path())
+
+
 class Resource(arcade.Sprite):
     """
     Represents a resource object in the game, such as wood, stone, or food.
     """
-    def __init__(self, type: ResourceType = ResourceType.WOOD, row=None, col=None):
+    def __init__(self, type: ResourceType = ResourceType.WOOD, row=0, col=0):
         """
         Initialize a resource object.
         Args:
@@ -52,25 +75,29 @@ class Resource(arcade.Sprite):
             col (int): Column of the resource in grid units.
         """
         super().__init__()
+        self.spatial_hash = None
+        self.pool = None
+        self.pooled = False
+        self.reset(type, row, col)
 
-        # Assign random type if not provided
+    def reset(self, type: ResourceType, row, col):
+        """
+        Reinitialize the resource with a new type and tile, e.g. when it is reused from a pool.
+        Args:
+            type (ResourceType): The type of the resource.
+            row (int): Row of the resource in grid units.
+            col (int): Column of the resource in grid units.
+        """
         self.type = type
-
-        # Assign row and column positions
-        self.row = random.randint(0, 49) if row is None else row
-        self.col = random.randint(0, 49) if col is None else col
+        self.row = row
+        self.col = col
 
         # Set pixel position based on grid coordinates
         self.center_x, self.center_y = pos_to_grid(self.row, self.col, TILE_SIZE)
 
-        # Load the appropriate texture for the resource
-        if self.type is ResourceType.DIAMOND:
-            self.scale = 0.5
-            self.texture = arcade.load_texture(
-                f":resources:images/items/{self.type.to_sprite_str()}.png")
-        else:
-            self.texture = arcade.load_texture(
-                f"assets/images/resources/{self.type.to_sprite_str()}.png")
+        # Use the shared texture for the resource type
+        self.texture = texture_registry.get(self.type)
+        self.scale = 0.5 if self.type is ResourceType.DIAMOND else 1.0
 
     def collected(self):
         """
@@ -82,23 +109,292 @@ class Resource(arcade.Sprite):
         self.remove_from_sprite_lists()
         return self.type
 
+    def remove_from_sprite_lists(self):
+        """
+        Remove the resource from all sprite lists and from its spatial hash, and return it to its pool.
+        """
+        super().remove_from_sprite_lists()
+        if self.spatial_hash is not None:
+            self.spatial_hash.remove(self)
+        if self.pool is not None:
+            self.pool.release(self)
+
+class ResourceIndex:
+    """
+    Index of resource tiles by type, bucketed into square blocks of tiles, for nearest-resource queries.
+
+    A query searches the blocks in rings of growing distance around the query tile and stops once no
+    block farther out can hold a closer resource, so its cost depends on how far the nearest resource
+    is rather than on the number of resources or the size of the map. Distances count grid steps
+    with diagonal moves (Chebyshev distance), like the agents that walk to the resources.
+
+    Attributes:
+        bucket_size (int): Width and height of a block, in tiles.
+        buckets (dict): Maps (ResourceType, block_row, block_col) to the set of (row, col) tiles in the block.
+        counts (dict): Number of indexed resources of each type.
+    """
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, bucket_size=8):
+        """
+        Initialize an empty index.
+        Args:
+            width (int): Width of the grid in tiles.
+            height (int): Height of the grid in tiles.
+            bucket_size (int): Width and height of a block, in tiles.
+        """
+        self.bucket_size = bucket_size
+        self.bucket_rows = -(-height // bucket_size)
+        self.bucket_cols = -(-width // bucket_size)
+        self.buckets = {}
+        self.counts = dict.fromkeys(ResourceType, 0)
+
+    def add(self, resource):
+        """
+        Index a resource on its tile.
+        Args:
+            resource (Resource): The resource to add.
+        """
+        key = (resource.type, resource.row // self.bucket_size, resource.col // self.bucket_size)
+        self.buckets.setdefault(key, set()).add((resource.row, resource.col))
+        self.counts[resource.type] += 1
+
+    def remove(self, resource):
+        """
+        Drop a resource from the index.
+        Args:
+            resource (Resource): The resource to remove.
+        """
+        key = (resource.type, resource.row // self.bucket_size, resource.col // self.bucket_size)
+        self.buckets[key].discard((resource.row, resource.col))
+        self.counts[resource.type] -= 1
+
+    def clear(self):
+        """
+        Drop every resource from the index.
+        """
+        self.buckets.clear()
+        self.counts = dict.fromkeys(ResourceType, 0)
+
+    def nearest(self, row, col, resource_types, max_distance=None):
+        """
+        Find the closest tile holding a resource of one of the given types.
+        Args:
+            row (int): Row of the query tile.
+            col (int): Column of the query tile.
+            resource_types (iterable): The ResourceTypes to look for.
+            max_distance (int): Ignore resources farther away than this many steps (default: no limit).
+        Returns:
+            tuple: (row, col) of the closest resource, ties broken by row then column, or None if there is none.
+        """
+        resource_types = [t for t in resource_types if self.counts[t]]
+        if not resource_types:
+            return None
+        size = self.bucket_size
+        bucket_row, bucket_col = row // size, col // size
+        rings = max(bucket_row, self.bucket_rows - 1 - bucket_row, bucket_col, self.bucket_cols - 1 - bucket_col)
+        if max_distance is not None:
+            rings = min(rings, max_distance // size + 1)
+
+        best = None
+        for ring in range(rings + 1):
+            # Every tile in ring k is at least (k - 1) * size + 1 steps away
+            if best is not None and best[0] <= ring * size - size:
+                break
+            for block_row in range(bucket_row - ring, bucket_row + ring + 1):
+                # Only the border of the square of blocks is new in this ring
+                step = 1 if abs(block_row - bucket_row) == ring else 2 * ring
+                for block_col in range(bucket_col - ring, bucket_col + ring + 1, step):
+                    for resource_type in resource_types:
+                        for tile in self.buckets.get((resource_type, block_row, block_col), ()):
+                            candidate = (max(abs(tile[0] - row), abs(tile[1] - col)), tile)
+                            if best is None or candidate < best:
+                                best = candidate
+        if best is None or (max_distance is not None and best[0] > max_distance):
+            return None
+        return best[1]
+
+
 class ResourceManager:
     """
     Manages the spawning and collection of resources in the game.
+
+    Resources always sit on tile centers, so the manager tracks them in a tile layer of the chunked
+    world instead of testing sprite collisions. At most one resource occupies a tile.
+
+    Attributes:
+        resource_sprite_list (arcade.SpriteList): All tracked resources.
+        world (ChunkedWorld): The map; holds the "resources" tile layer and the per-chunk "resources"
+            sprite lists used for drawing.
+        pool (ObjectPool): Reusable Resource sprites, shared with other resource spawners such as diamonds.
+        index (ResourceIndex): Tracked resources by type, for nearest-resource queries.
     """
 
-    def __init__(self):
-        """Initialize the ResourceManager with a sprite list to track resources."""
+    # Random probes for a free tile before falling back to scanning the whole map
+    FREE_TILE_ATTEMPTS = 8
+
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, rng=None, world=None):
+        """
+        Initialize the ResourceManager with a sprite list and no resources.
+        Args:
+            width (int): Width of the grid in tiles.
+            height (int): Height of the grid in tiles.
+            rng (random.Random): Random stream for spawn locations and types (default: the global one).
+            world (ChunkedWorld): The map to place resources in (default: a new one of the given size).
+        """
+        self.width = width
+        self.height = height
+        self.rng = rng if rng is not None else random
         self.resource_sprite_list = arcade.SpriteList()
+        self.world = world if world is not None else ChunkedWorld(width, height)
+        self.pool = ObjectPool(Resource)
+        self.index = ResourceIndex(width, height)
+        self._keys = np.zeros(0, dtype=np.int64)  # Tile keys (row * width + col) of the resources, for occupied()
+        self._keys_dirty = False
 
-    def spawn_resource(self):
+    def resource_at(self, row, col):
         """
-        Spawn a single resource at a random grid location.
+        Get the resource on a tile.
+        Args:
+            row (int): Row of the tile.
+            col (int): Column of the tile.
+        Returns:
+            Resource: The resource on the tile, or None if the tile is free.
         """
-        # Normal resource spawning
-        resource_type = random.choice(list(ResourceType))
-        resource = Resource(type=resource_type)
+        return self.world.get_tile("resources", row, col)
+
+    def occupied(self, rows, cols):
+        """
+        Check many tiles for resources at once.
+        Args:
+            rows (numpy.ndarray): Row of each tile.
+            cols (numpy.ndarray): Column of each tile, matching rows.
+        Returns:
+            numpy.ndarray: Bool array, True where a tile holds a resource.
+        """
+        return np.isin(rows.astype(np.int64) * self.width + cols, self._tile_keys())
+
+    def chunk_counts(self):
+        """
+        Count the resources in every chunk of the world.
+        Returns:
+            numpy.ndarray: (chunk_rows, chunk_cols) int array of resource counts.
+        """
+        world = self.world
+        rows, cols = np.divmod(self._tile_keys(), self.width)
+        chunks = rows // world.chunk_size * world.chunk_cols + cols // world.chunk_size
+        counts = np.bincount(chunks, minlength=world.chunk_rows * world.chunk_cols)
+        return counts.reshape(world.chunk_rows, world.chunk_cols)
+
+    def occupancy(self):
+        """
+        Get the occupancy of the whole map, e.g. for a checksum.
+        Returns:
+            numpy.ndarray: (height, width) bool array, True where a tile holds a resource.
+        """
+        grid = np.zeros((self.height, self.width), dtype=bool)
+        for resource in self.resource_sprite_list:
+            grid[resource.row, resource.col] = True
+        return grid
+
+    def nearest_resource(self, row, col, resource_types, max_distance=None):
+        """
+        Find the closest tracked resource of one of the given types, without scanning the sprite list.
+        Args:
+            row (int): Row of the query tile.
+            col (int): Column of the query tile.
+            resource_types (iterable): The ResourceTypes to look for.
+            max_distance (int): Ignore resources farther away than this many steps (default: no limit).
+        Returns:
+            Resource: The closest resource, or None if there is none.
+        """
+        tile = self.index.nearest(row, col, resource_types, max_distance)
+        return None if tile is None else self.resource_at(*tile)
+
+    def random_free_tile(self):
+        """
+        Pick a random tile that holds no resource.
+        Returns:
+            tuple: (row, col) of a free tile, or None if every tile is occupied.
+        """
+        for _ in range(self.FREE_TILE_ATTEMPTS):
+            row = self.rng.randrange(self.height)
+            col = self.rng.randrange(self.width)
+            if self.resource_at(row, col) is None:
+                return row, col
+
+        # Crowded grid, choose directly among the free tiles
+        free = np.flatnonzero(~self.occupancy())
+        if free.size == 0:
+            return None
+        row, col = divmod(int(free[self.rng.randrange(free.size)]), self.width)
+        return row, col
+
+    def add_resource(self, resource):
+        """
+        Start tracking a resource on its tile.
+        Args:
+            resource (Resource): The resource to add.
+        Returns:
+            bool: True if the resource was added, False if its tile is already occupied.
+        """
+        if self.resource_at(resource.row, resource.col) is not None:
+            return False
+        chunk = self.world.set_tile("resources", resource.row, resource.col, resource)
+        chunk.sprite_list("resources").append(resource)
         self.resource_sprite_list.append(resource)
+        self.index.add(resource)
+        self._keys_dirty = True
+        return True
+
+    def collect(self, resource):
+        """
+        Collect a tracked resource, freeing its tile.
+        Args:
+            resource (Resource): The resource to collect.
+        Returns:
+            ResourceType: The type of the collected resource.
+        """
+        self.world.set_tile("resources", resource.row, resource.col, None)
+        self.index.remove(resource)
+        self._keys_dirty = True
+        return resource.collected()
+
+    def clear(self):
+        """
+        Remove every tracked resource.
+        """
+        self.world.clear("resources", layer="resources")
+        self.index.clear()
+        self.pool.release_all(self.resource_sprite_list)
+        self.resource_sprite_list.clear()
+        self._keys_dirty = True
+
+    def _tile_keys(self):
+        """Get the tile keys (row * width + col) of the tracked resources, rebuilt after changes."""
+        if self._keys_dirty:
+            self._keys = np.fromiter((resource.row * self.width + resource.col
+                                      for resource in self.resource_sprite_list),
+                                     dtype=np.int64, count=len(self.resource_sprite_list))
+            self._keys_dirty = False
+        return self._keys
+
+    def spawn_resource(self, resource_type=None):
+        """
+        Spawn a single resource on a random free grid location.
+        Args:
+            resource_type (ResourceType): Type of resource to spawn, random if not given.
+        Returns:
+            Resource: The spawned resource, or None if no tile is free.
+        """
+        tile = self.random_free_tile()
+        if tile is None:
+            return None
+
+        # Normal resource spawning
+        if resource_type is None:
+            resource_type = self.rng.choice(list(ResourceType))
+        resource = self.pool.acquire(resource_type, tile[0], tile[1])
+        self.add_resource(resource)
+        return resource
 
     def check_resource_collection(self, player):
         """
@@ -109,12 +405,8 @@ class ResourceManager:
             list: A list of collected resource types.
         """
         collected_resources = []
-        resources_collected = arcade.check_for_collision_with_list(
-            player, self.resource_sprite_list
-        )
-        for resource in resources_collected:
-            if isinstance(resource, Resource):
-                collected_resources.append(resource.collected())
-                self.spawn_resource()  # Spawn a new resource for every one collected
+        resource = self.resource_at(player.row, player.col)
+        if resource is not None:
+            collected_resources.append(self.collect(resource))
+            self.spawn_resource()  # Spawn a new resource for every one collected
         return collected_resources
-
@@ -10,6 +10,9 @@ import arcade
 from arcade.gui import UIManager, UIBoxLayout, UISlider, UIFlatButton, UITextWidget, UILabel
 from arcade.gui.events import UIOnClickEvent
 from game_constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from game_log import get_logger
+
+log = get_logger("ui")
 
 
 class SettingsMenu(arcade.View):
@@ -30,7 +33,7 @@ class SettingsMenu(arcade.View):
         self.manager = UIManager()
         self.music_manager = music_manager  # Reference to the music manager
         self.volume = 0.5  # Initial volume level (0-100)
-        print("SettingsMenu initialized.")
+        log.debug("SettingsMenu initialized.")
 
     def on_show_view(self):
         """
@@ -38,11 +41,11 @@ class SettingsMenu(arcade.View):
         Sets up the UI elements and enables the UIManager.
         """
         self.manager.enable()
-        print("SettingsMenu enabled.")
+        log.debug("SettingsMenu enabled.")
 
         # Set the background color
         arcade.set_background_color(arcade.color.DARK_BLUE_GRAY)
-        print("Background color set.")
+        log.debug("Background color set.")
 
         # Create box layout for settings
         settings_layout = UIBoxLayout(vertical=True, align="center", space_between=20,
@@ -80,7 +83,7 @@ class SettingsMenu(arcade.View):
         Disables the UIManager.
         """
         self.manager.disable()
-        print("SettingsMenu disabled.")
+        log.debug("SettingsMenu disabled.")
 
     def on_draw(self):
         """
@@ -145,4 +148,4 @@ class SettingsMenu(arcade.View):
         """
         self.manager.disable()
         self.window.show_view(self.game_view)
-        print("Returning to the main game.")
+        log.debug("Returning to the main game.")
@@ -0,0 +1,653 @@
+"""
+Module: simulation
+Description: Headless game simulation for "Monkey Tribe Wars". The Simulation class owns the player,
+enemies, AI players, resources, structures and random events and advances them with step(dt). It never
+touches a window, camera or audio device, so it can run on machines without a GPU or display.
+"""
+
+import arcade
+import random
+import time
+import numpy as np
+from resources import ResourceType, ResourceManager
+from game_utils import GridSprite, pos_to_grid, pos_to_grid_index
+from game_constants import TILE_SIZE, GRID_WIDTH, GRID_HEIGHT
+from buildings import BuildingManager, Hut, STRUCTURE_TYPES
+from upgrades import UpgradeManager
+from enemies import Enemy, EnemyStore
+from spatial_hash import SpatialHash
+from textures import texture_registry, CHARACTER_IMAGE
+from pools import ObjectPool
+from projectiles import Banana
+from entities import EntityRegistry
+from flow_field import FlowField
+from chunks import ChunkedWorld
+from events import EventScheduler
+from game_log import get_logger
+
+log = get_logger("simulation")
+
+# Constants
+RESOURCE_COUNT = 100
+ENEMY_COUNT = 10
+SPRITE_SCALING = 0.5
+ENEMY_SCALING = SPRITE_SCALING / 3  # Scale of pooled enemies; those spawned by enemy huts are larger
+PLAYER_HEALTH = 100
+PLAYER_INV = 1  # Duration player is invincible for after taking damage
+ENEMY_DAMAGE = 10
+ENEMY_MOVE_DELAY = 0.5  # Delay in seconds between enemy moves
+BANANA_SPEED = 5
+BANANA_LIFE = 1
+FLASH_DURATION = 0.25
+ENEMY_CHASE_RANGE = 6  # Enemies within this many steps of the player close in on them
+AI_HUNT_RANGE = 5  # AI players within this many steps of an enemy hunt it down
+AI_GATHERED_TYPES = (ResourceType.WOOD, ResourceType.STONE)  # Resources AI players go after
+
+
+class Simulation:
+    """
+    Game state and rules for "Monkey Tribe Wars", independent of rendering and input.
+    Handles player and AI behaviors, resource collection, building placement, enemy interactions,
+    and game events.
+    """
+    def __init__(self, enemy_count=ENEMY_COUNT, seed=None, resource_count=RESOURCE_COUNT,
+                 width=GRID_WIDTH, height=GRID_HEIGHT):
+        """
+        Set up the sprite lists, managers and starting entities of a new game.
+
+        Args:
+            enemy_count (int): Number of enemies on the map at the start.
+            seed (int): Seed of the game's random streams; a random seed is chosen if not given.
+                Two simulations with the same seed and the same inputs play out identically.
+            resource_count (int): Number of resources on the map at the start (plus a third as many diamonds).
+            width (int): Width of the map in tiles.
+            height (int): Height of the map in tiles.
+        """
+        # Per-game random streams, so a game can be reproduced from its seed
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.np_rng = np.random.default_rng(self.seed)
+
+        # The map, divided into lazily created chunks
+        self.width = width
+        self.height = height
+        self.world = ChunkedWorld(width, height)
+
+        # Load all shared textures up front so spawning never hits the texture loader
+        texture_registry.preload()
+
+        # Sprite lists
+        self.player_sprite_list = arcade.SpriteList()
+        self.enemy_sprite_list = arcade.SpriteList()
+        self.mraid_sprite_list = arcade.SpriteList()
+        self.diamond_sprite_list = arcade.SpriteList()
+        self.drain_sprite_list = arcade.SpriteList()
+        self.banana_sprite_list = arcade.SpriteList()
+
+        # Array-backed state and tile index of all enemies and raid enemies
+        self.enemy_store = EnemyStore(width=width, height=height, rng=self.np_rng)
+
+        # Pools of reusable sprites; resources and diamonds share the resource manager's pool
+        self.enemy_pool = ObjectPool(self._create_enemy)
+        self.banana_pool = ObjectPool(Banana)
+
+        # Tile indexes for collision queries
+        self.diamond_index = SpatialHash()  # Diamonds and Diamond Rain diamonds
+        self.ai_index = SpatialHash()  # AI players
+
+        # Flow fields shared by all agents seeking the same goals
+        self.player_field = FlowField(width, height, ENEMY_CHASE_RANGE)  # Towards the player, for enemies
+        self.enemy_field = FlowField(width, height, AI_HUNT_RANGE)  # Towards the enemies, for AI players
+
+        # AI players
+        self.ai_players = arcade.SpriteList()  # List to hold AI-controlled players
+        self.ai_player_cost = 20  # Cost to create an AI player
+
+        # Player setup
+        self.player = GridSprite(
+            CHARACTER_IMAGE,  # https://opengameart.org/content/cartoon-animals
+            SPRITE_SCALING / 3,
+        )
+        self.player.row = height // 2
+        self.player.col = width // 2
+        self.player.center_x, self.player.center_y = pos_to_grid(self.player.row, self.player.col, TILE_SIZE)
+        self.player_sprite_list.append(self.player)
+        self.player.direction = (1, 0)
+        self.player.itime = 0
+        self.player.hit = False
+        self.flash_duration = 0
+        self.flash_color = (255, 0, 0, 32)
+
+        # Resource manager
+        self.resource_manager = ResourceManager(width, height, rng=self.rng, world=self.world)
+        self.structure_manager = BuildingManager(world=self.world)
+        # Initialize inventory for resources
+        self.inventory = {"WOOD": 0, "STONE": 0, "FOOD": 0}
+        self.upgrade_manager = UpgradeManager(self.player, self.ai_players, self.structure_manager)
+
+        # Persistent views over groups of sprite lists, used instead of merging lists into new ones
+        self.entities = EntityRegistry()
+        self.enemies = self.entities.register("enemies", self.enemy_sprite_list, self.mraid_sprite_list,
+                                              index=self.enemy_store)
+        self.entities.register("diamonds", self.diamond_sprite_list, self.drain_sprite_list)
+        self.entities.register("ai_players", self.ai_players)
+        self.entities.register("structures", self.structure_manager.structures)
+        self.entities.register("resources", self.resource_manager.resource_sprite_list)
+        self.entities.register("bananas", self.banana_sprite_list)
+
+        # Initialize resources and enemies
+        self.resource_count = resource_count
+        self.spawn_resources(resource_count)
+        self.spawn_enemies(enemy_count)
+
+        # Game variables
+        self.player_health = PLAYER_HEALTH
+        self.score = 0
+        self.enemies_destroyed = 0
+        self.enemy_move_timer = 0
+        self.ai_move_timer = 0
+        self.enemy_moves = 0  # Enemy and AI moves so far; distant chunks take turns by move number
+        self.ai_moves = 0
+
+        # Phases of a step, in order; timed individually when a phase timer is attached
+        self._phases = (
+            ("bananas", self.update_bananas),
+            ("enemies", self.update_enemies),
+            ("player", self.update_player),
+            ("ai", self.update_ai_players),
+            ("structures", self.update_structures),
+            ("events", self.update_events),
+        )
+        self.phase_timer = None  # Object with add_phase(name, seconds), e.g. the performance overlay
+
+        # Random events
+        self.events = EventScheduler(self, self.rng)
+
+    @property
+    def active_event(self):
+        """str: Name of the random event in progress, or None."""
+        return self.events.active
+
+    @property
+    def game_over(self):
+        """bool: True once the player has run out of health."""
+        return self.player_health <= 0
+
+    def spawn_resources(self, count):
+        """Spawn resources randomly on the grid."""
+        for _ in range(count):
+            rand_type = self.rng.choice(
+                [ResourceType.WOOD, ResourceType.STONE, ResourceType.FOOD]
+            )
+            self.resource_manager.spawn_resource(rand_type)
+
+        # Spawn diamonds (currency resources)
+        for _ in range(count // 3):  # Fewer diamonds compared to other resources
+            self.spawn_diamond(self.diamond_sprite_list)
+
+    def spawn_diamond(self, s_list):
+        """
+        Spawn a diamond on a random tile.
+
+        Args:
+            s_list (arcade.SpriteList): The diamond list to add it to.
+        Returns:
+            Resource: The spawned diamond.
+        """
+        row = self.rng.randint(0, self.height - 1)
+        col = self.rng.randint(0, self.width - 1)
+        diamond = self.resource_manager.pool.acquire(ResourceType.DIAMOND, row, col)
+        s_list.append(diamond)
+        self.diamond_index.add(diamond)
+        return diamond
+
+    def spawn_enemies(self, count, s_list=None):
+        """Spawn enemies randomly on the grid."""
+        if s_list is None:
+            s_list = self.enemy_sprite_list
+
+        for _ in range(count):
+            row = self.rng.randint(0, self.height - 1)
+            col = self.rng.randint(0, self.width - 1)
+            enemy = self.enemy_pool.acquire(row, col)
+            s_list.append(enemy)
+            self.enemy_store.add(enemy)
+
+    @staticmethod
+    def _create_enemy():
+        """Create a new enemy sprite for the enemy pool."""
+        enemy = Enemy(CHARACTER_IMAGE, ENEMY_SCALING)
+        enemy.color = arcade.color.RED
+        return enemy
+
+    def move_sprite(self, sprite, dx, dy):
+        """Move a sprite by a grid offset, keeping its spatial hash bucket up to date."""
+        sprite.row += dy
+        sprite.col += dx
+        sprite.row = max(0, min(self.height - 1, sprite.row))
+        sprite.col = max(0, min(self.width - 1, sprite.col))
+        sprite.center_x, sprite.center_y = pos_to_grid(sprite.row, sprite.col, TILE_SIZE)
+        spatial_hash = getattr(sprite, "spatial_hash", None)
+        if spatial_hash is not None:
+            spatial_hash.move(sprite)
+
+    def step(self, delta_time):
+        """
+        Advance the game state by one update.
+
+        Args:
+            delta_time (float): Time elapsed since the last update, in seconds.
+        """
+        if self.game_over:
+            return
+
+        timer = self.phase_timer
+        if timer is None:
+            for _, phase in self._phases:
+                phase(delta_time)
+        else:
+            for name, phase in self._phases:
+                start = time.perf_counter()
+                phase(delta_time)
+                timer.add_phase(name, time.perf_counter() - start)
+
+    def update_bananas(self, delta_time):
+        """Move banana projectiles and resolve their hits on enemies."""
+        # Update banana projectiles
+        self.banana_sprite_list.update()
+        for banana in self.banana_sprite_list:
+            banana.angle += 10
+            banana.life += delta_time
+            banana_row, banana_col = pos_to_grid_index(banana.center_x, banana.center_y, TILE_SIZE)
+            enemies_hit = self.enemies.collisions(banana, banana_row, banana_col)
+            for enemy in enemies_hit:
+                enemy.remove_from_sprite_lists()
+                banana.remove_from_sprite_lists()
+                self.score += 5  # Award points for defeating an enemy
+                self.enemies_destroyed += 1
+                log.debug("Enemy defeated! Score: %d", self.score)
+                # Respawn enemies
+                self.spawn_enemies(1)
+
+            if banana.life > BANANA_LIFE:
+                banana.remove_from_sprite_lists()
+
+    def update_enemies(self, delta_time):
+        """Move enemies, and let them collect resources and build huts."""
+        # Update enemy movement timer
+        self.enemy_move_timer += delta_time
+        if self.enemy_move_timer >= ENEMY_MOVE_DELAY:
+            self.enemy_move_timer = 0
+            store = self.enemy_store
+            slots = store.active_slots()
+            moves = self.world.moves_due(store.row[slots], store.col[slots], self.player.row, self.player.col,
+                                         self.enemy_moves)
+            self.enemy_moves += 1
+            # Enemies near the player close in on them, the rest wander
+            self.player_field.set_goals((self.player.row,), (self.player.col,))
+            moved = store.random_walk(slots[moves == 1], field=self.player_field)
+
+            # Enemy collects resources (but not FOOD or DIAMOND)
+            on_resource = moved[self.resource_manager.occupied(store.row[moved], store.col[moved])]
+            for slot in on_resource:
+                enemy = store.sprites[slot]
+                resource = self.resource_manager.resource_at(enemy.row, enemy.col)
+                if resource is not None:
+                    self.enemy_collect(enemy, resource)
+
+            # Enemies far from the player, out of view, make several moves at once
+            coarse = slots[moves > 1]
+            if coarse.size:
+                self.update_coarse_enemies(coarse, self.world.distant_interval)
+                moved = np.concatenate((moved, coarse))
+
+            # Enemy builds structures if enough resources are available
+            for slot in moved[store.wood[moved] >= 10]:  # Example: Build Hut if enough wood
+                enemy = store.sprites[slot]
+                x, y = pos_to_grid(enemy.row, enemy.col)
+                if self.structure_manager.place_structure(Hut, x, y, enemy.inventory, team="enemy"):
+                    log.debug("Enemy built a Hut at (%d, %d).", enemy.row, enemy.col)
+
+    def update_coarse_enemies(self, slots, moves):
+        """
+        Move enemies at a coarse level of detail: several random steps in one batched move, with the
+        tiles passed on the way replaced by a chance of picking up a resource of the enemy's chunk.
+        The chance is that of walking over a resource in that many steps, at the chunk's resource density.
+
+        Args:
+            slots (numpy.ndarray): Slots of the enemies.
+            moves (int): Number of moves to make.
+        """
+        store = self.enemy_store
+        world = self.world
+        store.random_walk(slots, moves=moves)
+        size = world.chunk_size
+        counts = self.resource_manager.chunk_counts()
+        density = counts[store.row[slots] // size, store.col[slots] // size] / (size * size)
+        for slot in slots[store.rng.random(slots.size) < 1 - (1 - density) ** moves].tolist():
+            enemy = store.sprites[slot]
+            resources = world.chunk_at(enemy.row, enemy.col).sprite_lists.get("resources")
+            if resources:  # Empty if another enemy of the chunk took the last resource
+                self.enemy_collect(enemy, resources[int(store.rng.integers(len(resources)))])
+
+    def enemy_collect(self, enemy, resource):
+        """
+        Let an enemy collect a resource, keeping only wood and stone, and spawn a new resource.
+
+        Args:
+            enemy (Enemy): The enemy.
+            resource (Resource): The resource it collects.
+        """
+        collected_type = self.resource_manager.collect(resource).name
+        self.resource_manager.spawn_resource()
+        if collected_type in ["WOOD", "STONE"]:
+            enemy.inventory[collected_type] += 1
+            log.debug("Enemy collected %s.", collected_type)
+
+    def update_player(self, delta_time):
+        """Fade the damage/heal flash and resolve the player's collisions with enemies, diamonds and resources."""
+        if self.flash_duration > 0:
+            self.flash_duration -= delta_time
+
+        if self.player.itime > PLAYER_INV:
+            self.player.hit = False
+            self.player.itime = 0
+
+        if not self.player.hit:
+            # Enemies on the player's tile always touch the player. Enemies spawned by huts are larger than
+            # a tile and can also reach it from a neighboring tile, so those are hit-tested.
+            # However many touch the player, they deal a single hit per update.
+            row, col = self.player.row, self.player.col
+            if self.enemy_store.count_in_rect(row, row, col, col) or self.enemies.collisions(self.player):
+                self.player_take_damage(ENEMY_DAMAGE)
+        else:
+            self.player.itime += delta_time
+
+        # Player collects diamonds
+        diamonds_collected = self.diamond_index.collisions(self.player, self.player.row, self.player.col)
+        if diamonds_collected:
+            for diamond in diamonds_collected:
+                diamond.remove_from_sprite_lists()
+                self.score += 1  # Increment the score for diamonds
+
+        # Player collects resources
+        collected_resources = self.resource_manager.check_resource_collection(self.player)
+        for collected_type in collected_resources:
+            if collected_type == ResourceType.FOOD:
+                if self.player_health < PLAYER_HEALTH:
+                    self.player_heal(10)  # Heal player
+                    self.inventory["FOOD"] += 1  # Update FOOD inventory
+                else:
+                    log.debug("Health is full! Food not collected.")
+            elif collected_type == ResourceType.WOOD:
+                self.inventory["WOOD"] += 1
+            elif collected_type == ResourceType.STONE:
+                self.inventory["STONE"] += 1
+            self.resource_manager.spawn_resource()
+
+    def update_ai_players(self, delta_time):
+        """Move AI players, and let them attack, collect resources and build huts."""
+        # AI Player Movement and Actions
+        self.ai_move_timer += delta_time
+        if self.ai_move_timer >= ENEMY_MOVE_DELAY:
+            self.ai_move_timer = 0
+            if self.ai_players:
+                # Only enemies in chunks next to an AI player can be in hunting range, so the field
+                # is searched from those alone
+                store = self.enemy_store
+                slots = store.active_slots()
+                ai_rows = np.fromiter((ai.row for ai in self.ai_players), dtype=np.int64, count=len(self.ai_players))
+                ai_cols = np.fromiter((ai.col for ai in self.ai_players), dtype=np.int64, count=len(self.ai_players))
+                slots = slots[self.world.near(store.row[slots], store.col[slots], ai_rows, ai_cols)]
+                self.enemy_field.set_goals(store.row[slots], store.col[slots])
+            move = self.ai_moves
+            self.ai_moves += 1
+            for ai in self.ai_players:
+                moves = self.world.moves_due_at(ai.row, ai.col, self.player.row, self.player.col, move)
+                if moves == 0:
+                    continue  # Far from the player and not its chunk's turn
+                if moves == 1:
+                    # Hunt down a nearby enemy, otherwise head for the closest wood or stone
+                    step = self.enemy_field.step(ai.row, ai.col)
+                    if step is None:
+                        step = self.step_towards_resource(ai)
+                else:
+                    # Far from the player, out of view: head for the closest wood or stone several steps
+                    # at once, and only fight the enemies met at the end of the move
+                    step = self.step_towards_resource(ai, moves)
+                if step is None:
+                    # Random movement in the grid
+                    dx = sum(self.rng.choice([-1, 0, 1]) for _ in range(moves))
+                    dy = sum(self.rng.choice([-1, 0, 1]) for _ in range(moves))
+                else:
+                    dy, dx = step
+                self.move_sprite(ai, dx, dy)
+
+                # AI attacks nearby enemies
+                for enemy in self.enemy_store.near(ai.row, ai.col):
+                    enemy.remove_from_sprite_lists()
+                    log.debug("AI player at (%d, %d) attacked and defeated an enemy.", ai.row, ai.col)
+                    break
+
+                # AI collects resources
+                resource = self.resource_manager.resource_at(ai.row, ai.col)
+                if resource is not None:
+                    collected_type = self.resource_manager.collect(resource)
+                    if collected_type in AI_GATHERED_TYPES:  # AI collects only wood and stone
+                        self.inventory[collected_type.name] += 1
+                        log.debug("AI player collected %s. Inventory: %s", collected_type.name, self.inventory)
+                    elif collected_type is ResourceType.DIAMOND:
+                        log.debug("AI ignored DIAMOND.")
+                    elif collected_type is ResourceType.FOOD:
+                        log.debug("AI collected FOOD but cannot use it.")
+                    # Spawn a new resource after collection
+                    self.resource_manager.spawn_resource()
+
+                # AI building logic
+                if self.inventory["WOOD"] >= 10:  # Example threshold for a Hut
+                    grid_x, grid_y = ai.row, ai.col
+                    pixel_x, pixel_y = pos_to_grid(grid_x, grid_y, TILE_SIZE)
+                    if self.structure_manager.place_structure(Hut, pixel_x, pixel_y, self.inventory, team="player"):
+                        log.debug("AI player built a Hut at (%d, %d).", grid_x, grid_y)
+
+    def step_towards_resource(self, ai, moves=1):
+        """
+        Get the step that takes an AI player towards the closest wood or stone.
+
+        Args:
+            ai (GridSprite): The AI player.
+            moves (int): Number of steps to take at once, stopping on the resource.
+        Returns:
+            tuple: (row, col) offset of the step, or None if there is no wood or stone on the map.
+        """
+        resource = self.resource_manager.nearest_resource(ai.row, ai.col, AI_GATHERED_TYPES)
+        if resource is None:
+            return None
+        return (max(-moves, min(moves, resource.row - ai.row)),
+                max(-moves, min(moves, resource.col - ai.col)))
+
+    def update_structures(self, delta_time):
+        """Let structures spawn entities and attack."""
+        # Update buildings
+        self.structure_manager.update_structures(delta_time, self.player_sprite_list, self.ai_players,
+                                                 self.enemy_sprite_list, self.enemy_store, self.ai_index)
+
+    def update_events(self, delta_time):
+        """Advance the active random event, or trigger a new one."""
+        self.events.update(delta_time)
+
+    def move_player(self, dx, dy):
+        """
+        Move the player by one grid step and face the direction of travel.
+
+        Args:
+            dx (int): Column offset (-1, 0 or 1).
+            dy (int): Row offset (-1, 0 or 1).
+        """
+        self.move_sprite(self.player, dx, dy)
+        self.player.direction = (dx, dy)
+
+    def build_structure(self, structure_type):
+        """
+        Build a structure on the player's tile.
+
+        Args:
+            structure_type (class | str): The type of structure to place (e.g., Hut, Tower), or its name.
+        Returns:
+            bool: True if the structure was placed successfully, False otherwise.
+        """
+        if isinstance(structure_type, str):
+            structure_type = STRUCTURE_TYPES[structure_type]
+        pos_x = self.player.center_x
+        pos_y = self.player.center_y
+        success = self.structure_manager.place_structure(structure_type, pos_x, pos_y, self.inventory, team="player")
+        grid_x, grid_y = int(pos_x // TILE_SIZE), int(pos_y // TILE_SIZE)
+        if success:
+            log.info("%s built at (%d, %d).", structure_type.__name__, grid_x, grid_y)
+        return success
+
+    def purchase_upgrade(self, upgrade_name):
+        """
+        Spend score on an upgrade.
+
+        Args:
+            upgrade_name (str): The name of the upgrade to purchase.
+        Returns:
+            bool: True if the purchase was successful.
+        """
+        success, self.score = self.upgrade_manager.purchase_upgrade(upgrade_name, self.score)
+        return success
+
+    def start_event(self, event_name):
+        """
+        Start a random event immediately, ignoring the cooldown.
+
+        Args:
+            event_name (str): The event to start (e.g., "Meteor Shower").
+        """
+        self.events.start(event_name)
+
+    def attack_enemies(self):
+        """Attack enemies adjacent to the player and destroy them."""
+        for enemy in self.enemies.within(self.player.row, self.player.col):
+            enemy.remove_from_sprite_lists()
+            self.score += 5  # Award points for defeating an enemy
+            self.enemies_destroyed += 1
+            log.debug("Enemy defeated! Score: %d", self.score)
+            # Respawn enemies
+            self.spawn_enemies(1)
+
+    def throw_banana(self):
+        """Throw a banana in front of the player."""
+        banana = self.banana_pool.acquire(self.player.center_x, self.player.center_y,
+                                          self.player.direction, BANANA_SPEED)
+        self.banana_sprite_list.append(banana)
+
+    def player_take_damage(self, damage):
+        self.player_health -= damage
+        self.flash_duration = FLASH_DURATION
+        self.player.hit = True
+        self.flash_color = (255, 0, 0, 32)
+
+    def player_heal(self, health):
+        if self.player_health > PLAYER_HEALTH:
+            self.player_health = PLAYER_HEALTH
+        else:
+            self.player_health = self.player_health + health
+        self.flash_duration = FLASH_DURATION
+        self.flash_color = (0, 255, 0, 32)
+
+    def create_ai_player(self):
+        """Create a new AI player if the player has enough points."""
+        if self.score >= self.ai_player_cost:
+            self.score -= self.ai_player_cost  # Deduct points for the new AI player
+            new_ai = GridSprite(
+                CHARACTER_IMAGE,  # Replace with AI player sprite image path
+                scaling =0.15
+            )
+            # Assign AI-specific attributes, such as movement behavior
+            new_ai.row = int(new_ai.center_y // TILE_SIZE)
+            new_ai.col = int(new_ai.center_x // TILE_SIZE)
+            self.upgrade_manager.attach(new_ai, "ai")
+            self.ai_players.append(new_ai)
+            self.ai_index.add(new_ai)
+            log.info("AI player created! Remaining score: %d", self.score)
+        else:
+            log.info("Not enough points to create AI player! Current score: %d", self.score)
+
+    # Event hooks, called by the EventScheduler as described in events.EVENTS
+
+    def apply_modifiers(self, flag, changes):
+        """Add stat changes to the enemies on the map and to those spawned until they are reverted."""
+        self.enemy_store.apply_modifier(flag, changes)
+
+    def resume_modifiers(self, flag, changes):
+        """Put restored stat changes back in effect for enemies spawned from now on."""
+        self.enemy_store.active_modifiers[flag] = changes
+
+    def revert_modifiers(self, flag, changes):
+        """Take back stat changes from the enemies that received them."""
+        self.enemy_store.revert_modifier(flag, changes)
+
+    def spawn_raid_enemies(self, count, cap):
+        """Spawn raiding enemies, keeping at most `cap` of them on the map."""
+        self.spawn_enemies(min(count, cap - len(self.mraid_sprite_list)), self.mraid_sprite_list)
+        log.debug("Monkey Raid in progress!")
+
+    def clear_raid_enemies(self):
+        """Remove the raiding enemies at the end of a Monkey Raid."""
+        self.enemy_store.remove_all(self.mraid_sprite_list)
+        self.enemy_pool.release_all(self.mraid_sprite_list)
+        self.mraid_sprite_list.clear()
+
+    def clear_resources(self):
+        """Remove every resource and diamond, e.g. for a Resource Shortage."""
+        self.resource_manager.clear()
+        self.diamond_index.remove_all(self.diamond_sprite_list)
+        self.resource_manager.pool.release_all(self.diamond_sprite_list)
+        self.diamond_sprite_list.clear()
+
+    def restore_resources(self):
+        """Spawn a fresh set of resources and diamonds after a Resource Shortage."""
+        self.spawn_resources(self.resource_count)
+
+    def meteor_strike(self, structure_damage, hit_chance, hit_damage):
+        """
+        Hit all structures, and the player and enemies at random, with meteors.
+
+        Args:
+            structure_damage (int): Damage dealt to every structure.
+            hit_chance (float): Chance of the player and of each enemy to be hit.
+            hit_damage (int): Damage dealt to the player or enemy hit.
+        """
+        for structure in list(self.structure_manager.structures):
+            structure.health -= structure_damage
+            if structure.health <= 0:
+                structure.remove_from_sprite_lists()
+                log.debug("A structure was destroyed by the meteor shower!")
+
+        # Damage players and enemies in random spots
+        for sprite_list in [self.player_sprite_list, self.enemy_sprite_list]:
+            for sprite in list(sprite_list):
+                if self.rng.random() < hit_chance:
+                    if type(sprite) is GridSprite:
+                        self.player_take_damage(hit_damage)
+                        log.info("Player was hit by a meteor!")
+                    else:
+                        sprite.health -= hit_damage
+                        log.debug("%s was hit by a meteor!", sprite.__class__.__name__)
+                        if sprite.health <= 0:
+                            sprite.remove_from_sprite_lists()
+                            log.debug("%s was destroyed by a meteor!", sprite.__class__.__name__)
+
+    def spawn_rain_diamonds(self, count, cap):
+        """Spawn Diamond Rain diamonds, keeping at most `cap` of them on the map."""
+        for _ in range(min(count, cap - len(self.drain_sprite_list))):
+            diamond = self.spawn_diamond(self.drain_sprite_list)
+            log.debug("Diamond spawned at (%d, %d)", diamond.row, diamond.col)
+
+    def clear_rain_diamonds(self):
+        """Remove the Diamond Rain diamonds that were not collected."""
+        self.diamond_index.remove_all(self.drain_sprite_list)
+        self.resource_manager.pool.release_all(self.drain_sprite_list)
+        self.drain_sprite_list.clear()
@@ -0,0 +1,306 @@
+"""
+Module: snapshot
+Description: Save and restore the full state of a Simulation as a compact binary snapshot. Entities are
+packed column by column into typed NumPy arrays (one array per attribute, not one record per object),
+so saving a world with tens of thousands of entities takes a few milliseconds and can run as an autosave.
+
+Layout: a fixed header (magic, format version, flags, length of the JSON description), followed by the
+body, zlib-compressed when FLAG_COMPRESSED is set. The body is the UTF-8 JSON description (scalar game
+state and the name, dtype and shape of every array) followed by the raw little-endian array data.
+"""
+
+import json
+import os
+import struct
+import zlib
+import arcade
+import numpy as np
+from buildings import STRUCTURE_TYPES
+from enemies import Enemy
+from game_log import get_logger
+from game_utils import GridSprite, pos_to_grid
+from resources import ResourceType
+from simulation import Simulation, ENEMY_SCALING
+from textures import CHARACTER_IMAGE
+
+log = get_logger("snapshot")
+
+MAGIC = b"MTWS"
+SNAPSHOT_VERSION = 6
+FLAG_COMPRESSED = 1
+HEADER = struct.Struct("<4sHHI")  # Magic, version, flags, length of the JSON description
+COMPRESSION_LEVEL = 1  # Fastest zlib level; entity arrays compress well even so
+
+# Codes of enumerated values in the arrays
+RESOURCE_TYPES = list(ResourceType)
+STRUCTURE_NAMES = list(STRUCTURE_TYPES)
+TEAMS = ["player", "enemy"]
+
+
+def dumps(sim, compress=True):
+    """
+    Serialize the state of a simulation.
+
+    Args:
+        sim (Simulation): The simulation to save.
+        compress (bool): Whether to zlib-compress the body.
+    Returns:
+        bytes: The snapshot.
+    """
+    player = sim.player
+    rng_version, rng_state, gauss_next = sim.rng.getstate()
+    state = {
+        "seed": sim.seed,
+        "width": sim.width,
+        "height": sim.height,
+        "rng": {"version": rng_version, "gauss_next": gauss_next},
+        "np_rng": sim.np_rng.bit_generator.state,
+        "score": sim.score,
+        "player_health": sim.player_health,
+        "enemies_destroyed": sim.enemies_destroyed,
+        "inventory": sim.inventory,
+        "enemy_move_timer": sim.enemy_move_timer,
+        "ai_move_timer": sim.ai_move_timer,
+        "enemy_moves": sim.enemy_moves,
+        "ai_moves": sim.ai_moves,
+        "ai_player_cost": sim.ai_player_cost,
+        "resource_count": sim.resource_count,
+        "flash_duration": sim.flash_duration,
+        "flash_color": sim.flash_color,
+        "player": {
+            "row": player.row,
+            "col": player.col,
+            "direction": player.direction,
+            "itime": player.itime,
+            "hit": player.hit,
+            "speed": player.speed,
+            "resource_gathering_speed": player.resource_gathering_speed,
+        },
+        "upgrades": {name: {"level": upgrade["level"], "cost": upgrade["cost"]}
+                     for name, upgrade in sim.upgrade_manager.upgrades.items()},
+        "events": sim.events.state(),
+        "structures_built": sim.structure_manager.built,
+    }
+
+    arrays = {"rng_state": np.array(rng_state, dtype=np.uint32)}
+    for field, array in sim.enemy_store.pack().items():
+        arrays[f"enemy_{field}"] = array
+    arrays["enemy_scale"] = np.array([0.0 if enemy is None else enemy.scale_x
+                                      for enemy in sim.enemy_store.sprites[:sim.enemy_store.size]])
+    arrays["enemy_list_slots"] = np.array([enemy._slot for enemy in sim.enemy_sprite_list], dtype=np.int32)
+    arrays["mraid_list_slots"] = np.array([enemy._slot for enemy in sim.mraid_sprite_list], dtype=np.int32)
+    _pack_columns(arrays, "ai", sim.ai_players, ("row", np.int32), ("col", np.int32), ("center_x", np.float64),
+                  ("center_y", np.float64), ("speed", np.float64), ("resource_gathering_speed", np.float64),
+                  ("attack_strength", np.float64))
+    _pack_columns(arrays, "resource", sim.resource_manager.resource_sprite_list,
+                  ("row", np.int32), ("col", np.int32))
+    arrays["resource_type"] = np.array([RESOURCE_TYPES.index(resource.type)
+                                        for resource in sim.resource_manager.resource_sprite_list], dtype=np.uint8)
+    _pack_columns(arrays, "diamond", sim.diamond_sprite_list, ("row", np.int32), ("col", np.int32))
+    _pack_columns(arrays, "drain", sim.drain_sprite_list, ("row", np.int32), ("col", np.int32))
+    structures = sim.structure_manager.structures
+    _pack_columns(arrays, "structure", structures, ("center_x", np.float64), ("center_y", np.float64),
+                  ("health", np.int32), ("spawn_timer", np.float64), ("attack_timer", np.float64))
+    arrays["structure_type"] = np.array([STRUCTURE_NAMES.index(type(structure).__name__)
+                                         for structure in structures], dtype=np.uint8)
+    arrays["structure_team"] = np.array([TEAMS.index(structure.team) for structure in structures], dtype=np.uint8)
+    _pack_columns(arrays, "banana", sim.banana_sprite_list, ("center_x", np.float64), ("center_y", np.float64),
+                  ("change_x", np.float64), ("change_y", np.float64), ("angle", np.float64), ("life", np.float64))
+    arrays["banana_direction"] = np.array([banana.direction for banana in sim.banana_sprite_list],
+                                          dtype=np.int8).reshape(-1, 2)
+
+    manifest = []
+    chunks = []
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+        manifest.append([name, array.dtype.str, list(array.shape)])
+        chunks.append(array.tobytes())
+    state["arrays"] = manifest
+    description = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    body = description + b"".join(chunks)
+    flags = 0
+    if compress:
+        body = zlib.compress(body, COMPRESSION_LEVEL)
+        flags |= FLAG_COMPRESSED
+    return HEADER.pack(MAGIC, SNAPSHOT_VERSION, flags, len(description)) + body
+
+
+def loads(data):
+    """
+    Restore a simulation from a snapshot.
+
+    Args:
+        data (bytes): A snapshot created by dumps().
+    Returns:
+        Simulation: A new simulation in the saved state. Stepping it plays out exactly like the
+            saved simulation would have.
+    Raises:
+        ValueError: If the data is not a snapshot or was written by an unsupported format version.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("Not a Monkey Tribe Wars snapshot: too short")
+    magic, version, flags, description_length = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a Monkey Tribe Wars snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {version} (expected {SNAPSHOT_VERSION})")
+    body = memoryview(data)[HEADER.size:]
+    if flags & FLAG_COMPRESSED:
+        body = memoryview(zlib.decompress(body))
+    state = json.loads(bytes(body[:description_length]))
+
+    arrays = {}
+    offset = description_length
+    for name, dtype, shape in state["arrays"]:
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape, dtype=np.int64))
+        arrays[name] = np.frombuffer(body, dtype, count, offset).reshape(shape)
+        offset += count * dtype.itemsize
+
+    sim = Simulation(enemy_count=0, seed=state["seed"], resource_count=0, width=state["width"],
+                     height=state["height"])
+    sim.rng.setstate((state["rng"]["version"], tuple(arrays["rng_state"].tolist()), state["rng"]["gauss_next"]))
+    sim.np_rng.bit_generator.state = state["np_rng"]
+    for name in ("score", "player_health", "enemies_destroyed", "enemy_move_timer", "ai_move_timer",
+                 "enemy_moves", "ai_moves", "ai_player_cost", "resource_count", "flash_duration"):
+        setattr(sim, name, state[name])
+    sim.flash_color = tuple(state["flash_color"])
+    sim.inventory.update(state["inventory"])
+    sim.upgrade_manager.restore(state["upgrades"])
+    sim.events.restore(state["events"])
+
+    player_state = state["player"]
+    player = sim.player
+    player.row, player.col = player_state["row"], player_state["col"]
+    player.position = pos_to_grid(player.row, player.col)
+    player.direction = tuple(player_state["direction"])
+    for name in ("itime", "hit", "speed", "resource_gathering_speed"):
+        setattr(player, name, player_state[name])
+
+    _restore_enemies(sim, arrays)
+    _restore_ai_players(sim, arrays)
+    _restore_resources(sim, arrays)
+    _restore_structures(sim, arrays)
+    sim.structure_manager.built.update(state["structures_built"])
+    _restore_bananas(sim, arrays)
+    return sim
+
+
+def save(sim, path, compress=True):
+    """
+    Write a snapshot of a simulation to a file.
+
+    Args:
+        sim (Simulation): The simulation to save.
+        path (str): Path of the file.
+        compress (bool): Whether to zlib-compress the body.
+    Returns:
+        int: Size of the snapshot in bytes.
+    """
+    data = dumps(sim, compress)
+    # Write next to the destination and swap it in, so a crash mid-write never truncates the last save
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    log.info("Snapshot of %d bytes saved to %s", len(data), path)
+    return len(data)
+
+
+def load(path):
+    """
+    Restore a simulation from a snapshot file.
+
+    Args:
+        path (str): Path of the file.
+    Returns:
+        Simulation: A new simulation in the saved state.
+    """
+    with open(path, "rb") as file:
+        sim = loads(file.read())
+    log.info("Snapshot loaded from %s", path)
+    return sim
+
+
+def _pack_columns(arrays, prefix, sprites, *columns):
+    """Add one array per (attribute, dtype) column of a group of sprites, named "<prefix>_<attribute>"."""
+    for name, dtype in columns:
+        arrays[f"{prefix}_{name}"] = np.array([getattr(sprite, name) for sprite in sprites], dtype=dtype)
+
+
+def _restore_enemies(sim, arrays):
+    store = sim.enemy_store
+    packed = {field: arrays[f"enemy_{field}"] for field in store.FIELDS}
+    packed["free_slots"] = arrays["enemy_free_slots"]
+    rows = packed["row"].tolist()
+    cols = packed["col"].tolist()
+    scales = arrays["enemy_scale"].tolist()
+    sprites = {}
+    for slot in np.flatnonzero(packed["alive"]).tolist():
+        if scales[slot] == ENEMY_SCALING:
+            sprites[slot] = sim.enemy_pool.acquire(rows[slot], cols[slot])
+        else:
+            # Enemies spawned by enemy huts are larger than pooled ones and not pooled themselves
+            enemy = Enemy(CHARACTER_IMAGE, scaling=scales[slot])
+            enemy.color = arcade.color.RED
+            enemy.position = pos_to_grid(rows[slot], cols[slot])
+            sprites[slot] = enemy
+    store.unpack(packed, sprites)
+    for slot in arrays["enemy_list_slots"].tolist():
+        sim.enemy_sprite_list.append(sprites[slot])
+    for slot in arrays["mraid_list_slots"].tolist():
+        sim.mraid_sprite_list.append(sprites[slot])
+
+
+def _restore_ai_players(sim, arrays):
+    columns = zip(*(arrays[f"ai_{name}"].tolist() for name in
+                    ("row", "col", "center_x", "center_y", "speed", "resource_gathering_speed", "attack_strength")))
+    for row, col, center_x, center_y, speed, gathering_speed, attack_strength in columns:
+        ai = GridSprite(CHARACTER_IMAGE, scaling=0.15)
+        sim.upgrade_manager.attach(ai, "ai")  # Before the stats, which are saved with the upgrades applied
+        ai.row, ai.col = row, col
+        ai.position = (center_x, center_y)
+        ai.speed = speed
+        ai.resource_gathering_speed = gathering_speed
+        ai.attack_strength = attack_strength
+        sim.ai_players.append(ai)
+        sim.ai_index.add(ai)
+
+
+def _restore_resources(sim, arrays):
+    manager = sim.resource_manager
+    pool = manager.pool
+    for row, col, code in zip(arrays["resource_row"].tolist(), arrays["resource_col"].tolist(),
+                              arrays["resource_type"].tolist()):
+        manager.add_resource(pool.acquire(RESOURCE_TYPES[code], row, col))
+    for prefix, sprite_list in (("diamond", sim.diamond_sprite_list), ("drain", sim.drain_sprite_list)):
+        for row, col in zip(arrays[f"{prefix}_row"].tolist(), arrays[f"{prefix}_col"].tolist()):
+            diamond = pool.acquire(ResourceType.DIAMOND, row, col)
+            sprite_list.append(diamond)
+            sim.diamond_index.add(diamond)
+
+
+def _restore_structures(sim, arrays):
+    manager = sim.structure_manager
+    columns = zip(arrays["structure_type"].tolist(), arrays["structure_team"].tolist(),
+                  *(arrays[f"structure_{name}"].tolist() for name in
+                    ("center_x", "center_y", "health", "spawn_timer", "attack_timer")))
+    for type_code, team_code, center_x, center_y, health, spawn_timer, attack_timer in columns:
+        structure = STRUCTURE_TYPES[STRUCTURE_NAMES[type_code]](center_x, center_y, TEAMS[team_code])
+        manager.add_structure(structure)
+        structure.health = health  # Saved with the upgrades applied, so set after attaching them
+        structure.spawn_timer = spawn_timer
+        structure.attack_timer = attack_timer
+
+
+def _restore_bananas(sim, arrays):
+    columns = zip(*(arrays[f"banana_{name}"].tolist() for name in
+                    ("center_x", "center_y", "change_x", "change_y", "angle", "life", "direction")))
+    for center_x, center_y, change_x, change_y, angle, life, direction in columns:
+        banana = sim.banana_pool.acquire(center_x, center_y, tuple(direction), 0)
+        banana.change_x, banana.change_y = change_x, change_y
+        banana.angle = angle
+        banana.life = life
+        sim.banana_sprite_list.append(banana)
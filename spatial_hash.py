@@ -0,0 +1,163 @@
+"""
+Module: spatial_hash
+Description: A uniform spatial hash over the tile grid. Entities are bucketed by their integer row and
+column, so neighborhood and collision queries only look at a handful of tiles instead of whole sprite lists.
+"""
+
+import arcade
+
+
+class SpatialHash:
+    """
+    Tile-bucketed index of grid entities.
+
+    Every indexed sprite must carry integer `row` and `col` attributes. The index keeps a reference to
+    itself in `sprite.spatial_hash` so the sprite can drop out of it when removed from the game.
+
+    Attributes:
+        buckets (dict): Maps (row, col) tiles to the list of sprites on that tile.
+    """
+    def __init__(self):
+        """Initialize an empty spatial hash."""
+        self.buckets = {}
+        self._tiles = {}  # Tile each sprite is currently bucketed under
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def __contains__(self, sprite):
+        return sprite in self._tiles
+
+    def add(self, sprite):
+        """
+        Add a sprite to the bucket of its current tile.
+
+        Args:
+            sprite (arcade.Sprite): Sprite with `row` and `col` attributes.
+        """
+        tile = (sprite.row, sprite.col)
+        self._tiles[sprite] = tile
+        self.buckets.setdefault(tile, []).append(sprite)
+        sprite.spatial_hash = self
+
+    def remove(self, sprite):
+        """
+        Remove a sprite from the index. Sprites that are not indexed are ignored.
+
+        Args:
+            sprite (arcade.Sprite): The sprite to remove.
+        """
+        tile = self._tiles.pop(sprite, None)
+        if tile is None:
+            return
+        self._discard_from_bucket(sprite, tile)
+        sprite.spatial_hash = None
+
+    def remove_all(self, sprites):
+        """
+        Remove several sprites from the index, e.g. before clearing the sprite list that holds them.
+
+        Args:
+            sprites (iterable): The sprites to remove.
+        """
+        for sprite in sprites:
+            self.remove(sprite)
+
+    def move(self, sprite):
+        """
+        Re-bucket a sprite after its `row`/`col` changed.
+
+        Args:
+            sprite (arcade.Sprite): The sprite that moved.
+        """
+        old_tile = self._tiles.get(sprite)
+        new_tile = (sprite.row, sprite.col)
+        if old_tile is None or old_tile == new_tile:
+            return
+        self._discard_from_bucket(sprite, old_tile)
+        self._tiles[sprite] = new_tile
+        self.buckets.setdefault(new_tile, []).append(sprite)
+
+    def at(self, row, col):
+        """
+        Get the sprites on a single tile.
+
+        Args:
+            row (int): Row index in the grid.
+            col (int): Column index in the grid.
+        Returns:
+            list: Sprites on the tile (do not modify).
+        """
+        return self.buckets.get((row, col), [])
+
+    def near(self, row, col, radius=1):
+        """
+        Get the sprites within a square of tiles around a tile.
+
+        Args:
+            row (int): Row index of the center tile.
+            col (int): Column index of the center tile.
+            radius (int): Number of tiles to include on each side of the center tile.
+        Returns:
+            list: Sprites in the (2 * radius + 1) x (2 * radius + 1) tile square.
+        """
+        found = []
+        for r in range(row - radius, row + radius + 1):
+            for c in range(col - radius, col + radius + 1):
+                bucket = self.buckets.get((r, c))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+    def query_rect(self, row_min, row_max, col_min, col_max):
+        """
+        Get the sprites inside a rectangle of tiles.
+
+        Args:
+            row_min (int): First row, inclusive.
+            row_max (int): Last row, inclusive.
+            col_min (int): First column, inclusive.
+            col_max (int): Last column, inclusive.
+        Returns:
+            list: Sprites in the rectangle.
+        """
+        found = []
+        buckets = self.buckets
+        if len(buckets) < (row_max - row_min + 1) * (col_max - col_min + 1):
+            # Fewer occupied tiles than tiles in the rectangle, so scan the occupied ones
+            for (row, col), bucket in buckets.items():
+                if row_min <= row <= row_max and col_min <= col <= col_max:
+                    found.extend(bucket)
+            return found
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                bucket = buckets.get((row, col))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+    def collisions(self, sprite, row, col, radius=1):
+        """
+        Find indexed sprites that collide with a sprite, testing only nearby tiles.
+
+        A radius of 1 finds every sprite the tested sprite can overlap as long as neither is
+        larger than a tile, as with the player and diamonds. Pass a larger radius for bigger sprites.
+
+        Args:
+            sprite (arcade.Sprite): The sprite to test.
+            row (int): Row index of the tile the sprite is on.
+            col (int): Column index of the tile the sprite is on.
+            radius (int): Number of neighboring tiles to search on each side.
+        Returns:
+            list: Colliding sprites.
+        """
+        return [
+            other for other in self.near(row, col, radius)
+            if other is not sprite and arcade.check_for_collision(sprite, other)
+        ]
+
+    def _discard_from_bucket(self, sprite, tile):
+        bucket = self.buckets[tile]
+        bucket.remove(sprite)
+        if not bucket:
+            del self.buckets[tile]
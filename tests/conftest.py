@@ -0,0 +1,20 @@
+"""
+Shared setup for the tests: run arcade without a window and import the game modules from the
+repository root, where the relative asset paths resolve.
+"""
+
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def repo_root(monkeypatch):
+    """Run every test from the repository root, so asset paths resolve."""
+    monkeypatch.chdir(ROOT)
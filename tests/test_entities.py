@@ -0,0 +1,24 @@
+"""
+Tests for the persistent views over groups of sprite lists.
+"""
+
+from simulation import Simulation
+
+
+def test_enemy_view_queries_follow_store_moves():
+    sim = Simulation(enemy_count=20, seed=2, resource_count=0)
+    player = sim.player
+    enemy = sim.enemy_sprite_list[0]
+    # A store-side move does not touch the sprite's pixel position until it is synced
+    sim.enemy_store.set_value(enemy._slot, "row", player.row)
+    sim.enemy_store.set_value(enemy._slot, "col", player.col)
+
+    assert enemy in sim.enemies.collisions(player)
+    assert enemy in sim.enemies.within(player.row, player.col, 0)
+
+
+def test_indexed_within_matches_a_scan():
+    sim = Simulation(enemy_count=200, seed=3, resource_count=0, width=40, height=40)
+    row, col = sim.player.row, sim.player.col
+    scanned = {enemy for enemy in sim.enemies if abs(enemy.row - row) <= 3 and abs(enemy.col - col) <= 3}
+    assert set(sim.enemies.within(row, col, 3)) == scanned
@@ -0,0 +1,48 @@
+"""
+Tests for the stat modifiers of random events.
+"""
+
+import snapshot
+from simulation import Simulation
+
+RAID = "Monkey Raid"
+
+
+def stats(enemy):
+    return enemy.speed, enemy.attack_power
+
+
+def test_enemies_spawned_during_a_raid_get_and_lose_its_modifiers():
+    sim = Simulation(enemy_count=3, seed=7, resource_count=0)
+    before = sim.enemy_sprite_list[0]
+    sim.events.start(RAID)
+    assert stats(before) == (2.0, 10)
+
+    sim.spawn_enemies(1)
+    sim.spawn_raid_enemies(2, 30)
+    during = sim.enemy_sprite_list[-1]
+    raider = sim.mraid_sprite_list[0]
+    assert stats(during) == (2.0, 10)
+    assert stats(raider) == (2.0, 10)
+
+    sim.events.end()
+    assert stats(before) == (1.0, 5)
+    assert stats(during) == (1.0, 5)
+    assert len(sim.mraid_sprite_list) == 0
+
+    sim.spawn_enemies(1)
+    assert stats(sim.enemy_sprite_list[-1]) == (1.0, 5)
+
+
+def test_raid_modifiers_stay_in_effect_after_a_restore():
+    sim = Simulation(enemy_count=3, seed=8, resource_count=0)
+    sim.events.start(RAID)
+    restored = snapshot.loads(snapshot.dumps(sim))
+
+    restored.spawn_enemies(1)
+    spawned = restored.enemy_sprite_list[-1]
+    assert stats(spawned) == (2.0, 10)
+
+    restored.events.end()
+    assert stats(spawned) == (1.0, 5)
+    assert all(stats(enemy) == (1.0, 5) for enemy in restored.enemies)
@@ -0,0 +1,62 @@
+"""
+Tests for the player's contact damage in the Simulation.
+"""
+
+import arcade
+from enemies import Enemy
+from game_constants import TILE_SIZE
+from game_utils import pos_to_grid
+from simulation import Simulation, PLAYER_HEALTH, ENEMY_DAMAGE
+from textures import CHARACTER_IMAGE
+
+
+def make_sim():
+    return Simulation(enemy_count=0, seed=1, resource_count=0)
+
+
+def add_pooled_enemy(sim, row, col):
+    enemy = sim.enemy_pool.acquire(row, col)
+    sim.enemy_sprite_list.append(enemy)
+    sim.enemy_store.add(enemy)
+    return enemy
+
+
+def add_hut_enemy(sim, row, col):
+    # Same as Structure.spawn_entity for an enemy hut
+    enemy = Enemy(CHARACTER_IMAGE, scaling=0.5)
+    enemy.center_x, enemy.center_y = pos_to_grid(row, col, TILE_SIZE)
+    enemy.row, enemy.col = row, col
+    sim.enemy_sprite_list.append(enemy)
+    sim.enemy_store.add(enemy)
+    return enemy
+
+
+def test_enemy_on_player_tile_deals_damage():
+    sim = make_sim()
+    add_pooled_enemy(sim, sim.player.row, sim.player.col)
+    sim.update_player(1 / 60)
+    assert sim.player_health == PLAYER_HEALTH - ENEMY_DAMAGE
+
+
+def test_normal_enemy_on_diagonal_tile_deals_no_damage():
+    sim = make_sim()
+    enemy = add_pooled_enemy(sim, sim.player.row + 1, sim.player.col + 1)
+    assert not arcade.check_for_collision(sim.player, enemy)
+    sim.update_player(1 / 60)
+    assert sim.player_health == PLAYER_HEALTH
+
+
+def test_hut_enemy_on_neighboring_tile_deals_damage():
+    sim = make_sim()
+    add_hut_enemy(sim, sim.player.row, sim.player.col + 1)
+    sim.update_player(1 / 60)
+    assert sim.player_health == PLAYER_HEALTH - ENEMY_DAMAGE
+
+
+def test_stacked_enemies_deal_a_single_hit():
+    sim = make_sim()
+    for _ in range(3):
+        add_pooled_enemy(sim, sim.player.row, sim.player.col)
+    add_hut_enemy(sim, sim.player.row - 1, sim.player.col)
+    sim.update_player(1 / 60)
+    assert sim.player_health == PLAYER_HEALTH - ENEMY_DAMAGE
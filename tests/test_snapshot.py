@@ -0,0 +1,71 @@
+"""
+Tests for saving and restoring a Simulation with snapshots.
+"""
+
+import pytest
+
+import snapshot
+from buildings import Hut, ENEMY_SPAWN_COOLDOWN
+from game_constants import TILE_SIZE
+from game_utils import pos_to_grid
+from simulation import Simulation, ENEMY_SCALING
+
+
+def make_sim_with_hut_enemy():
+    sim = Simulation(enemy_count=10, seed=5, resource_count=20)
+    hut = Hut(*pos_to_grid(sim.player.row + 2, sim.player.col + 2, TILE_SIZE), "enemy")
+    hut.spawn_timer = ENEMY_SPAWN_COOLDOWN
+    hut.spawn_entity(sim.enemy_sprite_list, TILE_SIZE, sim.enemy_store)
+    return sim
+
+
+def enemy_states(sim):
+    return sorted((enemy._slot, enemy.row, enemy.col, enemy.scale_x, enemy.width)
+                  for enemy in sim.enemies)
+
+
+def test_round_trip_keeps_hut_enemy_size():
+    sim = make_sim_with_hut_enemy()
+    assert any(enemy.scale_x != ENEMY_SCALING for enemy in sim.enemies)
+
+    restored = snapshot.loads(snapshot.dumps(sim))
+
+    assert enemy_states(restored) == enemy_states(sim)
+    assert snapshot.dumps(restored) == snapshot.dumps(sim)
+
+
+def test_round_trip_keeps_structures_built():
+    sim = Simulation(enemy_count=0, seed=6, resource_count=0)
+    sim.inventory.update({"WOOD": 50, "STONE": 50})
+    sim.build_structure("Tower")
+    sim.structure_manager.built["enemy"] = 3
+
+    restored = snapshot.loads(snapshot.dumps(sim))
+
+    assert restored.structure_manager.built == {"player": 1, "enemy": 3}
+
+
+def test_save_replaces_the_file_in_one_step(tmp_path):
+    path = str(tmp_path / "savegame.mtw")
+    sim = make_sim_with_hut_enemy()
+    snapshot.save(sim, path)
+    sim.score = 42
+    snapshot.save(sim, path)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["savegame.mtw"]
+    assert snapshot.load(path).score == 42
+
+
+def test_failed_save_keeps_the_previous_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "savegame.mtw")
+    sim = make_sim_with_hut_enemy()
+    snapshot.save(sim, path)
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(snapshot.os, "fsync", fail)
+    sim.score = 42
+    with pytest.raises(OSError):
+        snapshot.save(sim, path)
+    assert snapshot.load(path).score == 0
@@ -0,0 +1,63 @@
+"""
+Module: textures
+Description: Central texture registry. Each image is loaded once and the same arcade.Texture is handed
+to every sprite that uses it, so spawning sprites never touches the texture loader.
+"""
+
+import arcade
+
+# Images that are not tied to a resource type or structure class
+CHARACTER_IMAGE = "assets/images/characters/monkey.png"
+BANANA_IMAGE = "assets/images/projectiles/banana.png"
+
+
+class TextureRegistry:
+    """
+    Maps keys (a ResourceType, a structure class or an image path) to shared textures.
+    """
+    def __init__(self):
+        """Initialize an empty registry."""
+        self.paths = {}  # Key to image path
+        self.textures = {}  # Image path to loaded texture
+
+    def register(self, key, path):
+        """
+        Associate a key with an image path. The image is loaded on preload or first use.
+
+        Args:
+            key: ResourceType, structure class or any hashable key.
+            path (str): Path of the image, including arcade ":resources:" paths.
+        """
+        self.paths[key] = path
+
+    def get(self, key, path=None):
+        """
+        Get the shared texture for a key, loading it if needed.
+
+        Args:
+            key: A registered key, or an image path.
+            path (str): Image path to register for the key if it is not registered yet.
+        Returns:
+            arcade.Texture: The shared texture.
+        """
+        image_path = self.paths.get(key)
+        if image_path is None:
+            image_path = path if path is not None else key
+            self.paths[key] = image_path
+        texture = self.textures.get(image_path)
+        if texture is None:
+            texture = arcade.load_texture(image_path)
+            self.textures[image_path] = texture
+        return texture
+
+    def preload(self):
+        """
+        Load every registered image that has not been loaded yet.
+        """
+        for key in list(self.paths):
+            self.get(key)
+
+
+texture_registry = TextureRegistry()
+texture_registry.register(CHARACTER_IMAGE, CHARACTER_IMAGE)
+texture_registry.register(BANANA_IMAGE, BANANA_IMAGE)
@@ -0,0 +1,96 @@
+"""
+Module: timestep
+Description: Fixed-timestep driving of the simulation. Frame delta times are accumulated and the
+simulation is advanced in whole ticks of constant length, so game behavior and simulation cost do not
+depend on the frame rate. Rendering happens between ticks and interpolates moving sprites by the
+fraction of a tick left in the accumulator.
+"""
+
+from contextlib import contextmanager
+from game_log import get_logger
+
+log = get_logger("timestep")
+
+# Constants
+TICK_RATE = 60  # Simulation ticks per second
+TICK_DURATION = 1 / TICK_RATE
+MAX_CATCH_UP_TICKS = 5  # Most ticks run for one frame; time beyond that is dropped
+
+
+class FixedTimestep:
+    """
+    Accumulates frame time and hands it out as fixed-length ticks.
+
+    When a frame takes longer than `max_ticks` ticks, the excess time is dropped instead of being
+    caught up on later, so a slow machine runs the game in slow motion rather than spending ever
+    more time simulating (the "spiral of death").
+
+    Attributes:
+        tick_duration (float): Length of a tick in seconds.
+        max_ticks (int): Most ticks run per frame.
+        accumulator (float): Frame time not yet simulated, in seconds.
+        dropped_time (float): Total frame time dropped by the catch-up cap, in seconds.
+    """
+    def __init__(self, tick_duration=TICK_DURATION, max_ticks=MAX_CATCH_UP_TICKS):
+        """
+        Initialize the timestep with an empty accumulator.
+
+        Args:
+            tick_duration (float): Length of a tick in seconds.
+            max_ticks (int): Most ticks run per frame.
+        """
+        self.tick_duration = tick_duration
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0
+        self.dropped_time = 0.0
+
+    @property
+    def alpha(self):
+        """float: Fraction of a tick accumulated since the last tick, for render interpolation."""
+        return max(0.0, self.accumulator / self.tick_duration)
+
+    def advance(self, delta_time):
+        """
+        Add a frame's time and take out the ticks that are due.
+
+        Args:
+            delta_time (float): Time elapsed since the last frame, in seconds.
+        Returns:
+            int: Number of ticks to run this frame.
+        """
+        self.accumulator += delta_time
+        # The epsilon keeps float rounding from postponing a tick that is exactly due
+        ticks = int(self.accumulator / self.tick_duration + 1e-9)
+        if ticks > self.max_ticks:
+            dropped = (ticks - self.max_ticks) * self.tick_duration
+            self.dropped_time += dropped
+            log.debug("Simulation fell behind; dropped %.3fs of game time.", dropped)
+            ticks = self.max_ticks
+            self.accumulator -= dropped
+        self.accumulator -= ticks * self.tick_duration
+        return ticks
+
+
+@contextmanager
+def interpolated_positions(sprite_list, alpha):
+    """
+    Temporarily place moving sprites between their previous and current tick positions.
+
+    Sprites that move by `change_x`/`change_y` each tick were at `position - change` one tick ago;
+    inside the context they are drawn `alpha` of the way from there to where they are now.
+
+    Args:
+        sprite_list (arcade.SpriteList): Sprites to interpolate.
+        alpha (float): Fraction of a tick elapsed since the last tick (0 to 1).
+    """
+    back = 1.0 - alpha
+    moved = []
+    for sprite in sprite_list:
+        if sprite.change_x or sprite.change_y:
+            moved.append((sprite, sprite.position))
+            sprite.position = (sprite.center_x - back * sprite.change_x, sprite.center_y - back * sprite.change_y)
+    try:
+        yield
+    finally:
+        for sprite, position in moved:
+            sprite.position = position
@@ -2,32 +2,148 @@
 Module: upgrades
 Description: This module manages upgrades in the game, allowing players to enhance their abilities,
 AI combat strength, structure durability, and resource efficiency. The UpgradeManager class provides
-functionality for purchasing and applying upgrades, ensuring progression throughout gameplay.
+functionality for purchasing upgrades and turns the purchased levels into stat modifiers. Entities
+store their base stats and read the effective values through UpgradedStat attributes, so upgrades
+cost nothing per update and never compound.
 """
 
+from game_log import get_logger
+
+log = get_logger("upgrades")
+
+# Available upgrades: their starting cost, the entity kind and stat they modify, and how each level
+# modifies it ("add" adds the effect per level, "multiply" multiplies by the effect per level)
+UPGRADES = {
+    "player_speed": {"cost": 10, "effect": 0.2, "kind": "player", "stat": "speed", "mode": "add"},
+    "ai_combat_strength": {"cost": 20, "effect": 1.1, "kind": "ai", "stat": "attack_strength", "mode": "multiply"},
+    "structure_health": {"cost": 30, "effect": 50, "kind": "structure", "stat": "health", "mode": "add"},
+    "resource_efficiency": {"cost": 15, "effect": 1.2, "kind": "player", "stat": "resource_gathering_speed",
+                            "mode": "multiply"},
+}
+
+
+class UpgradedStat:
+    """
+    Attribute descriptor for an entity stat that upgrades modify.
+
+    The entity stores the base value; reading the attribute returns the base value with the modifiers
+    of the entity's `upgrades` manager for its `upgrade_kind` applied, and assigning to it (e.g.
+    `structure.health -= 20`) stores the base value that yields the assigned effective value.
+    Entities without an upgrade manager read their base value.
+    """
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.base_name = f"_base_{name}"
+
+    def __get__(self, entity, owner=None):
+        if entity is None:
+            return self
+        base = getattr(entity, self.base_name)
+        if entity.upgrades is None:
+            return base
+        return entity.upgrades.effective(entity.upgrade_kind, self.name, base)
+
+    def __set__(self, entity, value):
+        if entity.upgrades is not None:
+            value = entity.upgrades.base(entity.upgrade_kind, self.name, value)
+        setattr(entity, self.base_name, value)
+
+
 class UpgradeManager:
     """
     Manages the upgrades for the player, AI players, and structures in the game.
+
+    Attributes:
+        upgrades (dict): Upgrade name to its definition (see UPGRADES), current level and next cost.
     """
     def __init__(self, player, ai_players, structure_manager):
         """
-        Initialize the UpgradeManager with references to the player, AI players, and structures.
+        Initialize the UpgradeManager and attach it to the player, AI players, and structures.
         Args:
             player (GridSprite): The player object to apply upgrades to.
             ai_players (arcade.SpriteList): The list of AI player sprites.
-            structure_manager (StructureManager): The structure manager handling all structures.
+            structure_manager (BuildingManager): The structure manager handling all structures;
+                it attaches the manager to the player's structures it places.
         """
-        self.player = player
-        self.ai_players = ai_players
-        self.structure_manager = structure_manager
-
-        # Define available upgrades with their costs, levels, and effects
-        self.upgrades = {
-            "player_speed": {"level": 0, "cost": 10, "effect": 0.2},  # Increases player movement speed
-            "ai_combat_strength": {"level": 0, "cost": 20, "effect": 1.1},  # Improves AI attack strength
-            "structure_health": {"level": 0, "cost": 30, "effect": 50},  # Increases structure health
-            "resource_efficiency": {"level": 0, "cost": 15, "effect": 1.2},  # Increases resource collection rate
-        }
+        self.upgrades = {name: {**upgrade, "level": 0} for name, upgrade in UPGRADES.items()}
+        self._modifiers = None  # Cached (kind, stat) -> (add, multiply) table, rebuilt after purchases
+
+        self.attach(player, "player")
+        for ai in ai_players:
+            self.attach(ai, "ai")
+        structure_manager.upgrades = self
+
+    def attach(self, entity, kind):
+        """
+        Let an entity's UpgradedStat attributes read this manager's modifiers. The entity's current
+        stat values become its base values.
+        Args:
+            entity (arcade.Sprite): The entity.
+            kind (str): The kind of entity ("player", "ai" or "structure").
+        """
+        entity.upgrades = self
+        entity.upgrade_kind = kind
+
+    @property
+    def modifiers(self):
+        """dict: (kind, stat) to the (add, multiply) modifier of the stat, for the upgrades bought."""
+        if self._modifiers is None:
+            modifiers = {}
+            for upgrade in self.upgrades.values():
+                if upgrade["level"] == 0:
+                    continue
+                key = (upgrade["kind"], upgrade["stat"])
+                add, multiply = modifiers.get(key, (0, 1))
+                if upgrade["mode"] == "add":
+                    add += upgrade["level"] * upgrade["effect"]
+                else:
+                    multiply *= upgrade["effect"] ** upgrade["level"]
+                modifiers[key] = (add, multiply)
+            self._modifiers = modifiers
+        return self._modifiers
+
+    def effective(self, kind, stat, base):
+        """
+        Get the upgraded value of a stat.
+        Args:
+            kind (str): The kind of entity.
+            stat (str): The stat.
+            base (float): The entity's base value of the stat.
+        Returns:
+            float: The base value with the upgrades applied.
+        """
+        modifier = self.modifiers.get((kind, stat))
+        if modifier is None:
+            return base
+        add, multiply = modifier
+        return base * multiply + add
+
+    def base(self, kind, stat, value):
+        """
+        Get the base value of a stat that has a given upgraded value, the inverse of effective().
+        Args:
+            kind (str): The kind of entity.
+            stat (str): The stat.
+            value (float): The upgraded value.
+        Returns:
+            float: The base value.
+        """
+        modifier = self.modifiers.get((kind, stat))
+        if modifier is None:
+            return value
+        add, multiply = modifier
+        return value - add if multiply == 1 else (value - add) / multiply
+
+    def restore(self, levels):
+        """
+        Set the level and cost of each upgrade, e.g. from a saved game.
+        Args:
+            levels (dict): Upgrade name to a dict with its "level" and "cost".
+        """
+        for name, saved in levels.items():
+            self.upgrades[name]["level"] = saved["level"]
+            self.upgrades[name]["cost"] = saved["cost"]
+        self._modifiers = None
 
     def purchase_upgrade(self, upgrade_name, diamonds):
         """
@@ -43,29 +159,8 @@ class UpgradeManager:
             diamonds -= upgrade["cost"]
             upgrade["level"] += 1
             upgrade["cost"] = int(upgrade["cost"] * 1.5)  # Increase the cost for the next level
-            print(f"{upgrade_name} upgraded to level {upgrade['level']}.")
+            self._modifiers = None  # Effective stats are recomputed on their next read
+            log.info("%s upgraded to level %d.", upgrade_name, upgrade["level"])
             return True, diamonds
-        print(f"Not enough diamonds for {upgrade_name}.")
+        log.debug("Not enough diamonds for %s.", upgrade_name)
         return False, diamonds
-
-    def apply_upgrades(self):
-        """
-        Apply the effects of all upgrades to the player, AI players, and structures.
-        """
-        # Upgrade player movement speed
-        if self.upgrades["player_speed"]["level"] > 0:
-            self.player.speed += self.upgrades["player_speed"]["level"] * self.upgrades["player_speed"]["effect"]
-
-        # Upgrade AI combat strength
-        if self.upgrades["ai_combat_strength"]["level"] > 0:
-            for ai in self.ai_players:
-                ai.attack_strength *= self.upgrades["ai_combat_strength"]["level"] * self.upgrades["ai_combat_strength"]["effect"]
-
-        # Upgrade structure health
-        if self.upgrades["structure_health"]["level"] > 0:
-            for structure in self.structure_manager.structures:
-                structure.health += self.upgrades["structure_health"]["level"] * self.upgrades["structure_health"]["effect"]
-
-        # Upgrade resource efficiency for player
-        if self.upgrades["resource_efficiency"]["level"] > 0:
-            self.player.resource_gathering_speed *= self.upgrades["resource_efficiency"]["level"] * self.upgrades["resource_efficiency"]["effect"]